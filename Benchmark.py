@@ -0,0 +1,402 @@
+"""
+DamaDam Bot - Benchmarks
+Measures bot stages outside of a normal run so changes can be compared.
+
+Usage:
+    python Benchmark.py profile-extract --nick someone --nick other --repeat 3
+    python Benchmark.py e2e --targets 10 --latency 0.05 --budget 6
+    python Benchmark.py sheets --rows 100 --rows 1000 --rows 5000 --targets 20
+    python Benchmark.py normalize --rows 1000 --rows 10000 --rows 100000
+"""
+
+import os
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+
+from rich.table import Table
+
+import Normalize
+import Scraper
+from Scraper import console, log_msg
+from FakeSite import FakeSite
+from FakeSheets import FakeSheetsClient, seed_msglist
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def count_round_trips(driver) -> dict:
+    """Count WebDriver commands (every find_element/get_attribute/... goes through execute)"""
+    counter = {"calls": 0}
+    original = driver.execute
+
+    def execute(driver_command, params=None):
+        counter["calls"] += 1
+        return original(driver_command, params)
+
+    driver.execute = execute
+    return counter
+
+def _summary_row(name: str, samples: list[float], calls: list[int]) -> list[str]:
+    ms = sorted(x * 1000 for x in samples)
+    return [
+        name,
+        f"{statistics.mean(calls):.1f}",
+        f"{statistics.median(ms):.1f}",
+        f"{ms[-1]:.1f}",
+        str(len(samples)),
+    ]
+
+# ============================================================================
+# PROFILE EXTRACTION
+# ============================================================================
+
+def bench_profile_extract(args) -> int:
+    """Compare per-field WebDriver lookups against the single injected script"""
+    driver = Scraper.setup_browser()
+    if not driver:
+        log_msg("❌ Browser setup failed")
+        return 1
+    try:
+        if args.login and not Scraper.login(driver):
+            log_msg("❌ Login failed")
+            return 1
+
+        counter = count_round_trips(driver)
+        extractors = {
+            "webdriver": Scraper._extract_profile_webdriver,
+            "script": Scraper._extract_profile_script,
+        }
+        samples = {mode: [] for mode in extractors}
+        calls = {mode: [] for mode in extractors}
+        mismatches = 0
+
+        for nick in args.nick:
+            url = f"{Scraper.BASE_URL}/users/{nick}/"
+            driver.get(url)
+            Scraper.WebDriverWait(driver, 10).until(
+                Scraper.EC.presence_of_element_located((Scraper.By.CSS_SELECTOR, "h1.cxl.clb.lsp"))
+            )
+            results = {}
+            for _ in range(args.repeat):
+                for mode, extract in extractors.items():
+                    data = Scraper._new_profile_data(nick, url)
+                    counter["calls"] = 0
+                    started = time.perf_counter()
+                    extract(driver, data)
+                    samples[mode].append(time.perf_counter() - started)
+                    calls[mode].append(counter["calls"])
+                    results[mode] = data
+
+            if results["webdriver"] != results["script"]:
+                mismatches += 1
+                diff = {
+                    k: (results["webdriver"].get(k), results["script"].get(k))
+                    for k in results["webdriver"]
+                    if results["webdriver"].get(k) != results["script"].get(k)
+                }
+                log_msg(f"⚠️ {nick}: modes disagree {diff}")
+
+        table = Table(title="Profile extraction (page already loaded)")
+        for col in ("mode", "round trips", "p50 ms", "max ms", "samples"):
+            table.add_column(col)
+        for mode in extractors:
+            table.add_row(*_summary_row(mode, samples[mode], calls[mode]))
+        console.print(table)
+        return 1 if mismatches else 0
+    finally:
+        driver.quit()
+
+# ============================================================================
+# END-TO-END TARGETS (local stand-in site)
+# ============================================================================
+
+E2E_STAGES = ("login", "scrape_profile", "find_open_post", "send", "target")
+
+def bench_e2e(args) -> int:
+    """Time whole targets (profile -> open post -> send -> verify) against FakeSite"""
+    site = FakeSite(latency=args.latency, jitter=args.jitter, open_page_spread=args.open_page_spread).start()
+    workdir = tempfile.mkdtemp(prefix="dd-bench-")
+    # Never touch the real site, cookies or persistent Chrome profile
+    Scraper.set_base_url(site.url)
+    Scraper.COOKIE_FILE = os.path.join(workdir, "cookies.pkl")
+    Scraper.CHROME_PROFILE_DIR = ""
+    if args.backend:
+        Scraper.STAGE_BACKENDS = Scraper._parse_backend_spec(args.backend)
+    log_msg(f"🧪 Stand-in site on {site.url} ({args.latency * 1000:.0f}ms latency)")
+
+    driver = Scraper.setup_browser()
+    if not driver:
+        log_msg("❌ Browser setup failed")
+        site.stop()
+        return 1
+    failures = 0
+    try:
+        with Scraper.span("login"):
+            logged_in = Scraper.login(driver)
+        if not logged_in:
+            log_msg("❌ Login against the stand-in site failed")
+            return 1
+        Scraper.sync_http_session(driver)
+
+        for i in range(args.targets):
+            nick = f"bench{i}"
+            Scraper.clear_page_snapshots()
+            with Scraper.span("target"):
+                with Scraper.span("scrape_profile"):
+                    profile = Scraper.scrape_profile(driver, nick)
+                with Scraper.span("find_open_post"):
+                    post_url = Scraper.find_first_open_post(driver, nick)
+                result = {}
+                if profile and post_url:
+                    with Scraper.span("send"):
+                        result = Scraper.send_and_verify_message(driver, post_url, f"bench {i} for {nick}")
+            if not result.get("verified"):
+                failures += 1
+                log_msg(f"⚠️ {nick}: {result.get('status') or 'no profile/post'}")
+
+        summary = Scraper.span_summary()
+        table = Table(title=f"End-to-end targets ({args.targets} targets, {args.latency * 1000:.0f}ms latency)")
+        for col in ("stage", "n", "p50 ms", "p95 ms", "max ms"):
+            table.add_column(col)
+        for stage in E2E_STAGES:
+            stats = summary.get(stage)
+            if stats:
+                table.add_row(stage, str(stats["count"]), *(f"{stats[k] * 1000:.0f}" for k in ("p50", "p95", "max")))
+        console.print(table)
+        log_msg(f"🌐 Stand-in site served {site.requests} requests, {site.sent} messages sent")
+        if args.output:
+            Scraper.write_run_profile(
+                {"mode": "bench-e2e", "targets": args.targets, "failed": failures, "latency": args.latency},
+                path=args.output, prom_path="",
+            )
+
+        p95 = summary.get("target", {}).get("p95", 0.0)
+        if args.budget and p95 > args.budget:
+            log_msg(f"❌ Target p95 {p95:.2f}s is over the {args.budget:.2f}s budget")
+            return 1
+        return 1 if failures else 0
+    finally:
+        driver.quit()
+        site.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+# ============================================================================
+# SHEETS API CALLS (in-memory Sheets with quotas)
+# ============================================================================
+
+def _sheets_run(args, rows: int, scan_mode: str, workdir: str) -> dict:
+    """One bot run's worth of Sheets traffic against a fresh FakeSheetsClient"""
+    client = FakeSheetsClient(args.read_quota, args.write_quota, args.window, args.latency)
+    seed_msglist(client, Scraper.SHEET_ID, rows, args.targets)
+    Scraper.use_gspread_client(client)
+    Scraper.SCAN_CURSOR_FILE = os.path.join(workdir, f"cursor-{rows}-{scan_mode}.json")
+    # Pace to the fake's quotas, or only react to its 429s with --unpaced
+    quotas = (0, 0) if args.unpaced else (args.read_quota, args.write_quota)
+    Scraper.SHEETS = Scraper.SheetsScheduler(*quotas, window=args.window)
+    started = time.perf_counter()
+
+    sheet = Scraper.get_or_create_msglist_sheet()
+    targets = Scraper.scan_pending_targets(sheet, mode=scan_mode)
+    scan_calls = client.stats()["calls"]
+    Scraper.load_profiles_lookup()
+    writer = Scraper.SheetWriter(
+        Scraper.MsgListWriteBuffer(sheet),
+        Scraper.RunJournal(path=os.path.join(workdir, f"journal-{rows}-{scan_mode}.jsonl")),
+    )
+    for i, target in enumerate(targets, 1):
+        writer.set(target["row"], 4, "Lahore")
+        writer.set(target["row"], 5, "12")
+        writer.set(target["row"], 6, "34")
+        result = {"status": "Posted", "link": f"{Scraper.BASE_URL}/comments/text/{i}/", "verified": True}
+        # Same cells record_send_result writes, without its per-target logging
+        writer.set(target["row"], 8, "Done")
+        writer.set(target["row"], 9, "Posted @ bench")
+        writer.set(target["row"], 10, result["link"])
+        entry = Scraper.send_history_entry(target["mode"], target["nick_or_url"], target["name"], "Done", result, "bench")
+        writer.record_run_history(Scraper.run_history_row("bench", entry, len(targets), i, 0))
+        writer.target_done()
+        if args.target_secs:
+            time.sleep(args.target_secs)
+    writer.close()
+
+    stats = client.stats()
+    n = max(1, len(targets))
+    return {
+        "rows": rows,
+        "scan": scan_mode,
+        "targets": len(targets),
+        "scan_calls": scan_calls,
+        "cells_read": stats["cells_read"],
+        "calls": stats["calls"],
+        "calls_per_target": stats["calls"] / n,
+        "wait_secs": Scraper.SHEETS.wait_secs,
+        "backoff_secs": Scraper.SHEETS.backoff_secs,
+        "throttled": sum(stats["throttled"].values()),
+        "wall_secs": time.perf_counter() - started,
+        "errors": writer.errors,
+        "unwritten": len(writer.journal.pending) + sum(len(c) for c in writer.buffer.pending.values()),
+        "by_method": stats["by_method"],
+    }
+
+def bench_sheets(args) -> int:
+    """API calls, 429s and throttling stalls per target for different MsgList sizes"""
+    workdir = tempfile.mkdtemp(prefix="dd-bench-")
+    # Keep the real sheets untouched even if credentials.json is present
+    Scraper.PROFILES_SHEET_ID = ""
+    log_msg(
+        f"🧪 In-memory Sheets: {args.read_quota} reads / {args.write_quota} writes per {args.window:g}s, "
+        f"{args.latency * 1000:.0f}ms per call"
+    )
+    results = []
+    try:
+        for rows in args.rows or [100, 1000, 5000]:
+            for scan_mode in args.scan:
+                results.append(_sheets_run(args, rows, scan_mode, workdir))
+    finally:
+        Scraper.use_gspread_client(None)
+        Scraper.SHEETS = Scraper.SheetsScheduler()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    table = Table(title=f"Sheets API per run ({args.targets} pending targets)")
+    for col in ("MsgList rows", "scan", "scan calls", "cells read", "calls", "calls/target", "429s", "paced s", "backoff s", "wall s", "unwritten"):
+        table.add_column(col)
+    for r in results:
+        table.add_row(
+            str(r["rows"]), r["scan"], str(r["scan_calls"]), str(r["cells_read"]), str(r["calls"]), f"{r['calls_per_target']:.2f}",
+            str(r["throttled"]), f"{r['wait_secs']:.1f}", f"{r['backoff_secs']:.1f}", f"{r['wall_secs']:.1f}", str(r["unwritten"]),
+        )
+    console.print(table)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"mode": "bench-sheets", "results": results}, f, indent=2)
+    return 1 if any(r["unwritten"] for r in results) else 0
+
+# ============================================================================
+# NORMALIZATION HOT PATH (synthetic Profiles rows)
+# ============================================================================
+
+BENCH_CITIES = ["Lahore", "Karachi", "Islamabad", "Multan", "Peshawar", "Quetta", "Not set", "no city", "  Faisal\xa0abad "]
+BENCH_TIMES = ["5 mins ago", "2 hrs ago", "3 days ago", "just now", "1 week ago", "11 months ago", "Yesterday"]
+
+def synthetic_profiles_rows(n: int) -> list[list[str]]:
+    """Profiles B:K rows shaped like the real sheet (values repeat the way they do there)"""
+    rows = []
+    for i in range(n):
+        nick = f"User_{i}" if i % 3 else f"user.{i}"
+        rows.append([
+            nick, "", BENCH_CITIES[i % len(BENCH_CITIES)], "Male", "No", str(18 + i % 40), "",
+            str(i % 997), "", str(i % 311),
+        ])
+    return rows
+
+def _time_per_call(fn, inputs: list) -> float:
+    started = time.perf_counter()
+    for value in inputs:
+        fn(value)
+    return (time.perf_counter() - started) / max(1, len(inputs))
+
+def bench_normalize(args) -> int:
+    """Profiles lookup build time and per-call cost of the normalization helpers"""
+    table = Table(title="build_profiles_lookup")
+    for col in ("rows", "cold ms", "warm ms", "µs/row (cold)", "µs/row (warm)", "keys"):
+        table.add_column(col)
+    for n in args.rows or [1000, 10000, 100000]:
+        rows = synthetic_profiles_rows(n)
+        refreshed = [(r[0], {"CITY": "Lahore", "FOLLOWERS": "1", "POSTS": "2"}) for r in rows[: n // 10]]
+        cold, warm = [], []
+        for _ in range(args.repeat):
+            Normalize.cache_clear()
+            started = time.perf_counter()
+            lookup = Scraper.build_profiles_lookup(rows, refreshed)
+            cold.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            Scraper.build_profiles_lookup(rows, refreshed)
+            warm.append(time.perf_counter() - started)
+        cold_s, warm_s = min(cold), min(warm)
+        table.add_row(
+            str(n), f"{cold_s * 1000:.1f}", f"{warm_s * 1000:.1f}",
+            f"{cold_s / n * 1e6:.2f}", f"{warm_s / n * 1e6:.2f}", str(len(lookup)),
+        )
+    console.print(table)
+
+    n = max(args.rows or [100000])
+    rows = synthetic_profiles_rows(n)
+    urls = [f"{Scraper.BASE_URL}/comments/text/{i % 5000}/#reply" for i in range(n)]
+    cases = {
+        "clean_text": (Scraper.clean_text, [r[2] for r in rows]),
+        "_normalize_profile_key": (Scraper._normalize_profile_key, [r[0] for r in rows]),
+        "_looks_like_url": (Scraper._looks_like_url, [r[0] for r in rows]),
+        "clean_url": (Scraper.clean_url, urls),
+        "extract_text_comment_url": (Scraper.extract_text_comment_url, urls),
+        "convert_relative_date_to_absolute": (
+            Scraper.convert_relative_date_to_absolute, [BENCH_TIMES[i % len(BENCH_TIMES)] for i in range(n)]
+        ),
+    }
+    table = Table(title=f"Helpers ({n} inputs)")
+    for col in ("helper", "cold ns/call", "warm ns/call"):
+        table.add_column(col)
+    for name, (fn, inputs) in cases.items():
+        Normalize.cache_clear()
+        cold = _time_per_call(fn, inputs)
+        warm = _time_per_call(fn, inputs)
+        table.add_row(name, f"{cold * 1e9:.0f}", f"{warm * 1e9:.0f}")
+    console.print(table)
+    for name, info in Normalize.cache_info().items():
+        if info["hits"] or info["misses"]:
+            log_msg(f"🗃️ {name}: {info['hits']} hits, {info['misses']} misses, {info['currsize']}/{info['maxsize']} cached")
+    return 0
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="DamaDam bot benchmarks")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p = sub.add_parser("profile-extract", help="WebDriver lookups vs single execute_script")
+    p.add_argument("--nick", action="append", required=True, help="profile nickname (repeatable)")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--login", action="store_true", help="log in before loading profiles")
+    p.set_defaults(func=bench_profile_extract)
+
+    p = sub.add_parser("e2e", help="whole targets against the local stand-in site")
+    p.add_argument("--targets", type=int, default=10)
+    p.add_argument("--latency", type=float, default=0.05, help="seconds added to every response")
+    p.add_argument("--jitter", type=float, default=0.0)
+    p.add_argument("--open-page-spread", type=int, default=2, help="open post lands on posts page 1..N")
+    p.add_argument("--backend", default="", help="override DD_FETCH_BACKEND for this run")
+    p.add_argument("--budget", type=float, default=0.0, help="fail when target p95 exceeds this many seconds")
+    p.add_argument("--output", default="", help="write the run profile JSON here")
+    p.set_defaults(func=bench_e2e)
+
+    p = sub.add_parser("sheets", help="Sheets API calls and 429 stalls against the in-memory fake")
+    p.add_argument("--rows", type=int, action="append", help="MsgList size (repeatable, default 100/1000/5000)")
+    p.add_argument("--targets", type=int, default=20, help="pending rows at the end of MsgList")
+    p.add_argument("--scan", action="append", choices=["status", "full"], help="scan mode(s), default both")
+    p.add_argument("--read-quota", type=int, default=60, help="read requests per window (0 = unlimited)")
+    p.add_argument("--write-quota", type=int, default=60, help="write requests per window (0 = unlimited)")
+    p.add_argument("--window", type=float, default=60.0, help="quota window in seconds")
+    p.add_argument("--latency", type=float, default=0.0, help="seconds added to every API call")
+    p.add_argument("--target-secs", type=float, default=0.0, help="simulated browser time per target")
+    p.add_argument("--unpaced", action="store_true", help="no quota pacing, only back off after 429s")
+    p.add_argument("--output", default="", help="write the results JSON here")
+    p.set_defaults(func=bench_sheets)
+
+    p = sub.add_parser("normalize", help="Profiles lookup build and text/URL normalization microbenchmarks")
+    p.add_argument("--rows", type=int, action="append", help="Profiles rows (repeatable, default 1k/10k/100k)")
+    p.add_argument("--repeat", type=int, default=3, help="best of N builds per size")
+    p.set_defaults(func=bench_normalize)
+
+    args = parser.parse_args()
+    if args.bench == "sheets" and not args.scan:
+        args.scan = ["status", "full"]
+    return args.func(args)
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,314 @@
+"""
+DamaDam Bot - In-memory Google Sheets stand-in
+Implements the gspread client/spreadsheet/worksheet calls Scraper.py makes,
+keeps every sheet in memory and enforces per-minute read/write quotas by
+raising the same 429 APIError the real API returns.
+
+Usage:
+    DD_FAKE_SHEETS=1 python Scraper.py
+    DD_FAKE_SHEETS="read=60,write=60,latency=0.1,msglist=500,pending=20" python Scraper.py
+"""
+
+import re
+import time
+import json
+import threading
+from collections import deque
+
+from gspread.exceptions import APIError, WorksheetNotFound
+
+# ============================================================================
+# QUOTAS
+# ============================================================================
+
+class _FakeResponse:
+    """Just enough of requests.Response for gspread's APIError"""
+
+    def __init__(self, status_code: int, message: str, retry_after: float = 0.0):
+        self.status_code = status_code
+        self.headers = {"Retry-After": str(max(1, round(retry_after)))} if retry_after else {}
+        self._body = {"error": {"code": status_code, "message": message, "status": "RESOURCE_EXHAUSTED"}}
+        self.text = json.dumps(self._body)
+
+    def json(self):
+        return self._body
+
+class QuotaLimiter:
+    """Sliding-window request counter per kind ("read" / "write"), like the Sheets per-minute quotas"""
+
+    def __init__(self, limits: dict, window: float = 60.0):
+        self.limits = limits
+        self.window = window
+        self._calls = {kind: deque() for kind in limits}
+        self._lock = threading.Lock()
+        self.throttled = {kind: 0 for kind in limits}
+
+    def charge(self, kind: str):
+        limit = self.limits.get(kind) or 0
+        if limit <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            calls = self._calls[kind]
+            while calls and now - calls[0] >= self.window:
+                calls.popleft()
+            if len(calls) >= limit:
+                self.throttled[kind] += 1
+                retry_after = self.window - (now - calls[0])
+                raise APIError(_FakeResponse(
+                    429,
+                    f"Quota exceeded for quota metric '{kind.title()} requests' ({limit} per {self.window:g}s)",
+                    retry_after,
+                ))
+            calls.append(now)
+
+# ============================================================================
+# A1 NOTATION
+# ============================================================================
+
+_A1_RE = re.compile(r"^(?:(?P<title>'[^']+'|[^!]+)!)?(?P<c1>[A-Z]*)(?P<r1>\d*)(?::(?P<c2>[A-Z]*)(?P<r2>\d*))?$")
+
+def col_number(letters: str) -> int:
+    n = 0
+    for ch in letters:
+        n = n * 26 + ord(ch) - 64
+    return n
+
+def col_letters(n: int) -> str:
+    letters = ""
+    while n:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+def parse_range(a1: str, max_rows: int, max_cols: int) -> tuple[int, int, int, int]:
+    """(first_row, first_col, last_row, last_col), 1-based and inclusive; open ends run to the grid edge"""
+    match = _A1_RE.match(a1.strip().upper())
+    if not match:
+        raise ValueError(f"Unsupported range: {a1}")
+    c1, r1, c2, r2 = match.group("c1", "r1", "c2", "r2")
+    single = match.group("c2") is None and match.group("r2") is None
+    first_row = int(r1) if r1 else 1
+    first_col = col_number(c1) if c1 else 1
+    if single:
+        return first_row, first_col, first_row, first_col
+    last_row = int(r2) if r2 else max_rows
+    last_col = col_number(c2) if c2 else max_cols
+    return first_row, first_col, last_row, last_col
+
+def _trim(rows: list[list[str]]) -> list[list[str]]:
+    """Drop trailing empty cells and rows the way the values API does"""
+    out = []
+    for row in rows:
+        row = list(row)
+        while row and row[-1] == "":
+            row.pop()
+        out.append(row)
+    while out and not out[-1]:
+        out.pop()
+    return out
+
+# ============================================================================
+# CLIENT / SPREADSHEET / WORKSHEET
+# ============================================================================
+
+class FakeWorksheet:
+    def __init__(self, spreadsheet: "FakeSpreadsheet", title: str, rows: int = 1000, cols: int = 26):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.row_count = rows
+        self.col_count = cols
+        self.cells: list[list[str]] = []
+
+    def _call(self, kind: str, method: str):
+        self.spreadsheet.client.charge(kind, method)
+
+    def _ensure(self, row: int, col: int):
+        if row > self.row_count:
+            self.row_count = row
+        if col > self.col_count:
+            self.col_count = col
+        while len(self.cells) < row:
+            self.cells.append([])
+        line = self.cells[row - 1]
+        if len(line) < col:
+            line.extend([""] * (col - len(line)))
+
+    def _write(self, row: int, col: int, values: list[list]):
+        for r_off, line in enumerate(values):
+            for c_off, value in enumerate(line):
+                self._ensure(row + r_off, col + c_off)
+                self.cells[row + r_off - 1][col + c_off - 1] = "" if value is None else str(value)
+
+    def _read(self, a1: str) -> list[list[str]]:
+        r1, c1, r2, c2 = parse_range(a1, max(self.row_count, len(self.cells)), self.col_count)
+        out = []
+        for r in range(r1, min(r2, len(self.cells)) + 1):
+            line = self.cells[r - 1]
+            out.append([line[c - 1] if c - 1 < len(line) else "" for c in range(c1, c2 + 1)])
+        out = _trim(out)
+        self.spreadsheet.client.count_cells(out)
+        return out
+
+    def get_all_values(self, **kwargs) -> list[list[str]]:
+        self._call("read", "get_all_values")
+        width = max((len(r) for r in self.cells), default=0)
+        out = [list(r) + [""] * (width - len(r)) for r in _trim(self.cells)]
+        self.spreadsheet.client.count_cells(out)
+        return out
+
+    def get(self, range_name: str = "", **kwargs) -> list[list[str]]:
+        self._call("read", "get")
+        return self._read(range_name or f"A1:{col_letters(self.col_count)}")
+
+    def batch_get(self, ranges: list[str], **kwargs) -> list[list[list[str]]]:
+        self._call("read", "batch_get")
+        return [self._read(a1) for a1 in ranges]
+
+    def row_values(self, row: int, **kwargs) -> list[str]:
+        self._call("read", "row_values")
+        line = self.cells[row - 1] if row <= len(self.cells) else []
+        return _trim([line])[0] if _trim([line]) else []
+
+    def update_cell(self, row: int, col: int, value):
+        self._call("write", "update_cell")
+        self._write(row, col, [[value]])
+
+    def update(self, range_name=None, values=None, **kwargs):
+        self._call("write", "update")
+        if isinstance(range_name, list):  # gspread 6 positional order: (values, range_name)
+            range_name, values = values, range_name
+        r1, c1, _, _ = parse_range(range_name or "A1", self.row_count, self.col_count)
+        self._write(r1, c1, values or [])
+
+    def batch_update(self, data: list[dict], **kwargs):
+        self._call("write", "batch_update")
+        for entry in data:
+            r1, c1, _, _ = parse_range(entry["range"], self.row_count, self.col_count)
+            self._write(r1, c1, entry["values"])
+
+    def insert_row(self, values: list, index: int = 1, **kwargs):
+        self._call("write", "insert_row")
+        while len(self.cells) < index - 1:
+            self.cells.append([])
+        self.cells.insert(index - 1, ["" if v is None else str(v) for v in values])
+        self.row_count += 1
+        self.col_count = max(self.col_count, len(values))
+
+    def append_rows(self, values: list[list], table_range: str | None = None, **kwargs) -> dict:
+        self._call("write", "append_rows")
+        first = len(_trim(self.cells)) + 1
+        self._write(first, 1, values)
+        last = first + len(values) - 1
+        width = max((len(v) for v in values), default=1)
+        return {"updates": {"updatedRange": f"{self.title}!A{first}:{col_letters(width)}{last}", "updatedRows": len(values)}}
+
+    def add_cols(self, cols: int):
+        self._call("write", "add_cols")
+        self.col_count += cols
+
+    def clear(self):
+        self._call("write", "clear")
+        self.cells = []
+
+class FakeSpreadsheet:
+    def __init__(self, client: "FakeSheetsClient", key: str):
+        self.client = client
+        self.id = key
+        self._worksheets: dict[str, FakeWorksheet] = {}
+
+    def worksheets(self) -> list[FakeWorksheet]:
+        self.client.charge("read", "worksheets")
+        return list(self._worksheets.values())
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        self.client.charge("read", "worksheet")
+        if title not in self._worksheets:
+            raise WorksheetNotFound(title)
+        return self._worksheets[title]
+
+    def add_worksheet(self, title: str, rows: int = 1000, cols: int = 26, **kwargs) -> FakeWorksheet:
+        self.client.charge("write", "add_worksheet")
+        ws = FakeWorksheet(self, title, rows, cols)
+        self._worksheets[title] = ws
+        return ws
+
+class FakeSheetsClient:
+    """Drop-in for the authorized gspread client; spreadsheets are created on first open.
+
+    ``read_quota`` / ``write_quota`` are requests per ``window`` seconds
+    (0 = unlimited); ``latency`` is added to every call.
+    """
+
+    def __init__(self, read_quota: int = 60, write_quota: int = 60, window: float = 60.0, latency: float = 0.0):
+        self.quota = QuotaLimiter({"read": read_quota, "write": write_quota}, window)
+        self.latency = latency
+        self.spreadsheets: dict[str, FakeSpreadsheet] = {}
+        self.calls: dict[str, int] = {}
+        self.cells_read = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "FakeSheetsClient":
+        """Build from DD_FAKE_SHEETS ("1" or "read=60,write=60,window=60,latency=0,msglist=0,pending=0")"""
+        opts = {}
+        for part in (spec or "").split(","):
+            if "=" in part:
+                key, value = (p.strip() for p in part.split("=", 1))
+                opts[key.lower()] = float(value or 0)
+        client = cls(
+            read_quota=int(opts.get("read", 60)),
+            write_quota=int(opts.get("write", 60)),
+            window=opts.get("window", 60.0),
+            latency=opts.get("latency", 0.0),
+        )
+        client.seed_rows = int(opts.get("msglist", 0))
+        client.seed_pending = int(opts.get("pending", opts.get("msglist", 0)))
+        return client
+
+    def charge(self, kind: str, method: str):
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+        self.quota.charge(kind)
+
+    def count_cells(self, rows: list[list[str]]):
+        with self._lock:
+            self.cells_read += sum(len(r) for r in rows)
+
+    def open_by_key(self, key: str) -> FakeSpreadsheet:
+        self.charge("read", "open_by_key")
+        with self._lock:
+            if key not in self.spreadsheets:
+                self.spreadsheets[key] = FakeSpreadsheet(self, key)
+            return self.spreadsheets[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            calls = dict(self.calls)
+        return {
+            "calls": sum(calls.values()),
+            "by_method": calls,
+            "cells_read": self.cells_read,
+            "throttled": dict(self.quota.throttled),
+        }
+
+# ============================================================================
+# SEEDING
+# ============================================================================
+
+MSGLIST_HEADERS = ["MODE", "NAME", "NICK/URL", "CITY", "POSTS", "FOLLOWERS", "MESSAGE", "STATUS", "NOTES", "RESULT URL"]
+
+def seed_msglist(client: FakeSheetsClient, sheet_id: str, rows: int, pending: int, message: str = "Hi {{name}} from {{city}}!") -> FakeWorksheet:
+    """MsgList with ``rows`` nick targets (bench0..); the last ``pending`` are Pending, the rest Done"""
+    book = client.spreadsheets.setdefault(sheet_id, FakeSpreadsheet(client, sheet_id))
+    ws = book._worksheets.get("MsgList") or FakeWorksheet(book, "MsgList", rows=max(1000, rows + 1), cols=10)
+    book._worksheets["MsgList"] = ws
+    ws.cells = [list(MSGLIST_HEADERS)]
+    first_pending = rows - min(pending, rows)
+    for i in range(rows):
+        status = "Pending" if i >= first_pending else "Done"
+        ws.cells.append(["nick", f"Bench {i}", f"bench{i}", "", "", "", message, status, "", ""])
+    ws.row_count = max(ws.row_count, len(ws.cells))
+    return ws
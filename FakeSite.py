@@ -0,0 +1,260 @@
+"""
+DamaDam Bot - Local stand-in site
+Serves fixture pages shaped like damadam.pk so the bot can be timed offline:
+login, profiles, paginated posts pages and comment pages with a working
+reply form. Every response can be delayed to simulate network latency.
+
+Usage:
+    python FakeSite.py --port 8765 --latency 0.05
+    DD_BASE_URL=http://127.0.0.1:8765 python Scraper.py
+"""
+
+import time
+import html
+import zlib
+import random
+import argparse
+import threading
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+CITIES = ["Lahore", "Karachi", "Islamabad", "Multan", "Peshawar", "Quetta"]
+POSTS_PER_PAGE = 5
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title></head>
+<body>{body}</body></html>"""
+
+def _seed(nick: str) -> int:
+    return zlib.crc32(nick.lower().encode("utf-8"))
+
+def _page(title: str, body: str) -> str:
+    return PAGE.format(title=html.escape(title), body=body)
+
+def login_page(error: str = "") -> str:
+    return _page("Login", f"""
+<form method="post" action="/login/">
+  <input type="hidden" name="csrfmiddlewaretoken" value="bench-csrf">
+  <input id="nick" name="nick" type="text">
+  <input id="pass" name="pass" type="password">
+  <button type="submit">Login</button>
+</form>
+<p>{html.escape(error)}</p>""")
+
+def home_page(nick: str) -> str:
+    return _page("DamaDam", f'<nav><a href="/users/{html.escape(nick)}/">{html.escape(nick)}</a></nav><h1>Home</h1>')
+
+def profile_page(nick: str, open_page: int) -> str:
+    seed = _seed(nick)
+    safe = html.escape(nick)
+    posts = POSTS_PER_PAGE * open_page + seed % 40
+    return _page(nick, f"""
+<h1 class="cxl clb lsp">{safe}</h1>
+<div><span class="cl sp lsp nos">Hi, I am {safe}</span></div>
+<div><b>City:</b> <span>{CITIES[seed % len(CITIES)]}</span></div>
+<div><b>Gender:</b> <span>{"Female" if seed % 2 else "Male"}</span></div>
+<div><b>Married:</b> <span>{"Yes" if seed % 3 == 0 else "No"}</span></div>
+<div><b>Age:</b> <span>{18 + seed % 30}</span></div>
+<div><b>Joined:</b> <span>{1 + seed % 5} years ago</span></div>
+<span class="cl sp clb">{seed % 900} followers</span>
+<a href="/profile/public/{safe}/"><button><div>{posts}</div><div>posts</div></button></a>
+<img src="https://x.cloudfront.net/avatar-imgs/thumbnail/{seed}.jpg">
+<form action="/follow/add/" method="post"><button><img src="/static/follow.svg"></button></form>""")
+
+def post_id(nick: str, page: int, idx: int) -> int:
+    return (_seed(nick) % 100000) * 1000 + page * 10 + idx
+
+def posts_page(nick: str, page: int, open_page: int) -> str:
+    """Pages before ``open_page`` only hold posts with closed comments"""
+    safe = html.escape(nick)
+    articles = []
+    for idx in range(POSTS_PER_PAGE):
+        pid = post_id(nick, page, idx)
+        reply = ""
+        if page == open_page and idx == 0:
+            reply = f'<a href="/comments/text/{pid}/"><button itemprop="discussionUrl">REPLY</button></a>'
+        articles.append(
+            f'<article class="mbl"><a href="/content/{pid}/g/">post {pid}</a>'
+            f'<span itemprop="datePublished">{page * 3 + idx} hrs ago</span>{reply}</article>'
+        )
+    next_link = f'<a rel="next" href="/profile/public/{safe}/?page={page + 1}">NEXT</a>' if page < open_page else ""
+    return _page(f"{nick} posts", "".join(articles) + next_link)
+
+def comment_page(pid: int, comments: list[tuple[str, str]], logged_in: bool) -> str:
+    items = "".join(
+        f'<div class="cmt"><a href="/users/{html.escape(author)}/">{html.escape(author)}</a> '
+        f'<bdi>{html.escape(text)}</bdi></div>'
+        for author, text in comments
+    )
+    form = ""
+    if logged_in:
+        form = f"""
+<form action="/direct-response/send/" method="post" style="display:none">
+  <input type="hidden" name="csrfmiddlewaretoken" value="bench-csrf">
+  <textarea name="direct_response"></textarea><button type="submit">SEND</button>
+</form>
+<form action="/direct-response/send/" method="post">
+  <input type="hidden" name="csrfmiddlewaretoken" value="bench-csrf">
+  <input type="hidden" name="obid" value="{pid}">
+  <textarea name="direct_response" id="id_direct_response" class="inp" maxlength="350"></textarea>
+  <button type="submit">SEND</button>
+</form>"""
+    return _page(f"Post {pid}", f'<article class="mbl"><bdi>Post {pid}</bdi></article>{items}{form}')
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+class FakeSite:
+    """Threaded stand-in for damadam.pk on 127.0.0.1.
+
+    ``latency`` (seconds, plus up to ``jitter``) is added to every response.
+    Nicks are made up on demand; ``open_page_spread`` controls how many posts
+    pages ``find_first_open_post`` has to walk (1 = open post on page 1).
+    """
+
+    def __init__(self, port: int = 0, latency: float = 0.0, jitter: float = 0.0, open_page_spread: int = 2):
+        self.latency = latency
+        self.jitter = jitter
+        self.open_page_spread = max(1, open_page_spread)
+        self.sessions: dict[str, str] = {}
+        self.comments: dict[int, list[tuple[str, str]]] = {}
+        self.requests = 0
+        self.sent = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def open_page(self, nick: str) -> int:
+        return 1 + (_seed(nick) >> 8) % self.open_page_spread
+
+    def start(self) -> "FakeSite":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="fake-site", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self.server.shutdown()
+            self._thread = None
+        self.server.server_close()
+
+    def _handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _session_nick(self) -> str:
+                cookie = SimpleCookie(self.headers.get("Cookie") or "")
+                sid = cookie["sessionid"].value if "sessionid" in cookie else ""
+                return site.sessions.get(sid, "")
+
+            def _delay(self):
+                with site._lock:
+                    site.requests += 1
+                if site.latency or site.jitter:
+                    time.sleep(site.latency + random.uniform(0, site.jitter))
+
+            def _send(self, body: str, status: int = 200, headers: dict | None = None):
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _redirect(self, location: str, headers: dict | None = None):
+                self._send("", 302, {"Location": location, **(headers or {})})
+
+            def _form(self) -> dict:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length).decode("utf-8") if length else ""
+                return {k: v[0] for k, v in parse_qs(raw, keep_blank_values=True).items()}
+
+            def do_GET(self):
+                self._delay()
+                url = urlparse(self.path)
+                parts = [p for p in url.path.split("/") if p]
+                nick = self._session_nick()
+                if not parts:
+                    if not nick:
+                        return self._redirect("/login/")
+                    return self._send(home_page(nick))
+                if parts == ["login"]:
+                    return self._send(login_page())
+                if len(parts) == 2 and parts[0] == "users":
+                    return self._send(profile_page(parts[1], site.open_page(parts[1])))
+                if len(parts) == 3 and parts[:2] == ["profile", "public"]:
+                    page = int((parse_qs(url.query).get("page") or ["1"])[0] or 1)
+                    return self._send(posts_page(parts[2], page, site.open_page(parts[2])))
+                if len(parts) == 3 and parts[:2] == ["comments", "text"] and parts[2].isdigit():
+                    pid = int(parts[2])
+                    with site._lock:
+                        comments = list(site.comments.setdefault(pid, [("someone", "first!")]))
+                    return self._send(comment_page(pid, comments, bool(nick)))
+                if parts[0] == "static":
+                    return self._send("")
+                return self._send(_page("Not found", "<h1>404</h1>"), 404)
+
+            def do_POST(self):
+                self._delay()
+                parts = [p for p in urlparse(self.path).path.split("/") if p]
+                form = self._form()
+                if parts == ["login"]:
+                    nick = (form.get("nick") or "").strip()
+                    if not nick or not form.get("pass"):
+                        return self._send(login_page("Wrong nick or password"))
+                    sid = f"s{random.getrandbits(64):x}"
+                    site.sessions[sid] = nick
+                    return self._redirect("/", {"Set-Cookie": f"sessionid={sid}; Path=/"})
+                if parts == ["direct-response", "send"]:
+                    nick = self._session_nick()
+                    pid = int(form.get("obid") or 0)
+                    text = (form.get("direct_response") or "").strip()
+                    if not nick or not pid or not text:
+                        return self._send(_page("Forbidden", "<h1>403</h1>"), 403)
+                    with site._lock:
+                        site.comments.setdefault(pid, [("someone", "first!")]).append((nick, text[:350]))
+                        site.sent += 1
+                    return self._redirect(f"/comments/text/{pid}/")
+                return self._send(_page("Not found", "<h1>404</h1>"), 404)
+
+        return Handler
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Local stand-in for damadam.pk")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random delay up to this many seconds")
+    parser.add_argument("--open-page-spread", type=int, default=2, help="open post lands on posts page 1..N")
+    args = parser.parse_args()
+
+    site = FakeSite(args.port, args.latency, args.jitter, args.open_page_spread).start()
+    print(f"Serving stand-in site on {site.url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        site.stop()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
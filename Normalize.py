@@ -0,0 +1,164 @@
+"""
+DamaDam Bot - Text and URL normalization
+The string clean-up helpers that run for every target and every Profiles row:
+patterns are compiled once, lookup tables are module constants and results are
+memoized in bounded LRU caches where inputs repeat (cities, placeholder values,
+post URLs, "N hrs ago"). Per-row unique inputs such as nicks are not cached;
+they take a fast path instead. Functions that depend on the site root take it as an argument so
+cache entries never outlive a ``set_base_url()``.
+"""
+
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+# ============================================================================
+# TABLES & PATTERNS
+# ============================================================================
+
+PKT_OFFSET = timedelta(hours=5)
+
+# Placeholder values that mean "nothing here"
+BLANK_VALUES = frozenset({
+    "No city", "Not set", "[No Posts]", "N/A", "no city", "not set", "[no posts]", "n/a",
+    "[No Post URL]", "[Error]", "none", "null", "no age", "no set",
+})
+
+# Relative-date units (and the abbreviations damadam uses) in seconds
+UNIT_SECONDS = {
+    "sec": 1, "secs": 1, "second": 1, "seconds": 1,
+    "min": 60, "mins": 60, "minute": 60, "minutes": 60,
+    "hr": 3600, "hrs": 3600, "hour": 3600, "hours": 3600,
+    "day": 86400, "days": 86400,
+    "week": 604800, "weeks": 604800,
+    "month": 2592000, "months": 2592000,
+    "year": 31536000, "years": 31536000,
+}
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_TEXT_COMMENT_RE = re.compile(r"/comments/text/(\d+)/")
+_IMAGE_COMMENT_RE = re.compile(r"/comments/image/(\d+)/")
+_REPLY_ID_RE = re.compile(r"/\d+/#reply$")
+_REPLY_RE = re.compile(r"/#reply$")
+_RELATIVE_DATE_RE = re.compile(
+    r"(\d+)\s*(" + "|".join(sorted(UNIT_SECONDS, key=len, reverse=True)) + r")\s*ago"
+)
+_JUST_NOW = ("just now", "abhi")
+
+# ============================================================================
+# TEXT
+# ============================================================================
+
+def pkt_now() -> datetime:
+    """Current time in Pakistan (UTC+5), naive"""
+    return datetime.now(timezone.utc).replace(tzinfo=None) + PKT_OFFSET
+
+@lru_cache(maxsize=65536)
+def _clean_text(v: str) -> str:
+    v = v.strip().replace("\xa0", " ")
+    return "" if v in BLANK_VALUES else _WHITESPACE_RE.sub(" ", v)
+
+def clean_text(v) -> str:
+    """Collapse whitespace; placeholder values ("Not set", "N/A", ...) become empty"""
+    if not v:
+        return ""
+    return _clean_text(str(v))
+
+def normalize_profile_key(value: str) -> str:
+    """Lower-cased nick with everything but a-z/0-9 removed (Profiles lookup key)"""
+    v = (value or "").strip().lower()
+    if v.isascii() and v.isalnum():
+        return v
+    return _NON_ALNUM_RE.sub("", v)
+
+@lru_cache(maxsize=4096)
+def _relative_seconds(text: str) -> int | None:
+    """Age in seconds of "5 mins ago" / "2 hrs ago" / "just now"; None when not relative"""
+    t = text.lower().strip()
+    if any(keyword in t for keyword in _JUST_NOW):
+        return 0
+    m = _RELATIVE_DATE_RE.search(t)
+    if not m:
+        return None
+    return int(m.group(1)) * UNIT_SECONDS[m.group(2)]
+
+def convert_relative_date_to_absolute(text: str, now: datetime | None = None) -> str:
+    """Convert relative dates ("3 hrs ago") to dd-Mon-yy; anything else is returned unchanged"""
+    if not text:
+        return ""
+    seconds = _relative_seconds(text)
+    if seconds is None:
+        return text
+    if now is not None:
+        return (now - timedelta(seconds=seconds)).strftime("%d-%b-%y")
+    return _date_ago(seconds, int(time.time() // 60))
+
+@lru_cache(maxsize=1024)
+def _date_ago(seconds: int, minute: int) -> str:
+    """dd-Mon-yy (PKT) ``seconds`` before the start of epoch ``minute``"""
+    now = datetime.fromtimestamp(minute * 60, timezone.utc).replace(tzinfo=None) + PKT_OFFSET
+    return (now - timedelta(seconds=seconds)).strftime("%d-%b-%y")
+
+# ============================================================================
+# URLS
+# ============================================================================
+
+def looks_like_url(value: str, site_host: str = "") -> bool:
+    v = (value or "").strip().lower()
+    return v.startswith("http") or "damadam.pk" in v or bool(site_host and site_host in v)
+
+@lru_cache(maxsize=16384)
+def clean_url(url: str, base_url: str) -> str:
+    """Canonical comments URL, or ``url`` without reply fragments and trailing slashes"""
+    url = str(url).strip()
+
+    text_match = _TEXT_COMMENT_RE.search(url)
+    if text_match:
+        return f"{base_url}/comments/text/{text_match.group(1)}"
+
+    image_match = _IMAGE_COMMENT_RE.search(url)
+    if image_match:
+        return f"{base_url}/comments/image/{image_match.group(1)}"
+
+    url = _REPLY_ID_RE.sub("", url)
+    url = _REPLY_RE.sub("", url)
+    return url.rstrip("/")
+
+def to_absolute_url(href: str, base_url: str) -> str:
+    if not href:
+        return ""
+    href = href.strip()
+    if href.startswith("/"):
+        return f"{base_url}{href}"
+    if not href.startswith("http"):
+        return f"{base_url}/{href}"
+    return href
+
+@lru_cache(maxsize=16384)
+def extract_text_comment_url(href: str, base_url: str) -> str:
+    match = _TEXT_COMMENT_RE.search(href)
+    if match:
+        return f"{base_url}/comments/text/{match.group(1)}"
+    return to_absolute_url(href, base_url)
+
+@lru_cache(maxsize=16384)
+def extract_image_comment_url(href: str, base_url: str) -> str:
+    match = _IMAGE_COMMENT_RE.search(href)
+    if match:
+        return f"{base_url}/content/{match.group(1)}/g/"
+    return to_absolute_url(href, base_url)
+
+def cache_info() -> dict:
+    """Hit/miss counters of every memoized helper"""
+    return {
+        fn.__name__.lstrip("_"): fn.cache_info()._asdict()
+        for fn in (_clean_text, _relative_seconds, _date_ago, clean_url,
+                   extract_text_comment_url, extract_image_comment_url)
+    }
+
+def cache_clear():
+    for fn in (_clean_text, _relative_seconds, _date_ago, clean_url,
+               extract_text_comment_url, extract_image_comment_url):
+        fn.cache_clear()
@@ -1,5 +1,5 @@
 """
-DamaDam Bot - Message Sender V1.1.100.2 (Enhanced)
+DamaDam Bot - Message Sender V1.1.101.0 (Enhanced)
 Flow: Run → Pick Nick → Scrape Profile → Go to Posts → Pick Post → 
       Post Msg → Send with CSRF → Refresh & Verify → Update Sheet → Next Nick
 """
@@ -9,25 +9,39 @@ import os
 import sys
 import re
 import pickle
+import json
+import sqlite3
 import threading
+import queue
+import atexit
 import argparse
+import math
+import random
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
 from datetime import datetime, timedelta, timezone
 import gspread
 from google.oauth2.service_account import Credentials
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException
 from gspread.exceptions import WorksheetNotFound
+from google.auth.exceptions import TransportError
 import subprocess
+from urllib.parse import urljoin, urlparse
 from rich.console import Console
 from rich.progress import Progress
+from rich.markup import escape
+from rich.table import Table
+import Normalize
 
 console = Console()
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 try:
     from dotenv import load_dotenv
 
@@ -35,11 +49,30 @@ try:
 except Exception:
     pass
 
+# Selenium is imported on first browser use (_load_selenium); runs with nothing
+# to do, --plan and the profiles refresh never pay for it
+webdriver = By = Service = Options = WebDriverWait = EC = None
+
+class _SeleniumNotLoaded(Exception):
+    """Stands in for selenium's exception classes until _load_selenium() runs"""
+
+TimeoutException = WebDriverException = NoSuchElementException = _SeleniumNotLoaded
+
+# Optional: HTTP fast path for read-only pages (falls back to Selenium without it)
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from bs4 import BeautifulSoup
+except ImportError:
+    requests = None
+    HTTPAdapter = None
+    BeautifulSoup = None
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
 
-VERSION = "1.1.100.2"
+VERSION = "1.1.101.0"
 
 DEBUG = os.environ.get("DD_DEBUG", "0").strip() == "1"
 VERBOSE_FORMS = os.environ.get("DD_VERBOSE_FORMS", "0").strip() == "1"
@@ -48,20 +81,82 @@ PROFILES_SHEET_ID = os.environ.get(
     "DD_PROFILES_SHEET_ID",
     "16t-D8dCXFvheHEpncoQ_VnXQKkrEREAup7c1ZLFXvu0",
 ).strip()
-GSHEET_API_CALLS = 0
+# Sheets API quotas (requests per minute per user; Google's defaults are 60 read + 60 write)
+SHEETS_READ_QUOTA = int(os.environ.get("DD_SHEETS_READ_QUOTA", "60") or "60")
+SHEETS_WRITE_QUOTA = int(os.environ.get("DD_SHEETS_WRITE_QUOTA", "60") or "60")
+MSGLIST_FLUSH_EVERY = int(os.environ.get("DD_FLUSH_EVERY", "5") or "5")
+MSGLIST_FLUSH_SECONDS = float(os.environ.get("DD_FLUSH_SECONDS", "30") or "30")
+# "status": read only STATUS (H) from a saved cursor; "full": get_all_values()
+MSGLIST_SCAN_MODE = os.environ.get("DD_SCAN_MODE", "status").strip().lower()
+SCAN_CURSOR_FILE = os.environ.get("DD_SCAN_CURSOR_FILE", "msglist_scan_cursor.json")
+# Append-only, fsync'd Run History journal; unacknowledged rows are replayed next run ("" = memory only)
+RUN_JOURNAL_FILE = os.environ.get("DD_RUN_JOURNAL", "run_history.jsonl").strip()
+# Per-row progress of interrupted runs (profile, post, sending, sent, done); "" disables resume
+CHECKPOINT_FILE = os.environ.get("DD_CHECKPOINT", "run_checkpoint.json").strip()
+# Local scrape_profile cache ("" or "0" disables); TTLs accept s/m/h/d suffixes
+PROFILE_CACHE_FILE = os.environ.get("DD_PROFILE_CACHE", "profile_cache.sqlite3").strip()
+PROFILE_CACHE_TTL = os.environ.get(
+    "DD_PROFILE_TTL",
+    "POSTS=6h,FOLLOWERS=6h,STATUS=6h,FRIEND=6h,LAST POST=6h,LAST POST TIME=6h,"
+    "IMAGE=7d,INTRO=7d,CITY=30d,GENDER=30d,MARRIED=30d,AGE=30d,JOINED=30d",
+)
+PROFILE_CACHE_TTL_DEFAULT = os.environ.get("DD_PROFILE_TTL_DEFAULT", "6h")
+# Fields that must be fresh for a cached profile to replace a page load
+PROFILE_CACHE_REQUIRED = os.environ.get("DD_PROFILE_CACHE_FIELDS", "STATUS,POSTS,FOLLOWERS,CITY")
+# The send path branches on these, so a cached profile is only used when they are fresh
+PROFILE_CACHE_ALWAYS_REQUIRED = ("STATUS", "POSTS")
 
 # Thread safety lock
 sheet_lock = threading.Lock()
 
 LOGIN_EMAIL = os.environ.get("DD_LOGIN_EMAIL", "0utLawZ")
 LOGIN_PASS = os.environ.get("DD_LOGIN_PASS", "asdasd")
-LOGIN_URL = "https://damadam.pk/login/"
-HOME_URL = "https://damadam.pk/"
-BASE_URL = "https://damadam.pk"
+BASE_URL = os.environ.get("DD_BASE_URL", "https://damadam.pk").strip().rstrip("/")
+LOGIN_URL = f"{BASE_URL}/login/"
+HOME_URL = f"{BASE_URL}/"
+SITE_HOST = urlparse(BASE_URL).netloc.lower()
 COOKIE_FILE = os.environ.get("COOKIE_FILE", "damadam_cookies.pkl")
 SHEET_ID = os.environ.get("DD_SHEET_ID", "1xph0dra5-wPcgMXKubQD7A2CokObpst7o2rWbDA10t8")
 CREDENTIALS_FILE = os.environ.get("CREDENTIALS_FILE", "credentials.json")
+# In-memory Sheets with quotas instead of Google (FakeSheets.py): "1" or "read=60,write=60,latency=0.1,msglist=500,pending=20"
+FAKE_SHEETS = os.environ.get("DD_FAKE_SHEETS", "").strip()
+if FAKE_SHEETS == "0":
+    FAKE_SHEETS = ""
 CHROMEDRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH", "chromedriver.exe")
+# Read-only page backend per stage (profile, recent_post, open_post, verify):
+# "http" for all, "selenium" for all, or e.g. "profile=http,open_post=selenium"
+FETCH_BACKEND = os.environ.get("DD_FETCH_BACKEND", "http").strip().lower()
+HTTP_TIMEOUT = float(os.environ.get("DD_HTTP_TIMEOUT", "20") or "20")
+# Browser profile extraction: "script" (one execute_script) or "webdriver" (per-field lookups)
+PROFILE_EXTRACT_MODE = os.environ.get("DD_PROFILE_EXTRACT", "script").strip().lower()
+# Persistent Chrome profile so the logged-in session survives across runs ("" disables)
+CHROME_PROFILE_DIR = os.environ.get("DD_CHROME_PROFILE_DIR", "").strip()
+# Network blocklist applied via CDP: resource types (image, font, media, stylesheet)
+# plus extra URL wildcard patterns. Stylesheets stay allowed by default because
+# form visibility checks rely on them.
+BLOCK_RESOURCES = os.environ.get("DD_BLOCK_RESOURCES", "image,font,media").strip().lower()
+BLOCK_URLS = os.environ.get("DD_BLOCK_URLS", "").strip()
+PAGE_WEIGHT_LOG = os.environ.get("DD_PAGE_WEIGHT", "0").strip() == "1"
+# Fetch the next nick target's profile/open post over HTTP while the current one posts
+PREFETCH = os.environ.get("DD_PREFETCH", "1").strip() == "1"
+# Longest the browser thread waits for an in-flight prefetch before fetching inline (seconds)
+PREFETCH_WAIT = float(os.environ.get("DD_PREFETCH_WAIT", "2") or "0")
+# Post-send verification deadline (seconds)
+VERIFY_TIMEOUT = float(os.environ.get("DD_VERIFY_TIMEOUT", "15") or "15")
+# Optional pause between targets (seconds); waits are otherwise condition-based
+TARGET_DELAY = float(os.environ.get("DD_TARGET_DELAY", "0") or "0")
+# Machine-readable per-stage timings (p50/p95/max) written at the end of a run ("" disables)
+RUN_PROFILE_FILE = os.environ.get("DD_RUN_PROFILE", "run_profile.json").strip()
+# Optional Prometheus text-format copy of the same numbers (e.g. for node_exporter's textfile collector)
+RUN_PROFILE_PROM = os.environ.get("DD_RUN_PROFILE_PROM", "").strip()
+# Run mode: "profiles" (bulk ProfilesData refresh); anything else (Msg, ...) is the MsgList sender
+RUN_MODE = "profiles" if os.environ.get("DD_MODE", "").strip().lower() in {"profile", "profiles"} else "messages"
+# Profiles refresh: read-only HTTP workers sharing one global request rate (req/s, 0 = unlimited)
+PROFILE_WORKERS = int(os.environ.get("DD_PROFILE_WORKERS", "4") or "4")
+PROFILE_RATE = float(os.environ.get("DD_PROFILE_RATE", "2") or "0")
+PROFILES_DATA_TAB = os.environ.get("DD_PROFILES_DATA_TAB", "ProfilesData").strip()
+# ProfilesData rows buffered per upsert (one batch_update + one append_rows per flush)
+PROFILES_BATCH_SIZE = int(os.environ.get("DD_PROFILES_BATCH", "200") or "200")
 
 # ============================================================================
 # HELPERS
@@ -69,65 +164,39 @@ CHROMEDRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH", "chromedriver.exe")
 
 def get_pkt_time():
     """Get current time in Pakistan timezone"""
-    return datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=5)
+    return Normalize.pkt_now()
 
 def log_msg(m):
     """Print timestamped message"""
     console.print(f"[{get_pkt_time().strftime('%H:%M:%S')}] {m}")
 
+def set_base_url(base_url: str):
+    """Point the bot at another site root (e.g. the local stand-in server)"""
+    global BASE_URL, LOGIN_URL, HOME_URL, SITE_HOST
+    BASE_URL = base_url.strip().rstrip("/")
+    LOGIN_URL = f"{BASE_URL}/login/"
+    HOME_URL = f"{BASE_URL}/"
+    SITE_HOST = urlparse(BASE_URL).netloc.lower()
+
 def clean_url(url: str) -> str:
     """Clean URL by removing reply fragments and trailing slashes"""
     if not url:
         return url
-
-    url = str(url).strip()
-
-    text_match = re.search(r"/comments/text/(\d+)/", url)
-    if text_match:
-        return f"{BASE_URL}/comments/text/{text_match.group(1)}"
-
-    image_match = re.search(r"/comments/image/(\d+)/", url)
-    if image_match:
-        return f"{BASE_URL}/comments/image/{image_match.group(1)}"
-     
-    # Remove /#/reply patterns (keep the post ID)
-    url = re.sub(r'/\d+/#reply$', '', url)
-    url = re.sub(r'/#reply$', '', url)
-    
-    # Remove trailing slash
-    url = url.rstrip('/')
-    
-    return url
+    return Normalize.clean_url(str(url), BASE_URL)
 
 def process_template_message(message: str, profile_data: dict) -> str:
     """Process template message with profile data placeholders"""
     if not message:
         return ""
-    
-    # Extract profile data
-    name = profile_data.get('NICK NAME', profile_data.get('NAME', 'Unknown'))
-    city = clean_text(profile_data.get('CITY', 'Unknown'))
-    posts = profile_data.get('POSTS', '0')
-    followers = profile_data.get('FOLLOWERS', '0')
-    
-    # Replace placeholders
-    processed = message.replace('{{name}}', name)
-    processed = processed.replace('{{city}}', city)
-    processed = processed.replace('{{posts}}', posts)
-    processed = processed.replace('{{followers}}', followers)
-    
-    return processed
+    return compile_template(message).render(profile_data)
 
 def _bool_icon(value: bool) -> str:
     return "✅" if value else "❎"
 
 def _looks_like_url(value: str) -> bool:
-    v = (value or "").strip().lower()
-    return v.startswith("http") or "damadam.pk" in v
+    return Normalize.looks_like_url(value or "", SITE_HOST)
 
-def _normalize_profile_key(value: str) -> str:
-    v = (value or "").strip().lower()
-    return re.sub(r"[^a-z0-9]+", "", v)
+_normalize_profile_key = Normalize.normalize_profile_key
 
 def _pick_target_and_name(mode: str, row: list[str]) -> tuple[str, str]:
     b = (row[1].strip() if len(row) > 1 and row[1] else "")
@@ -151,31 +220,344 @@ def _pick_target_and_name(mode: str, row: list[str]) -> tuple[str, str]:
         return b, c
     return c, b
 
+# ============================================================================
+# TIMING SPANS
+# ============================================================================
+
+# Durations per stage for the whole run; summarized into RUN_PROFILE_FILE
+SPANS: dict[str, list[float]] = {}
+_spans_lock = threading.Lock()
+RUN_STARTED = time.time()
+
+def record_span(name: str, secs: float):
+    with _spans_lock:
+        SPANS.setdefault(name, []).append(secs)
+
+@contextmanager
+def span(name: str):
+    """Time the block under ``name``; yields a dict whose "secs" is set on exit"""
+    result = {"secs": 0.0}
+    started = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["secs"] = time.perf_counter() - started
+        record_span(name, result["secs"])
+
+def _percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (0.0 when empty)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+def span_summary() -> dict:
+    with _spans_lock:
+        spans = {name: list(values) for name, values in SPANS.items()}
+    return {
+        name: {
+            "count": len(values),
+            "total": round(sum(values), 4),
+            "p50": round(_percentile(values, 50), 4),
+            "p95": round(_percentile(values, 95), 4),
+            "max": round(max(values), 4),
+        }
+        for name, values in sorted(spans.items())
+    }
+
+def prometheus_text(summary: dict, extra: dict) -> str:
+    lines = [
+        "# HELP damadam_stage_seconds Per-stage durations of the last bot run",
+        "# TYPE damadam_stage_seconds summary",
+    ]
+    for name, stats in summary.items():
+        for quantile, key in (("0.5", "p50"), ("0.95", "p95"), ("1", "max")):
+            lines.append(f'damadam_stage_seconds{{stage="{name}",quantile="{quantile}"}} {stats[key]}')
+        lines.append(f'damadam_stage_seconds_sum{{stage="{name}"}} {stats["total"]}')
+        lines.append(f'damadam_stage_seconds_count{{stage="{name}"}} {stats["count"]}')
+    for key, value in extra.items():
+        if isinstance(value, (int, float)):
+            lines.append(f"# TYPE damadam_run_{key} gauge")
+            lines.append(f"damadam_run_{key} {float(value):g}")
+    return "\n".join(lines) + "\n"
+
+def write_run_profile(extra: dict, path: str = RUN_PROFILE_FILE, prom_path: str = RUN_PROFILE_PROM) -> dict:
+    """Write the span summary (plus run counters in ``extra``) as JSON and optionally Prometheus text"""
+    summary = span_summary()
+    profile = {
+        "version": VERSION,
+        "started": datetime.fromtimestamp(RUN_STARTED, timezone.utc).isoformat(),
+        "wall_secs": round(time.time() - RUN_STARTED, 3),
+        **extra,
+        "stages": summary,
+    }
+    try:
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(profile, f, indent=2)
+        if prom_path:
+            with open(prom_path, "w", encoding="utf-8") as f:
+                f.write(prometheus_text(summary, {"wall_secs": profile["wall_secs"], **extra}))
+    except Exception as exc:
+        log_msg(f"⚠️ Run profile write failed: {str(exc)[:60]}")
+    return profile
+
+def log_span_summary():
+    summary = span_summary()
+    if not summary:
+        return
+    log_msg("   ⏱️ Stages (p50 / p95 / max, n):")
+    for name, stats in summary.items():
+        log_msg(f"      {name}: {stats['p50']:.2f}s / {stats['p95']:.2f}s / {stats['max']:.2f}s, {stats['count']}")
+
+# ============================================================================
+# SHEETS API SCHEDULER
+# ============================================================================
+
+# gspread calls that count against the read quota; everything else is a write
+SHEETS_READ_METHODS = frozenset({
+    "get", "get_all_values", "get_values", "batch_get", "row_values", "col_values",
+    "acell", "cell", "worksheets", "worksheet", "open_by_key", "fetch_sheet_metadata",
+})
+SHEETS_TRANSIENT_STATUSES = frozenset({500, 502, 503, 504})
+SHEETS_MAX_BACKOFF = 64.0
+
+class QuotaBucket:
+    """One per-minute quota: ``capacity`` tokens, each refilled ``window`` seconds after it was spent.
+
+    Sheets counts requests over a rolling minute, so refilling tokens one by
+    one (instead of at a steady drip) lets callers run at the quota ceiling
+    without tripping 429s. ``take()`` only blocks when the bucket is empty.
+    """
+
+    # Slack for clock skew and request latency between us and Google
+    SLACK = 1.02
+
+    def __init__(self, capacity: int, window: float = 60.0):
+        self.capacity = capacity
+        self.window = window * self.SLACK
+        self._spent: deque = deque()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def take(self) -> float:
+        """Spend one token, sleeping until one is free; returns the seconds waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._spent and now - self._spent[0] >= self.window:
+                    self._spent.popleft()
+                ready = self._paused_until
+                if self.capacity > 0 and len(self._spent) >= self.capacity:
+                    ready = max(ready, self._spent[0] + self.window)
+                if ready <= now:
+                    if self.capacity > 0:
+                        self._spent.append(now)
+                    return waited
+            time.sleep(ready - now)
+            waited += ready - now
+
+    def pause(self, secs: float):
+        """Google said 429: hold every caller of this bucket for ``secs``"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + secs)
+
+def _api_status(exc) -> int:
+    """HTTP status of a gspread APIError (0 for anything else)"""
+    response = getattr(exc, "response", None)
+    return int(getattr(response, "status_code", 0) or getattr(exc, "code", 0) or 0)
+
+def _retry_after(exc) -> float | None:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("Retry-After")))
+    except (TypeError, ValueError):
+        return None
+
+def classify_sheets_error(exc) -> str:
+    """"throttled" (429), "transient" (5xx / network) or "permanent" (bad range, no access, ...)"""
+    status = _api_status(exc)
+    if status == 429:
+        return "throttled"
+    if status in SHEETS_TRANSIENT_STATUSES:
+        return "transient"
+    if status:
+        return "permanent"
+    if isinstance(exc, (ConnectionError, TimeoutError, TransportError)):
+        return "transient"
+    if requests is not None and isinstance(exc, requests.exceptions.RequestException):
+        return "transient"
+    return "permanent"
+
+class SheetsScheduler:
+    """Every Sheets API call goes through here.
+
+    Separate read and write QuotaBuckets pace calls to the per-minute quotas;
+    429s pause the bucket for Retry-After (or a capped exponential backoff),
+    5xx/network errors are retried with backoff, and permanent errors are
+    raised straight away. The ledger counts calls by kind and method.
+    """
+
+    def __init__(self, read_quota: int = SHEETS_READ_QUOTA, write_quota: int = SHEETS_WRITE_QUOTA,
+                 window: float = 60.0):
+        self.buckets = {"read": QuotaBucket(read_quota, window), "write": QuotaBucket(write_quota, window)}
+        self._lock = threading.Lock()
+        self.counts = {"read": 0, "write": 0, "throttled": 0, "transient": 0, "permanent": 0}
+        self.by_method: dict[str, int] = {}
+        self.wait_secs = 0.0
+        self.backoff_secs = 0.0
+
+    def _count(self, key: str, method: str = ""):
+        with self._lock:
+            self.counts[key] += 1
+            if method:
+                self.by_method[method] = self.by_method.get(method, 0) + 1
+
+    def total(self) -> int:
+        with self._lock:
+            return self.counts["read"] + self.counts["write"]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self.counts,
+                "wait_secs": round(self.wait_secs, 3),
+                "backoff_secs": round(self.backoff_secs, 3),
+                "by_method": dict(self.by_method),
+            }
+
+    def summary(self) -> str:
+        s = self.stats()
+        return (
+            f"{s['read']} reads, {s['write']} writes, {s['throttled']} throttled, {s['transient']} retried,"
+            f" {s['wait_secs']:.1f}s paced, {s['backoff_secs']:.1f}s backing off"
+        )
+
+    def call(self, action, *args, kind: str = "", retries: int = 5, delay: float = 1.0, **kwargs):
+        method = getattr(action, "__name__", "call")
+        kind = kind or ("read" if method in SHEETS_READ_METHODS else "write")
+        bucket = self.buckets[kind]
+        throttled = False
+        for attempt in range(1, retries + 1):
+            # Time spent in a 429 pause is backoff, anything else is normal pacing
+            waited = bucket.take()
+            if waited:
+                with self._lock:
+                    if throttled:
+                        self.backoff_secs += waited
+                    else:
+                        self.wait_secs += waited
+                record_span("sheet_throttle" if throttled else "sheet_wait", waited)
+            self._count(kind, method)
+            try:
+                return action(*args, **kwargs)
+            except Exception as exc:
+                category = classify_sheets_error(exc)
+                self._count(category)
+                if category == "permanent" or attempt == retries:
+                    raise
+                backoff = min(SHEETS_MAX_BACKOFF, delay * 2 ** (attempt - 1)) + random.uniform(0, 1)
+                throttled = category == "throttled"
+                if throttled:
+                    # Every caller of this bucket waits it out in take(), not just this thread
+                    backoff = _retry_after(exc) or backoff
+                    bucket.pause(backoff)
+                    log_msg(f"⏳ Sheets {kind} quota hit on {method}, waiting {backoff:.0f}s")
+                    continue
+                if DEBUG:
+                    log_msg(f"⚠️ GSheets {method} failed (attempt {attempt}/{retries}): {str(exc)[:60]}")
+                with self._lock:
+                    self.backoff_secs += backoff
+                record_span("sheet_retry", backoff)
+                time.sleep(backoff)
+
+SHEETS = SheetsScheduler()
+
+def sheets_run_stats() -> dict:
+    """Ledger counters for the run profile"""
+    stats = SHEETS.stats()
+    return {
+        "gsheet_api_calls": stats["read"] + stats["write"],
+        **{f"gsheet_{key}": stats[key] for key in ("read", "write", "throttled", "transient", "wait_secs", "backoff_secs")},
+    }
+
+# One authorized client (and HTTP session) per process, plus workbook and
+# worksheet handles keyed by sheet ID / title so each spreadsheet is opened once
+_gspread_client = None
+_workbook_cache: dict = {}
+_worksheet_cache: dict = {}
+_gspread_cache_lock = threading.RLock()
+
 def _get_gspread_client():
-    if not os.path.exists(CREDENTIALS_FILE):
-        log_msg(f"❌ {CREDENTIALS_FILE} not found!")
-        sys.exit(1)
-    scope = ["https://www.googleapis.com/auth/spreadsheets"]
-    creds = Credentials.from_service_account_file(CREDENTIALS_FILE, scopes=scope)
-    return gspread.authorize(creds)
+    global _gspread_client
+    with _gspread_cache_lock:
+        if _gspread_client is not None:
+            return _gspread_client
+        if FAKE_SHEETS:
+            from FakeSheets import FakeSheetsClient, seed_msglist
+            _gspread_client = FakeSheetsClient.from_spec(FAKE_SHEETS)
+            if _gspread_client.seed_rows:
+                seed_msglist(_gspread_client, SHEET_ID, _gspread_client.seed_rows, _gspread_client.seed_pending)
+            log_msg(f"🧪 Using in-memory Sheets ({FAKE_SHEETS}); nothing is written to Google")
+            return _gspread_client
+        if not os.path.exists(CREDENTIALS_FILE):
+            log_msg(f"❌ {CREDENTIALS_FILE} not found!")
+            sys.exit(1)
+        scope = ["https://www.googleapis.com/auth/spreadsheets"]
+        creds = Credentials.from_service_account_file(CREDENTIALS_FILE, scopes=scope)
+        _gspread_client = gspread.authorize(creds)
+        return _gspread_client
+
+def use_gspread_client(client):
+    """Swap in another client (e.g. a FakeSheetsClient) and drop cached sheet handles"""
+    global _gspread_client, _run_history_sheet
+    with _gspread_cache_lock:
+        _gspread_client = client
+        _workbook_cache.clear()
+        _worksheet_cache.clear()
+        _run_history_sheet = None
+
+def _open_workbook(sheet_id: str):
+    """Open a spreadsheet once and cache its worksheet handles by title"""
+    with _gspread_cache_lock:
+        workbook = _workbook_cache.get(sheet_id)
+        if workbook is None:
+            workbook = retry_gspread_call(_get_gspread_client().open_by_key, sheet_id)
+            worksheets = retry_gspread_call(workbook.worksheets)
+            _workbook_cache[sheet_id] = workbook
+            _worksheet_cache[sheet_id] = {ws.title: ws for ws in worksheets}
+        return workbook
+
+def _get_worksheet(sheet_id: str, title: str):
+    with _gspread_cache_lock:
+        _open_workbook(sheet_id)
+        ws = _worksheet_cache[sheet_id].get(title)
+        if ws is None:
+            raise WorksheetNotFound(title)
+        return ws
+
+def _add_worksheet(sheet_id: str, title: str, rows: int, cols: int):
+    with _gspread_cache_lock:
+        workbook = _open_workbook(sheet_id)
+        ws = retry_gspread_call(workbook.add_worksheet, title=title, rows=rows, cols=cols)
+        _worksheet_cache[sheet_id][title] = ws
+        return ws
+
+def _get_profiles_worksheet():
+    for title in ("Profiles", "PROFILES", "PROFILE"):
+        try:
+            return _get_worksheet(PROFILES_SHEET_ID, title)
+        except WorksheetNotFound:
+            continue
+    raise WorksheetNotFound("Profiles")
 
 def load_profiles_lookup() -> dict:
     lookup: dict = {}
     if not PROFILES_SHEET_ID:
         return lookup
     try:
-        client = _get_gspread_client()
-        wb = client.open_by_key(PROFILES_SHEET_ID)
-        ws = None
-        for title in ("Profiles", "PROFILES", "PROFILE"):
-            try:
-                ws = wb.worksheet(title)
-                break
-            except Exception:
-                continue
-        if ws is None:
-            raise WorksheetNotFound("Profiles")
-        rows = ws.get("B2:K")
+        rows = retry_gspread_call(_get_profiles_worksheet().get, "B2:K")
     except Exception as exc:
         msg = f"⚠️ Profiles lookup unavailable: {str(exc)[:80]}"
         if DEBUG:
@@ -195,102 +577,375 @@ def load_profiles_lookup() -> dict:
                 log_msg(f"⚠️ Profiles lookup unavailable{hint}")
         return lookup
 
+    refreshed = _load_profiles_data_rows()
+    lookup = build_profiles_lookup(rows, refreshed)
+    if refreshed and DEBUG:
+        log_msg(f"📋 {len({nick.lower() for nick, _ in refreshed})} profiles refreshed from {PROFILES_DATA_TAB}")
+
+    if DEBUG:
+        log_msg(f"📋 Loaded {len(lookup)} profiles from Profiles sheet")
+    elif lookup:
+        log_msg(f"📋 Profiles lookup loaded: {len(lookup)}")
+    return lookup
+
+def build_profiles_lookup(rows: list[list[str]], refreshed: list[tuple[str, dict]] = ()) -> dict:
+    """{nick and normalized nick: {CITY, FOLLOWERS, POSTS}} from Profiles B:K rows plus ProfilesData overrides"""
+    lookup: dict = {}
     for r in rows:
         nick = (r[0] if len(r) > 0 else "").strip()
         if not nick:
             continue
-        city = (r[2] if len(r) > 2 else "").strip()
-        followers = (r[7] if len(r) > 7 else "").strip()
-        posts = (r[9] if len(r) > 9 else "").strip()
-        lookup[nick.lower()] = {"CITY": city, "FOLLOWERS": followers, "POSTS": posts}
-
+        values = {
+            "CITY": (r[2] if len(r) > 2 else "").strip(),
+            "FOLLOWERS": (r[7] if len(r) > 7 else "").strip(),
+            "POSTS": (r[9] if len(r) > 9 else "").strip(),
+        }
+        lookup[nick.lower()] = values
         nick_norm = _normalize_profile_key(nick)
         if nick_norm and nick_norm not in lookup:
-            lookup[nick_norm] = {"CITY": city, "FOLLOWERS": followers, "POSTS": posts}
+            lookup[nick_norm] = dict(values)
 
-    if DEBUG:
-        log_msg(f"📋 Loaded {len(lookup)} profiles from Profiles sheet")
-    elif lookup:
-        log_msg(f"📋 Profiles lookup loaded: {len(lookup)}")
+    # Rows written by the profiles refresh mode are fresher (legacy duplicates: topmost wins)
+    seen: set = set()
+    for nick, values in refreshed:
+        key = nick.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        for lookup_key in {key, _normalize_profile_key(nick)} - {""}:
+            merged = dict(lookup.get(lookup_key) or {"CITY": "", "FOLLOWERS": "", "POSTS": ""})
+            merged.update({k: v for k, v in values.items() if v})
+            lookup[lookup_key] = merged
     return lookup
 
+def _load_profiles_data_rows() -> list[tuple[str, dict]]:
+    """(nick, {CITY, FOLLOWERS, POSTS}) from the ProfilesData tab, top row first"""
+    if not PROFILES_SHEET_ID or not PROFILES_DATA_TAB:
+        return []
+    try:
+        ws = _get_worksheet(PROFILES_SHEET_ID, PROFILES_DATA_TAB)
+        rows = retry_gspread_call(ws.get, "B2:N")
+    except Exception as exc:
+        if DEBUG and not isinstance(exc, WorksheetNotFound):
+            log_msg(f"⚠️ {PROFILES_DATA_TAB} unavailable: {str(exc)[:60]}")
+        return []
+    out = []
+    for r in rows:
+        r = _pad_row(r, 13)
+        nick = (r[0] or "").strip()
+        if nick:
+            out.append((nick, {"CITY": r[5].strip(), "FOLLOWERS": r[10].strip(), "POSTS": r[12].strip()}))
+    return out
+
 # DO NOT MODIFY - Sheet structure and column mapping
 # Changing this will break data mapping and cause sheet update failures
 def get_or_create_msglist_sheet():
     """Get or create MsgList sheet with proper structure"""
-    client = _get_gspread_client()
-    workbook = client.open_by_key(SHEET_ID)
-    
     try:
-        sheet = workbook.worksheet("MsgList")
+        sheet = _get_worksheet(SHEET_ID, "MsgList")
         # Check if headers exist and are correct
-        existing_headers = sheet.row_values(1)
+        existing_headers = retry_gspread_call(sheet.row_values, 1)
         expected_headers = ["MODE", "NAME", "NICK/URL", "CITY", "POSTS", "FOLLOWERS", "MESSAGE", "STATUS", "NOTES", "RESULT URL"]
         
         if existing_headers != expected_headers:
             log_msg("📄 Updating MsgList headers...")
-            sheet.clear()
-            sheet.insert_row(expected_headers, 1)
+            retry_gspread_call(sheet.clear)
+            insert_row_with_retry(sheet, expected_headers, 1)
             log_msg("✅ MsgList headers updated")
         return sheet
     except WorksheetNotFound:
         log_msg("📄 Creating new MsgList sheet...")
-        sheet = workbook.add_worksheet(title="MsgList", rows=1000, cols=10)
+        sheet = _add_worksheet(SHEET_ID, "MsgList", rows=1000, cols=10)
         headers = ["MODE", "NAME", "NICK/URL", "CITY", "POSTS", "FOLLOWERS", "MESSAGE", "STATUS", "NOTES", "RESULT URL"]
-        sheet.insert_row(headers, 1)
+        insert_row_with_retry(sheet, headers, 1)
         log_msg("✅ MsgList sheet created")
         return sheet
 
-def get_or_create_run_history_sheet():
-    client = _get_gspread_client()
-    workbook = client.open_by_key(SHEET_ID)
+RUN_HISTORY_HEADERS = [
+    "RUN ID",
+    "RUN TS",
+    "MODE",
+    "TARGET",
+    "NAME",
+    "STATUS",
+    "RESULT URL",
+    "MESSAGE",
+    "PROCESSED",
+    "SUCCESS",
+    "FAILED",
+    "GSHEET API CALLS",
+    "TARGET SECS",
+    "SEND SECS",
+    "TARGET P50 SECS",
+    "TARGET P95 SECS",
+]
+
+_run_history_sheet = None
 
+def get_or_create_run_history_sheet():
+    global _run_history_sheet
+    if _run_history_sheet is not None:
+        return _run_history_sheet
     try:
-        sheet = workbook.worksheet("Run History")
+        sheet = _get_worksheet(SHEET_ID, "Run History")
     except WorksheetNotFound:
-        sheet = workbook.add_worksheet(title="Run History", rows=2000, cols=12)
+        sheet = _add_worksheet(SHEET_ID, "Run History", rows=2000, cols=len(RUN_HISTORY_HEADERS))
 
     try:
-        existing_headers = sheet.row_values(1)
+        existing_headers = retry_gspread_call(sheet.row_values, 1)
     except Exception:
         existing_headers = []
 
-    if not existing_headers:
-        headers = [
-            "RUN ID",
-            "RUN TS",
-            "MODE",
-            "TARGET",
-            "NAME",
-            "STATUS",
-            "RESULT URL",
-            "MESSAGE",
-            "PROCESSED",
-            "SUCCESS",
-            "FAILED",
-            "GSHEET API CALLS",
-        ]
-        retry_gspread_call(sheet.insert_row, headers, 1)
+    if existing_headers != RUN_HISTORY_HEADERS and RUN_HISTORY_HEADERS[:len(existing_headers)] == existing_headers:
+        # New sheet, or one created before the timing columns existed: (re)write the header row
+        if sheet.col_count < len(RUN_HISTORY_HEADERS):
+            retry_gspread_call(sheet.add_cols, len(RUN_HISTORY_HEADERS) - sheet.col_count)
+        retry_gspread_call(sheet.update, range_name="A1", values=[RUN_HISTORY_HEADERS])
 
+    _run_history_sheet = sheet
     return sheet
 
-def retry_gspread_call(action, *args, retries=4, delay=1, **kwargs):
-    last_exc = None
-    for attempt in range(1, retries + 1):
+PROFILES_DATA_COLUMNS = [
+    "IMAGE", "NICK NAME", "TAGS", "LAST POST", "LAST POST TIME", "FRIEND", "CITY",
+    "GENDER", "MARRIED", "AGE", "JOINED", "FOLLOWERS", "STATUS", "POSTS",
+    "PROFILE LINK", "INTRO", "SOURCE", "DATETIME SCRAP", "POST MSG", "POST LINK"
+]
+
+def get_or_create_profiles_data_sheet():
+    """ProfilesData tab in the Profiles workbook (created with the 20-column header)"""
+    try:
+        sheet = _get_worksheet(PROFILES_SHEET_ID, PROFILES_DATA_TAB)
+    except WorksheetNotFound:
+        log_msg(f"📄 Creating {PROFILES_DATA_TAB} sheet...")
+        sheet = _add_worksheet(PROFILES_SHEET_ID, PROFILES_DATA_TAB, rows=1000, cols=len(PROFILES_DATA_COLUMNS))
+
+    try:
+        existing_headers = retry_gspread_call(sheet.row_values, 1)
+    except Exception:
+        existing_headers = []
+    if not existing_headers:
+        retry_gspread_call(sheet.insert_row, PROFILES_DATA_COLUMNS, 1)
+    return sheet
+
+# ============================================================================
+# MESSAGE TEMPLATES
+# ============================================================================
+
+# damadam's reply box limit; rendered messages are cut to this
+MESSAGE_LIMIT = 350
+_TEMPLATE_FIELD_RE = re.compile(r"\{\{\s*([^{}|]*?)\s*(?:\|([^{}]*))?\}\}")
+
+# {{field}}: profile keys tried in order, and the value used when all are empty
+TEMPLATE_FIELDS = {
+    "NAME": (("NICK NAME", "NAME"), "Unknown"),
+    "NICK": (("NICK NAME", "NAME"), "Unknown"),
+    "NICK NAME": (("NICK NAME", "NAME"), "Unknown"),
+    "POSTS": (("POSTS",), "0"),
+    "FOLLOWERS": (("FOLLOWERS",), "0"),
+}
+for _field in ("CITY", "GENDER", "MARRIED", "AGE", "JOINED", "INTRO", "STATUS", "FRIEND",
+               "LAST POST", "LAST POST TIME", "PROFILE LINK", "IMAGE", "TAGS"):
+    TEMPLATE_FIELDS[_field] = ((_field,), "")
+
+class TemplateError(ValueError):
+    """MESSAGE that cannot be rendered (empty, unbalanced braces or unknown field)"""
+
+class MessageTemplate:
+    """A MESSAGE parsed once into literal text and field slots.
+
+    ``{{city}}``, ``{{last_post_time}}`` or ``{{LAST POST TIME}}`` name a
+    profile field (see TEMPLATE_FIELDS); ``{{city|your city}}`` overrides the
+    value used when the field is empty.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.parts: list = []  # literal strings and (profile keys, default) slots
+        pos = 0
+        for match in _TEMPLATE_FIELD_RE.finditer(text):
+            self._literal(text[pos:match.start()])
+            field = " ".join(match.group(1).upper().replace("_", " ").split())
+            if field not in TEMPLATE_FIELDS:
+                raise TemplateError(f"unknown field {match.group(0)}")
+            keys, default = TEMPLATE_FIELDS[field]
+            if match.group(2) is not None:
+                default = match.group(2).strip()
+            self.parts.append((keys, default))
+            pos = match.end()
+        self._literal(text[pos:])
+
+    def _literal(self, chunk: str):
+        if "{{" in chunk or "}}" in chunk:
+            at = chunk.find("{{") if "{{" in chunk else chunk.find("}}")
+            raise TemplateError(f"unbalanced braces near '{chunk[at:at + 20]}'")
+        if chunk:
+            self.parts.append(chunk)
+
+    def render(self, profile_data: dict, limit: int = MESSAGE_LIMIT) -> str:
+        out = []
+        for part in self.parts:
+            if isinstance(part, str):
+                out.append(part)
+                continue
+            keys, default = part
+            value = ""
+            for key in keys:
+                value = clean_text(profile_data.get(key, ""))
+                if value:
+                    break
+            out.append(value or default)
+        message = "".join(out)
+        return message[:limit] if limit else message
+
+@lru_cache(maxsize=256)
+def compile_template(text: str) -> MessageTemplate:
+    """Parse a MESSAGE once (cached by text); raises TemplateError for templates that cannot render"""
+    if not (text or "").strip():
+        raise TemplateError("MESSAGE is empty")
+    return MessageTemplate(text)
+
+# ============================================================================
+# PENDING TARGET SCAN
+# ============================================================================
+
+# Statuses the bot writes back; rows carrying one of these never need re-reading
+FINAL_STATUSES = {"done", "failed", "skipped"}
+
+def extract_pending_targets(rows: list[list[str]], first_row: int = 2) -> list[dict]:
+    """Build pending target dicts from MsgList rows; rows[0] is sheet row ``first_row``"""
+    pending_targets = []
+    for offset, row in enumerate(rows):
+        if len(row) > 7:  # Ensure we have enough columns
+            mode = row[0].strip().lower() if len(row) > 0 else ""
+            nick_or_url, name = _pick_target_and_name(mode, row)
+            city = row[3].strip() if len(row) > 3 else ""
+            posts = row[4].strip() if len(row) > 4 else ""
+            followers = row[5].strip() if len(row) > 5 else ""
+            message = row[6].strip() if len(row) > 6 else ""
+            status = row[7].strip().lower() if len(row) > 7 else ""
+
+            if nick_or_url and status == "pending":
+                pending_targets.append({
+                    'row': first_row + offset,
+                    'mode': mode,
+                    'name': name,
+                    'nick_or_url': nick_or_url,
+                    'city': city,
+                    'posts': posts,
+                    'followers': followers,
+                    'message': message
+                })
+    return pending_targets
+
+def pending_row_ranges(statuses: list[list[str]], first_row: int) -> tuple[list[tuple[int, int]], int]:
+    """Find contiguous runs of ``pending`` rows in a STATUS column slice.
+
+    ``statuses`` is the column as returned by ``worksheet.get("H{n}:H")``
+    (one list per row, empty list for a blank cell). Returns the
+    ``(start, end)`` sheet-row ranges plus the new cursor: the first row
+    that does not already carry a final status.
+    """
+    ranges: list[tuple[int, int]] = []
+    cursor = None
+    start = None
+    row_num = first_row
+    for row_num, cell in enumerate(statuses, first_row):
+        status = (cell[0] if cell else "").strip().lower()
+        if cursor is None and status not in FINAL_STATUSES:
+            cursor = row_num
+        if status == "pending":
+            if start is None:
+                start = row_num
+            continue
+        if start is not None:
+            ranges.append((start, row_num - 1))
+            start = None
+    last_row = first_row + len(statuses) - 1
+    if start is not None:
+        ranges.append((start, last_row))
+    if cursor is None:
+        cursor = last_row + 1
+    return ranges, cursor
+
+def _load_scan_cursor() -> int:
+    try:
+        with open(SCAN_CURSOR_FILE, "r", encoding="utf-8") as f:
+            return max(2, int(json.load(f).get(SHEET_ID, {}).get("cursor", 2)))
+    except Exception:
+        return 2
+
+def _save_scan_cursor(cursor: int):
+    try:
         try:
-            global GSHEET_API_CALLS
-            GSHEET_API_CALLS += 1
-            return action(*args, **kwargs)
-        except Exception as exc:
-            last_exc = exc
-            if attempt == retries:
-                raise
+            with open(SCAN_CURSOR_FILE, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except Exception:
+            state = {}
+        state[SHEET_ID] = {"cursor": cursor, "updated": get_pkt_time().strftime("%Y-%m-%d %H:%M:%S")}
+        with open(SCAN_CURSOR_FILE, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+    except Exception as exc:
+        if DEBUG:
+            log_msg(f"⚠️ Scan cursor save failed: {str(exc)[:80]}")
+
+def _pad_row(row: list, width: int = 10) -> list:
+    return list(row) + [""] * (width - len(row))
+
+def scan_pending_targets(sheet, mode: str = MSGLIST_SCAN_MODE, save_cursor: bool = True) -> list[dict]:
+    """Return pending MsgList targets.
+
+    ``status`` mode reads only column H from the saved cursor, then fetches
+    A:J for the pending row ranges in one ``batch_get``. ``full`` mode
+    downloads the whole sheet.
+    """
+    if mode == "full":
+        rows = retry_gspread_call(sheet.get_all_values)
+        return extract_pending_targets(rows[1:], 2)
+
+    cursor = _load_scan_cursor()
+    row_count = getattr(sheet, "row_count", 0) or 0
+    if row_count and cursor == row_count + 1:
+        # Every row up to the last one in the grid is final; asking for H{cursor}:H
+        # would be rejected as exceeding the grid limits
+        if DEBUG:
+            log_msg(f"🔎 Scan cursor {cursor} is past the last row, nothing pending")
+        return []
+    if row_count and cursor > row_count + 1:
+        if DEBUG:
+            log_msg(f"⚠️ Scan cursor row {cursor} is beyond the sheet ({row_count} rows), rescanning from row 2")
+        cursor = 2
+    if cursor > 2:
+        # The row just above the cursor must still be final, otherwise rows were
+        # inserted/deleted since the last run and the cursor is meaningless
+        anchor, statuses = retry_gspread_call(sheet.batch_get, [f"H{cursor - 1}", f"H{cursor}:H"])
+        anchor_status = (anchor[0][0] if anchor and anchor[0] else "").strip().lower()
+        if anchor_status not in FINAL_STATUSES:
             if DEBUG:
-                log_msg(f"⚠️ GSheets write failed (attempt {attempt}/{retries}): {str(exc)[:60]}")
-            time.sleep(delay)
-            delay *= 2
-    if last_exc:
-        raise last_exc
+                log_msg(f"⚠️ Scan cursor row {cursor} looks stale, rescanning from row 2")
+            cursor = 2
+            statuses = retry_gspread_call(sheet.get, "H2:H")
+    else:
+        statuses = retry_gspread_call(sheet.get, "H2:H")
+
+    ranges, new_cursor = pending_row_ranges(list(statuses), cursor)
+    if DEBUG:
+        log_msg(f"🔎 Scanned {len(statuses)} STATUS cells from row {cursor}: {len(ranges)} pending ranges")
+
+    pending_targets: list[dict] = []
+    if ranges:
+        blocks = retry_gspread_call(sheet.batch_get, [f"A{a}:J{b}" for a, b in ranges])
+        for (start, end), block in zip(ranges, blocks):
+            rows = [_pad_row(r) for r in block]
+            rows += [_pad_row([])] * ((end - start + 1) - len(rows))
+            pending_targets.extend(extract_pending_targets(rows, start))
+
+    if save_cursor:
+        _save_scan_cursor(new_cursor)
+    return pending_targets
+
+def retry_gspread_call(action, *args, retries=5, delay=1, **kwargs):
+    """Run one Sheets API call through the quota scheduler (see SheetsScheduler)"""
+    return SHEETS.call(action, *args, retries=retries, delay=delay, **kwargs)
 
 def update_cell_with_retry(sheet, row, col, value, **kwargs):
     params = {}
@@ -300,10 +955,417 @@ def update_cell_with_retry(sheet, row, col, value, **kwargs):
 def insert_row_with_retry(sheet, row_values, row_num):
     return retry_gspread_call(sheet.insert_row, row_values, row_num)
 
+def _col_letter(col: int) -> str:
+    letters = ""
+    while col > 0:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+def _merge_row_cells(row: int, cells: dict) -> list[dict]:
+    """Group one row's cells into contiguous A1 ranges (e.g. D5:F5, H5:J5)"""
+    ranges: list[dict] = []
+    start = None
+    prev = None
+    values: list = []
+    for col in sorted(cells):
+        if prev is not None and col == prev + 1:
+            values.append(cells[col])
+        else:
+            if values:
+                ranges.append({"range": f"{_col_letter(start)}{row}:{_col_letter(prev)}{row}", "values": [values]})
+            start = col
+            values = [cells[col]]
+        prev = col
+    if values:
+        ranges.append({"range": f"{_col_letter(start)}{row}:{_col_letter(prev)}{row}", "values": [values]})
+    return ranges
+
+class MsgListWriteBuffer:
+    """Collect MsgList cell changes per row and write them with a single batch_update.
+
+    Flushes every ``flush_every`` targets or ``flush_seconds`` seconds, and
+    whenever ``flush()`` is called explicitly (shutdown).
+    """
+
+    def __init__(self, sheet, flush_every: int = MSGLIST_FLUSH_EVERY, flush_seconds: float = MSGLIST_FLUSH_SECONDS,
+                 on_flush=None):
+        self.sheet = sheet
+        self.on_flush = on_flush
+        self.flush_every = max(1, flush_every)
+        self.flush_seconds = flush_seconds
+        self.pending: dict[int, dict[int, object]] = {}
+        self.targets_since_flush = 0
+        self.last_flush = time.monotonic()
+        self.flushes = 0
+        self.cells_written = 0
+
+    def set(self, row: int, col: int, value):
+        with sheet_lock:
+            self.pending.setdefault(row, {})[col] = value
+
+    def target_done(self):
+        self.targets_since_flush += 1
+        self.maybe_flush()
+
+    def maybe_flush(self):
+        due = self.targets_since_flush >= self.flush_every
+        if not due and self.flush_seconds > 0:
+            due = time.monotonic() - self.last_flush >= self.flush_seconds
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write all buffered cells; returns the number of cells written"""
+        with sheet_lock:
+            pending, self.pending = self.pending, {}
+        self.targets_since_flush = 0
+        self.last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        data: list[dict] = []
+        for row in sorted(pending):
+            data.extend(_merge_row_cells(row, pending[row]))
+        try:
+            with span("sheet_write.msglist"):
+                retry_gspread_call(self.sheet.batch_update, data, value_input_option="USER_ENTERED")
+        except Exception:
+            # Put the cells back without clobbering anything set since
+            with sheet_lock:
+                for row, cells in pending.items():
+                    merged = dict(cells)
+                    merged.update(self.pending.get(row, {}))
+                    self.pending[row] = merged
+            raise
+
+        cells = sum(len(c) for c in pending.values())
+        self.flushes += 1
+        self.cells_written += cells
+        if DEBUG:
+            log_msg(f"💾 MsgList flush: {cells} cells in {len(data)} ranges")
+        if self.on_flush:
+            self.on_flush(sorted(pending))
+        return cells
+
+class RunJournal:
+    """Append-only JSON-lines journal in front of the Run History sheet.
+
+    ``record()`` writes and fsyncs a row before returning; ``ack()`` marks rows
+    that reached the sheet. Rows never acked (crash, Sheets outage, cancelled
+    workflow) are loaded again on the next run and sent first.
+    """
+
+    def __init__(self, path: str = RUN_JOURNAL_FILE, flush_every: int = MSGLIST_FLUSH_EVERY,
+                 flush_seconds: float = MSGLIST_FLUSH_SECONDS):
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self.flush_seconds = flush_seconds
+        self.pending: dict[int, list] = {}
+        self.replayed = 0
+        self.last_flush = time.monotonic()
+        self.retry_at = 0.0
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        rows: dict[int, list] = {}
+        acked: set = set()
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line from a crash mid-write
+                    if "ack" in entry:
+                        acked.update(entry["ack"])
+                    elif "seq" in entry:
+                        rows[entry["seq"]] = entry["row"]
+        except OSError as exc:
+            log_msg(f"⚠️ Run journal unreadable: {str(exc)[:60]}")
+            return
+        self._seq = max(rows, default=0)
+        self.pending = {seq: row for seq, row in rows.items() if seq not in acked}
+        self.replayed = len(self.pending)
+        self._compact()
+
+    def _write(self, lines: list[dict], mode: str = "a"):
+        if not self.path:
+            return
+        with open(self.path, mode, encoding="utf-8") as f:
+            for entry in lines:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _compact(self):
+        """Rewrite the file with only unacknowledged rows"""
+        if not self.path:
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for seq, row in sorted(self.pending.items()):
+                f.write(json.dumps({"seq": seq, "row": row}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def record(self, row: list):
+        with self._lock:
+            self._seq += 1
+            self._write([{"seq": self._seq, "row": row}])
+            self.pending[self._seq] = row
+
+    def due(self) -> bool:
+        if not self.pending or time.monotonic() < self.retry_at:
+            return False
+        if self.replayed or len(self.pending) >= self.flush_every:
+            return True
+        return self.flush_seconds > 0 and time.monotonic() - self.last_flush >= self.flush_seconds
+
+    def snapshot(self) -> tuple[list[int], list[list]]:
+        with self._lock:
+            seqs = sorted(self.pending)
+            return seqs, [self.pending[seq] for seq in seqs]
+
+    def defer(self):
+        """Failed append: leave the rows journaled and wait one flush interval"""
+        self.retry_at = time.monotonic() + max(self.flush_seconds, 5.0)
+
+    def ack(self, seqs: list[int]):
+        with self._lock:
+            self._write([{"ack": seqs}])
+            for seq in seqs:
+                self.pending.pop(seq, None)
+            self.replayed = 0
+            self.last_flush = time.monotonic()
+            if not self.pending and self.path:
+                self._write([], mode="w")
+
+class RunCheckpoint:
+    """Local per-row progress so an interrupted run resumes instead of starting over.
+
+    Entries are keyed by MsgList row and carry the target they were made for;
+    a row whose target changed since is treated as new. Stages advance
+    profile -> post -> sending -> sent -> done, and an entry is dropped once
+    its finished row has been flushed to the sheet.
+    """
+
+    MAX_AGE = 7 * 86400
+
+    def __init__(self, path: str = CHECKPOINT_FILE):
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.entries = json.load(f).get(SHEET_ID, {})
+            except Exception as exc:
+                log_msg(f"⚠️ Checkpoint unreadable, starting fresh: {str(exc)[:60]}")
+        cutoff = time.time() - self.MAX_AGE
+        self.entries = {k: v for k, v in self.entries.items() if v.get("ts", 0) >= cutoff}
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            data = {}
+            if os.path.exists(self.path):
+                with open(self.path, encoding="utf-8") as f:
+                    data = json.load(f)
+        except Exception:
+            data = {}
+        data[SHEET_ID] = self.entries
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def get(self, row: int, target: str) -> dict:
+        with self._lock:
+            entry = self.entries.get(str(row))
+        return dict(entry) if entry and entry.get("target") == target else {}
+
+    def mark(self, row: int, target: str, stage: str, **data):
+        with self._lock:
+            entry = self.entries.get(str(row))
+            if not entry or entry.get("target") != target:
+                entry = {"target": target}
+            entry.update(data, stage=stage, ts=time.time())
+            self.entries[str(row)] = entry
+            self._save()
+
+    def rows_flushed(self, rows: list[int]):
+        """MsgList cells for ``rows`` reached the sheet; forget the finished ones"""
+        with self._lock:
+            done = [str(r) for r in rows if self.entries.get(str(r), {}).get("stage") == "done"]
+            if not done:
+                return
+            for key in done:
+                del self.entries[key]
+            self._save()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+class SheetWriter:
+    """Background worker that owns all MsgList and Run History writes.
+
+    The main thread records cells and queues Run History rows, then goes
+    straight back to browser work; the worker flushes on its own schedule.
+    ``close()`` drains the queue and does the final flush.
+    """
+
+    def __init__(self, msglist_buffer: MsgListWriteBuffer, journal: RunJournal | None = None):
+        self.buffer = msglist_buffer
+        self.journal = journal or RunJournal()
+        self.history_rows = 0
+        self.queue: queue.Queue = queue.Queue()
+        self.busy_secs = 0.0
+        self.drain_wait_secs = 0.0
+        self.errors = 0
+        self._closed = False
+        self._exit_flushed = False
+        self._thread = threading.Thread(target=self._run, name="sheet-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def set(self, row: int, col: int, value):
+        self.buffer.set(row, col, value)
+
+    def target_done(self):
+        self.queue.put(("target_done", None))
+
+    def record_run_history(self, row: list[str]):
+        """Journal one Run History row (durable on return); the sheet append is batched"""
+        self.journal.record(row)
+        self.queue.put(("run_history", None))
+
+    def _flush_history(self, force: bool = False):
+        if not (self.journal.pending and (force or self.journal.due())):
+            return
+        seqs, rows = self.journal.snapshot()
+        try:
+            with span("sheet_write.run_history"):
+                sheet = get_or_create_run_history_sheet()
+                retry_gspread_call(sheet.append_rows, rows, value_input_option="USER_ENTERED")
+        except Exception:
+            self.journal.defer()
+            raise
+        self.journal.ack(seqs)
+        self.history_rows += len(rows)
+
+    def _run(self):
+        while True:
+            try:
+                kind, _payload = self.queue.get(timeout=1.0)
+            except queue.Empty:
+                kind = "tick"
+            started = time.monotonic()
+            # Shutdown signal: get buffered writes out now rather than on the next schedule
+            final = kind == "stop" or (should_exit and not self._exit_flushed)
+            if final:
+                self._exit_flushed = True
+            try:
+                if final:
+                    self.buffer.flush()
+                elif kind == "target_done":
+                    self.buffer.target_done()
+                else:
+                    self.buffer.maybe_flush()
+            except Exception as exc:
+                self.errors += 1
+                log_msg(f"⚠️ MsgList flush failed: {str(exc)[:80]}")
+            try:
+                self._flush_history(force=final)
+            except Exception as exc:
+                self.errors += 1
+                log_msg(f"⚠️ Run History append failed (kept in {self.journal.path or 'memory'}): {str(exc)[:80]}")
+            self.busy_secs += time.monotonic() - started
+            if kind == "stop":
+                return
+
+    def close(self, timeout: float = 120):
+        """Drain queued writes and flush; safe to call more than once"""
+        if self._closed:
+            return
+        self._closed = True
+        started = time.monotonic()
+        self.queue.put(("stop", None))
+        self._thread.join(timeout)
+        self.drain_wait_secs = time.monotonic() - started
+        if self._thread.is_alive():
+            log_msg("❌ Sheets writer did not finish in time; some writes may be lost")
+        elif self.buffer.pending:
+            # Final flush failed on the worker; one last try from here
+            try:
+                self.buffer.flush()
+            except Exception as exc:
+                log_msg(f"❌ MsgList final flush failed: {str(exc)[:80]}")
+        if self.journal.pending:
+            where = f"{self.journal.path}, replayed next run" if self.journal.path else "memory only, lost"
+            log_msg(f"⚠️ {len(self.journal.pending)} Run History rows not yet in the sheet ({where})")
+
+    def hidden_secs(self) -> float:
+        """Sheet I/O time that overlapped browser work instead of blocking it"""
+        return max(0.0, self.busy_secs - self.drain_wait_secs)
+
 # ============================================================================
 # BROWSER & AUTHENTICATION
 # ============================================================================
 
+# Explicit waits: every idle period in the flow waits on a concrete DOM/URL
+# condition with a deadline, and its actual cost is recorded per call site.
+WAIT_BUDGET: dict = {}
+_wait_budget_lock = threading.Lock()
+
+def wait_for(driver, condition, timeout: float, site: str, poll: float = 0.1):
+    """Wait until ``condition(driver)`` is truthy; returns its value or False on timeout"""
+    started = time.monotonic()
+    timed_out = False
+    try:
+        # Stale/missing elements mid-poll just mean "not yet"
+        return WebDriverWait(
+            driver, timeout, poll_frequency=poll, ignored_exceptions=(WebDriverException,)
+        ).until(condition)
+    except TimeoutException:
+        timed_out = True
+        return False
+    finally:
+        spent = time.monotonic() - started
+        with _wait_budget_lock:
+            entry = WAIT_BUDGET.setdefault(site, {"calls": 0, "spent": 0.0, "ceiling": 0.0, "timeouts": 0})
+            entry["calls"] += 1
+            entry["spent"] += spent
+            entry["ceiling"] += timeout
+            entry["timeouts"] += int(timed_out)
+
+def page_ready(driver) -> bool:
+    try:
+        return driver.execute_script("return document.readyState") in ("interactive", "complete")
+    except WebDriverException:
+        return False
+
+def url_left(fragment: str):
+    """Condition: current URL no longer contains ``fragment``"""
+    return lambda d: fragment not in d.current_url.lower()
+
+def log_wait_budget():
+    """Print actual wait time vs ceiling for each wait call site"""
+    if not WAIT_BUDGET:
+        return
+    log_msg("⏱️ Wait budget (spent / ceiling):")
+    for site, e in sorted(WAIT_BUDGET.items(), key=lambda kv: -kv[1]["spent"]):
+        timeouts = f", {e['timeouts']} timeouts" if e["timeouts"] else ""
+        log_msg(f"   {site}: {e['spent']:.1f}s / {e['ceiling']:.1f}s over {e['calls']} waits{timeouts}")
+
 def _navigate_with_retry(driver, url: str, *, retries: int = 2, delay: float = 2.0) -> bool:
     for attempt in range(1, retries + 1):
         try:
@@ -322,29 +1384,214 @@ def _navigate_with_retry(driver, url: str, *, retries: int = 2, delay: float = 2
             time.sleep(delay * attempt)
     return False
 
+RESOURCE_URL_PATTERNS = {
+    "image": ["*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.svg*", "*.ico*", "*.bmp*"],
+    "font": ["*.woff*", "*.ttf*", "*.otf*", "*.eot*"],
+    "media": ["*.mp4*", "*.webm*", "*.mp3*", "*.ogg*", "*.m3u8*"],
+    "stylesheet": ["*.css*"],
+}
+
+def blocked_url_patterns(resources: str = BLOCK_RESOURCES, extra: str = BLOCK_URLS) -> list[str]:
+    patterns: list[str] = []
+    for resource in (resources or "").split(","):
+        resource = resource.strip()
+        if not resource or resource in ("0", "none"):
+            continue
+        if resource not in RESOURCE_URL_PATTERNS:
+            log_msg(f"⚠️ Unknown resource type to block: {resource}")
+            continue
+        patterns.extend(RESOURCE_URL_PATTERNS[resource])
+    patterns.extend(p.strip() for p in (extra or "").split(",") if p.strip())
+    return patterns
+
+def apply_network_blocklist(driver, patterns: list[str]):
+    """Block matching requests at the network layer (DOM attributes such as img src are unaffected)"""
+    if not patterns:
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        if DEBUG:
+            log_msg(f"🚫 Blocking {len(patterns)} URL patterns ({BLOCK_RESOURCES or 'custom'})")
+    except Exception as exc:
+        log_msg(f"⚠️ Network blocklist not applied: {str(exc)[:60]}")
+
+PAGE_WEIGHT_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+const res = performance.getEntriesByType('resource');
+let bytes = nav ? (nav.transferSize || 0) : 0;
+for (const r of res) bytes += r.transferSize || 0;
+return {requests: res.length + (nav ? 1 : 0), bytes: bytes};
+"""
+
+PAGE_WEIGHT: dict = {}
+
+def record_page_weight(driver, label: str):
+    """Log request count and transferred bytes for the loaded page (DD_PAGE_WEIGHT=1)"""
+    if not PAGE_WEIGHT_LOG:
+        return
+    try:
+        weight = driver.execute_script(PAGE_WEIGHT_JS) or {}
+    except Exception:
+        return
+    entry = PAGE_WEIGHT.setdefault(label, {"pages": 0, "requests": 0, "bytes": 0})
+    entry["pages"] += 1
+    entry["requests"] += int(weight.get("requests") or 0)
+    entry["bytes"] += int(weight.get("bytes") or 0)
+    log_msg(f"  📦 {label}: {weight.get('requests', 0)} requests, {int(weight.get('bytes') or 0) // 1024} KB")
+
+def log_page_weight():
+    for label, e in PAGE_WEIGHT.items():
+        log_msg(f"   📦 {label}: {e['pages']} pages, {e['requests']} requests, {e['bytes'] // 1024} KB")
+
+class ChromeProfileLock:
+    """Exclusive OS-level lock on a Chrome profile dir (released automatically if we crash)"""
+
+    def __init__(self, profile_dir: str):
+        self.path = os.path.abspath(profile_dir.rstrip("/\\")) + ".lock"
+        self._fh = None
+
+    def acquire(self) -> bool:
+        self._fh = open(self.path, "a+")
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(self._fh.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            self._fh.close()
+            self._fh = None
+            return False
+
+    def release(self):
+        if self._fh is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+            else:
+                msvcrt.locking(self._fh.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+        self._fh.close()
+        self._fh = None
+
+_chrome_profile_lock: ChromeProfileLock | None = None
+SESSION_STATS = {"persistent": False, "reused": False, "probe_secs": 0.0, "login_secs": 0.0, "saved_secs": 0.0}
+
+def _session_meta_path() -> str:
+    return os.path.abspath(CHROME_PROFILE_DIR.rstrip("/\\")) + ".session.json"
+
+def _load_session_meta() -> dict:
+    try:
+        with open(_session_meta_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def _save_session_meta(meta: dict):
+    try:
+        with open(_session_meta_path(), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+    except Exception as exc:
+        if DEBUG:
+            log_msg(f"⚠️ Session meta save failed: {str(exc)[:60]}")
+
+def _acquire_chrome_profile() -> str:
+    """Lock the persistent profile dir; "" when disabled or already in use by another run"""
+    global _chrome_profile_lock
+    if not CHROME_PROFILE_DIR:
+        return ""
+    os.makedirs(CHROME_PROFILE_DIR, exist_ok=True)
+    lock = ChromeProfileLock(CHROME_PROFILE_DIR)
+    if not lock.acquire():
+        log_msg(f"⚠️ Chrome profile {CHROME_PROFILE_DIR} is locked by another run, using a fresh profile")
+        return ""
+    _chrome_profile_lock = lock
+    _clear_chrome_singletons(CHROME_PROFILE_DIR)
+    return os.path.abspath(CHROME_PROFILE_DIR)
+
+def _clear_chrome_singletons(profile_dir: str):
+    """Drop SingletonLock/Socket/Cookie left by a Chrome that died (or ran on another host).
+
+    Only called while we hold the profile lock, so no live Chrome of ours owns them.
+    """
+    try:
+        names = os.listdir(profile_dir)
+    except OSError:
+        return
+    for name in names:
+        if name.startswith("Singleton"):
+            try:
+                os.unlink(os.path.join(profile_dir, name))
+            except OSError as exc:
+                log_msg(f"⚠️ Could not remove stale {name}: {exc}")
+
+def release_chrome_profile():
+    global _chrome_profile_lock
+    if _chrome_profile_lock is not None:
+        _chrome_profile_lock.release()
+        _chrome_profile_lock = None
+
+def _load_selenium():
+    global webdriver, By, Service, Options, WebDriverWait, EC
+    global TimeoutException, WebDriverException, NoSuchElementException
+    if webdriver is not None:
+        return
+    from selenium import webdriver as _webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException
+    webdriver = _webdriver
+
+def _chrome_options(profile_dir: str = ""):
+    opts = Options()
+    if profile_dir:
+        opts.add_argument(f"--user-data-dir={profile_dir}")
+    opts.add_argument("--headless=new")
+    opts.add_argument("--window-size=1920,1080")
+    opts.add_argument("--disable-blink-features=AutomationControlled")
+    opts.add_experimental_option('excludeSwitches', ['enable-automation'])
+    opts.add_experimental_option('useAutomationExtension', False)
+    opts.add_argument("--no-sandbox")
+    opts.add_argument("--disable-dev-shm-usage")
+    opts.add_argument("--disable-gpu")
+    opts.add_argument("--disable-software-rasterizer")
+    opts.page_load_strategy = "eager"
+    return opts
+
+def _start_chrome(opts):
+    if CHROMEDRIVER_PATH and os.path.exists(CHROMEDRIVER_PATH):
+        return webdriver.Chrome(service=Service(CHROMEDRIVER_PATH), options=opts)
+    return webdriver.Chrome(options=opts)
+
 def setup_browser():
     """Setup headless Chrome browser"""
     try:
-        opts = Options()
-        opts.add_argument("--headless=new")
-        opts.add_argument("--window-size=1920,1080")
-        opts.add_argument("--disable-blink-features=AutomationControlled")
-        opts.add_experimental_option('excludeSwitches', ['enable-automation'])
-        opts.add_experimental_option('useAutomationExtension', False)
-        opts.add_argument("--no-sandbox")
-        opts.add_argument("--disable-dev-shm-usage")
-        opts.add_argument("--disable-gpu")
-        opts.add_argument("--disable-software-rasterizer")
-        opts.page_load_strategy = "eager"
-        if CHROMEDRIVER_PATH and os.path.exists(CHROMEDRIVER_PATH):
-            driver = webdriver.Chrome(service=Service(CHROMEDRIVER_PATH), options=opts)
-        else:
-            driver = webdriver.Chrome(options=opts)
+        _load_selenium()
+        profile_dir = _acquire_chrome_profile()
+        try:
+            driver = _start_chrome(_chrome_options(profile_dir))
+            SESSION_STATS["persistent"] = bool(profile_dir)
+        except Exception as exc:
+            if not profile_dir:
+                raise
+            # A profile Chrome refuses must not fail every run: retry once without it
+            log_msg(f"⚠️ Chrome rejected profile {CHROME_PROFILE_DIR} ({str(exc)[:60]}), using a fresh profile")
+            release_chrome_profile()
+            SESSION_STATS["persistent"] = False
+            driver = _start_chrome(_chrome_options())
         driver.set_page_load_timeout(45)
         driver.execute_script("Object.defineProperty(navigator,'webdriver',{get:()=>undefined})")
+        apply_network_blocklist(driver, blocked_url_patterns())
         return driver
     except Exception as e:
         log_msg(f"❌ Browser error: {e}")
+        release_chrome_profile()
         return None
 
 def save_cookies(driver):
@@ -363,7 +1610,7 @@ def load_cookies(driver):
             return False
         if not _navigate_with_retry(driver, HOME_URL):
             return False
-        time.sleep(2)
+        wait_for(driver, page_ready, 5, "cookies.home")
         with open(COOKIE_FILE, 'rb') as f:
             cookies = pickle.load(f)
         for c in cookies:
@@ -371,8 +1618,9 @@ def load_cookies(driver):
                 driver.add_cookie(c)
             except:
                 pass
+        old_root = driver.find_element(By.TAG_NAME, "html")
         driver.refresh()
-        time.sleep(3)
+        wait_for(driver, lambda d: EC.staleness_of(old_root)(d) and page_ready(d), 8, "cookies.refresh")
         log_msg("✅ Cookies loaded")
         return True
     except Exception as e:
@@ -390,7 +1638,7 @@ def login(driver) -> bool:
     try:
         if not _navigate_with_retry(driver, HOME_URL):
             return False
-        time.sleep(2)
+        wait_for(driver, page_ready, 5, "login.home")
 
         if load_cookies(driver):
             # Simple verification: check if we're not on login/signup pages
@@ -404,23 +1652,25 @@ def login(driver) -> bool:
         if not _navigate_with_retry(driver, LOGIN_URL):
             log_msg("❌ Login page load failed")
             return False
-        time.sleep(3)
         
         try:
-            nick = WebDriverWait(driver, 8).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "#nick, input[name='nick']"))
+            nick = wait_for(
+                driver,
+                EC.presence_of_element_located((By.CSS_SELECTOR, "#nick, input[name='nick']")),
+                11,
+                "login.form",
             )
+            if not nick:
+                raise TimeoutException("login form not found")
             pw = driver.find_element(By.CSS_SELECTOR, "#pass, input[name='pass']")
             btn = driver.find_element(By.CSS_SELECTOR, "button[type='submit'], form button")
             
             nick.clear()
             nick.send_keys(LOGIN_EMAIL)
-            time.sleep(0.5)
             pw.clear()
             pw.send_keys(LOGIN_PASS)
-            time.sleep(0.5)
             btn.click()
-            time.sleep(4)
+            wait_for(driver, lambda d: url_left("login")(d) and page_ready(d), 10, "login.submit")
             
             # Simple verification: check if we're not on login page anymore
             if 'login' not in driver.current_url.lower():
@@ -437,215 +1687,538 @@ def login(driver) -> bool:
         log_msg(f"❌ Login process error: {e}")
         return False
 
+def probe_logged_in(driver) -> bool:
+    """Fast session check: one home page load, no cookie juggling"""
+    try:
+        if not _navigate_with_retry(driver, HOME_URL, retries=1):
+            return False
+        wait_for(driver, page_ready, 5, "session.probe")
+        current_url = driver.current_url.lower()
+        if 'login' in current_url or 'signup' in current_url:
+            return False
+        return not driver.find_elements(By.CSS_SELECTOR, "input[name='pass']")
+    except WebDriverException as exc:
+        log_msg(f"⚠️ Session probe failed: {str(exc)[:60]}")
+        return False
+
+def ensure_session(driver) -> bool:
+    """Reuse the persistent profile's session when possible, else run the cookie/login flow"""
+    meta = _load_session_meta() if SESSION_STATS["persistent"] else {}
+    if SESSION_STATS["persistent"]:
+        started = time.monotonic()
+        ok = probe_logged_in(driver)
+        SESSION_STATS["probe_secs"] = time.monotonic() - started
+        if ok:
+            SESSION_STATS["reused"] = True
+            baseline = float(meta.get("full_login_secs") or 0)
+            SESSION_STATS["saved_secs"] = max(0.0, baseline - SESSION_STATS["probe_secs"])
+            meta["reuse_hits"] = int(meta.get("reuse_hits") or 0) + 1
+            meta["saved_secs_total"] = round(float(meta.get("saved_secs_total") or 0) + SESSION_STATS["saved_secs"], 1)
+            _save_session_meta(meta)
+            save_cookies(driver)  # keep COOKIE_FILE current for the HTTP-only paths
+            log_msg(
+                f"✅ Session reused from Chrome profile (probe {SESSION_STATS['probe_secs']:.1f}s,"
+                f" ~{SESSION_STATS['saved_secs']:.1f}s saved)"
+            )
+            return True
+        log_msg("⚠️ Persistent session not logged in, falling back to cookie/login flow")
+
+    started = time.monotonic()
+    ok = login(driver)
+    SESSION_STATS["login_secs"] = time.monotonic() - started
+    if ok and SESSION_STATS["persistent"]:
+        meta["full_login_secs"] = round(SESSION_STATS["login_secs"], 1)
+        _save_session_meta(meta)
+    return ok
+
+def session_summary() -> str:
+    if not SESSION_STATS["persistent"]:
+        return ""
+    if SESSION_STATS["reused"]:
+        meta = _load_session_meta()
+        return (
+            f"reused (probe {SESSION_STATS['probe_secs']:.1f}s, saved ~{SESSION_STATS['saved_secs']:.1f}s;"
+            f" {meta.get('reuse_hits', 0)} reuse hits, ~{meta.get('saved_secs_total', 0)}s saved overall)"
+        )
+    return f"full login ({SESSION_STATS['login_secs']:.1f}s)"
+
 # ============================================================================
-# HELPER FUNCTIONS
+# HTTP FETCH BACKEND
 # ============================================================================
 
-def clean_text(v: str) -> str:
-    """Clean text data"""
-    if not v:
-        return ""
-    v = str(v).strip().replace('\xa0', ' ')
-    bad = {
-        "No city",
-        "Not set",
-        "[No Posts]",
-        "N/A",
-        "no city",
-        "not set",
-        "[no posts]",
-        "n/a",
-        "[No Post URL]",
-        "[Error]",
-        "none",
-        "null",
-        "no age",
-        "no set"
-    }
-    return "" if v in bad else re.sub(r"\s+", " ", v)
+STAGES = ("profile", "recent_post", "open_post", "verify")
 
-def convert_relative_date_to_absolute(text: str) -> str:
-    """Convert relative dates to absolute"""
-    if not text:
-        return ""
-    t = text.lower().strip()
-    t = (
-        t.replace("mins", "minutes")
-        .replace("min", "minute")
-        .replace("secs", "seconds")
-        .replace("sec", "second")
-        .replace("hrs", "hours")
-        .replace("hr", "hour")
-    )
-    if any(keyword in t for keyword in {"just now", "abhi"}):
-        return get_pkt_time().strftime("%d-%b-%y")
-    m = re.search(r"(\d+)\s*(second|minute|hour|day|week|month|year)s?\s*ago", t)
-    if not m:
-        return text
-    amt = int(m.group(1))
-    unit = m.group(2)
-    s_map = {"second": 1, "minute": 60, "hour": 3600, "day": 86400, "week": 604800, "month": 2592000, "year": 31536000}
-    if unit in s_map:
-        dt = get_pkt_time() - timedelta(seconds=amt * s_map[unit])
-        return dt.strftime("%d-%b-%y")
-    return text
+class HttpFetchError(Exception):
+    """HTTP fast path could not serve the page; caller falls back to Selenium"""
+
+def _parse_backend_spec(spec: str) -> dict:
+    backends = {stage: "selenium" for stage in STAGES}
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "=" in part:
+            stage, backend = (p.strip() for p in part.split("=", 1))
+            if stage in backends:
+                backends[stage] = backend
+        else:
+            backends = {stage: part for stage in STAGES}
+    return backends
+
+STAGE_BACKENDS = _parse_backend_spec(FETCH_BACKEND)
+
+def _use_http(stage: str) -> bool:
+    return STAGE_BACKENDS.get(stage) == "http" and requests is not None and BeautifulSoup is not None
+
+class HttpFetcher:
+    """Pooled keep-alive session that reuses the logged-in browser cookies"""
+
+    def __init__(self, pool_size: int = 4, timeout: float = HTTP_TIMEOUT):
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0 Safari/537.36",
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+        self.requests = 0
+        self.bytes = 0
+
+    def set_cookies(self, cookies: list[dict]):
+        for c in cookies or []:
+            try:
+                self.session.cookies.set(
+                    c["name"], c["value"], domain=c.get("domain") or SITE_HOST, path=c.get("path") or "/"
+                )
+            except Exception:
+                continue
+
+    def load_cookie_file(self, path: str | None = None) -> bool:
+        path = path or COOKIE_FILE
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, "rb") as f:
+                self.set_cookies(pickle.load(f))
+            return True
+        except Exception as exc:
+            if DEBUG:
+                log_msg(f"⚠️ HTTP cookie load failed: {str(exc)[:60]}")
+            return False
+
+    def get_soup(self, url: str):
+        """Fetch ``url`` and return (final_url, soup); raise HttpFetchError otherwise"""
+        try:
+            resp = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as exc:
+            raise HttpFetchError(str(exc)[:80]) from exc
+        self.requests += 1
+        self.bytes += len(resp.content or b"")
+        if resp.status_code != 200:
+            raise HttpFetchError(f"HTTP {resp.status_code} for {url}")
+        final_url = resp.url or url
+        if "/login" in urlparse(final_url).path:
+            raise HttpFetchError("session not logged in")
+        return final_url, BeautifulSoup(resp.text, "html.parser")
+
+_http_fetcher = None
+_http_fetcher_lock = threading.Lock()
+
+def get_http_fetcher():
+    """Shared fetcher seeded from COOKIE_FILE (None when requests/bs4 are missing)"""
+    global _http_fetcher
+    if requests is None or BeautifulSoup is None:
+        return None
+    with _http_fetcher_lock:
+        if _http_fetcher is None:
+            _http_fetcher = HttpFetcher()
+            _http_fetcher.load_cookie_file()
+        return _http_fetcher
+
+def sync_http_session(driver):
+    """Copy the browser's current cookies and user agent into the HTTP session"""
+    fetcher = get_http_fetcher()
+    if fetcher is None or driver is None:
+        return
+    try:
+        fetcher.set_cookies(driver.get_cookies())
+        ua = driver.execute_script("return navigator.userAgent")
+        if ua:
+            fetcher.session.headers["User-Agent"] = ua.replace("HeadlessChrome", "Chrome")
+    except Exception as exc:
+        if DEBUG:
+            log_msg(f"⚠️ HTTP session sync failed: {str(exc)[:60]}")
+
+def _soup_text(elem) -> str:
+    return elem.get_text(" ", strip=True) if elem is not None else ""
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+clean_text = Normalize.clean_text
+convert_relative_date_to_absolute = Normalize.convert_relative_date_to_absolute
 
 def to_absolute_url(href: str) -> str:
     """Ensure href is converted to absolute URL"""
-    if not href:
-        return ""
-    href = href.strip()
-    if href.startswith("/"):
-        return f"{BASE_URL}{href}"
-    if not href.startswith("http"):
-        return f"{BASE_URL}/{href}"
-    return href
+    return Normalize.to_absolute_url(href, BASE_URL)
 
 def extract_text_comment_url(href: str) -> str:
-    match = re.search(r"/comments/text/(\d+)/", href or "")
-    if match:
-        return to_absolute_url(f"/comments/text/{match.group(1)}/").rstrip("/")
-    return to_absolute_url(href or "")
+    return Normalize.extract_text_comment_url(href or "", BASE_URL)
 
 def extract_image_comment_url(href: str) -> str:
-    match = re.search(r"/comments/image/(\d+)/", href or "")
-    if match:
-        return to_absolute_url(f"/content/{match.group(1)}/g/")
-    return to_absolute_url(href or "")
+    return Normalize.extract_image_comment_url(href or "", BASE_URL)
 
 def parse_post_timestamp(text: str) -> str:
     return convert_relative_date_to_absolute(text)
 
+# Lower-cased page-source markers used for FRIEND / STATUS detection
+PAGE_MARKERS = (
+    'action="/follow/remove/"',
+    'unfollow.svg',
+    'follow.svg',
+    'unfollow',
+    'account suspended',
+    'background:tomato',
+    'style="background:tomato"',
+)
+
+def _friend_status_from_markers(markers: dict) -> str:
+    if markers.get('action="/follow/remove/"') or markers.get('unfollow.svg'):
+        return "Yes"
+    if markers.get('follow.svg') and not markers.get('unfollow'):
+        return "No"
+    return ""
+
+def _page_markers(page_source: str) -> dict:
+    low = (page_source or "").lower()
+    return {m: m in low for m in PAGE_MARKERS}
+
+def _friend_status_from_source(page_source: str) -> str:
+    return _friend_status_from_markers(_page_markers(page_source))
+
 def get_friend_status(driver) -> str:
     try:
-        page_source = (driver.page_source or "").lower()
-        if 'action="/follow/remove/"' in page_source or 'unfollow.svg' in page_source:
-            return "Yes"
-        if 'follow.svg' in page_source and 'unfollow' not in page_source:
-            return "No"
-        return ""
+        return _friend_status_from_source(driver.page_source)
     except Exception:
         return ""
 
-def scrape_recent_post(driver, nickname: str) -> dict:
-    """Fetch the latest post link and timestamp for the nickname"""
-    post_url = f"{BASE_URL}/profile/public/{nickname}"
-    try:
-        if DEBUG:
-            log_msg(f"  🔍 Scraping recent post: {nickname}")
-        driver.get(post_url)
-        WebDriverWait(driver, 5).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "article.mbl"))
-        )
-        
-        post_element = driver.find_element(By.CSS_SELECTOR, "article.mbl")
-        post_data = {"LPOST": "", "LDATE-TIME": ""}
+POST_URL_SELECTORS = [
+    ("a[href*='/content/']", lambda href: to_absolute_url(href)),
+    ("a[href*='/comments/text/']", extract_text_comment_url),
+    ("a[href*='/comments/image/']", extract_image_comment_url),
+]
+
+POST_TIME_SELECTORS = [
+    "span[itemprop='datePublished']",
+    "time[itemprop='datePublished']",
+    "span.cxs.cgy",
+    "time",
+]
+
+def _recent_post_from_soup(page_url: str, soup) -> dict:
+    post_data = {"LPOST": "", "LDATE-TIME": ""}
+    post_element = soup.select_one("article.mbl")
+    if post_element is None:
+        return post_data
 
-        url_selectors = [
-            ("a[href*='/content/']", lambda href: to_absolute_url(href)),
-            ("a[href*='/comments/text/']", extract_text_comment_url),
-            ("a[href*='/comments/image/']", extract_image_comment_url),
-        ]
+    for selector, formatter in POST_URL_SELECTORS:
+        link = post_element.select_one(selector)
+        href = urljoin(page_url, link.get("href") or "") if link is not None else ""
+        if href:
+            formatted = formatter(href)
+            if formatted:
+                post_data["LPOST"] = formatted
+                break
 
-        for selector, formatter in url_selectors:
-            try:
-                link = post_element.find_element(By.CSS_SELECTOR, selector)
-                href = link.get_attribute("href")
-                if href:
-                    formatted = formatter(href)
-                    if formatted:
-                        post_data["LPOST"] = formatted
-                        break
-            except Exception:
-                continue
+    for selector in POST_TIME_SELECTORS:
+        raw_text = _soup_text(post_element.select_one(selector))
+        if raw_text:
+            post_data["LDATE-TIME"] = parse_post_timestamp(raw_text)
+            break
+    return post_data
 
-        time_selectors = [
-            "span[itemprop='datePublished']",
-            "time[itemprop='datePublished']",
-            "span.cxs.cgy",
-            "time",
-        ]
+def _recent_post_from_driver(driver) -> dict:
+    post_element = driver.find_element(By.CSS_SELECTOR, "article.mbl")
+    post_data = {"LPOST": "", "LDATE-TIME": ""}
 
-        for selector in time_selectors:
-            try:
-                time_elem = post_element.find_element(By.CSS_SELECTOR, selector)
-                raw_text = time_elem.text.strip()
-                if raw_text:
-                    post_data["LDATE-TIME"] = parse_post_timestamp(raw_text)
+    for selector, formatter in POST_URL_SELECTORS:
+        try:
+            link = post_element.find_element(By.CSS_SELECTOR, selector)
+            href = link.get_attribute("href")
+            if href:
+                formatted = formatter(href)
+                if formatted:
+                    post_data["LPOST"] = formatted
                     break
-            except Exception:
-                continue
+        except Exception:
+            continue
 
-        return post_data
+    for selector in POST_TIME_SELECTORS:
+        try:
+            time_elem = post_element.find_element(By.CSS_SELECTOR, selector)
+            raw_text = time_elem.text.strip()
+            if raw_text:
+                post_data["LDATE-TIME"] = parse_post_timestamp(raw_text)
+                break
+        except Exception:
+            continue
+
+    return post_data
+
+def _open_post_link(href: str) -> str:
+    """Normalize a post's comment link; empty when it is not a usable URL"""
+    if not href:
+        return ""
+    if not href.startswith("http"):
+        href = f"{BASE_URL}{href}"
+    post_link = clean_url(href)
+    return post_link if _looks_like_url(post_link) else ""
+
+def _open_post_from_soup(page_url: str, soup) -> tuple[str, str, int]:
+    """Return (first open post link, next page href, article count) for a parsed posts page"""
+    posts = soup.select("article.mbl")
+    for idx, post in enumerate(posts, 1):
+        link = (
+            post.select_one("a[href*='/comments/text/']")
+            or post.select_one("a[href*='/comments/image/']")
+            or post.select_one("a:has(> button[itemprop='discussionUrl'])")
+        )
+        post_link = _open_post_link(urljoin(page_url, link.get("href") or "") if link is not None else "")
+        if post_link:
+            return post_link, "", len(posts)
+    next_link = soup.select_one("a[rel~='next']")
+    next_href = urljoin(page_url, next_link.get("href") or "") if next_link is not None else ""
+    return "", next_href, len(posts)
+
+def _open_post_from_driver(driver) -> tuple[str, str, int]:
+    """Return (first open post link, next page href, article count) for the loaded posts page"""
+    posts = driver.find_elements(By.CSS_SELECTOR, "article.mbl")
+    for idx, post in enumerate(posts, 1):
+        try:
+            # Prefer explicit text/image comment links if present
+            href = ""
+            for sel in [
+                "a[href*='/comments/text/']",
+                "a[href*='/comments/image/']",
+            ]:
+                try:
+                    a = post.find_element(By.CSS_SELECTOR, sel)
+                    href = a.get_attribute("href") or ""
+                    if href:
+                        break
+                except Exception:
+                    continue
+
+            if not href:
+                reply_btn = post.find_element(By.XPATH, ".//a[button[@itemprop='discussionUrl']]")
+                href = reply_btn.get_attribute("href") or ""
+
+            post_link = _open_post_link(href)
+            if post_link:
+                return post_link, "", len(posts)
+        except Exception:
+            continue
+
+    # Try pagination
+    try:
+        next_link = driver.find_element(By.CSS_SELECTOR, "a[rel='next']")
+        next_href = next_link.get_attribute("href") or ""
     except Exception:
+        next_href = ""
+    return "", next_href, len(posts)
+
+# Per-target snapshots of /profile/public/{nick}: the page is loaded once and
+# both the "last post" and the "first open post" are computed from it.
+_posts_page_snapshots: dict = {}
+
+def clear_page_snapshots():
+    _posts_page_snapshots.clear()
+
+def _posts_page_snapshot(driver, nickname: str, stage: str) -> dict | None:
+    """Load the first posts page once per target; None when it could not be read"""
+    key = _normalize_profile_key(nickname)
+    snapshot = _posts_page_snapshots.get(key)
+    if snapshot is not None:
+        if DEBUG:
+            log_msg(f"  ♻️ Reusing posts page snapshot for {nickname}")
+        return snapshot
+
+    post_url = f"{BASE_URL}/profile/public/{nickname}/"
+    if _use_http(stage):
+        try:
+            page_url, soup = get_http_fetcher().get_soup(post_url)
+            open_post, next_href, count = _open_post_from_soup(page_url, soup)
+            snapshot = {
+                "recent_post": _recent_post_from_soup(page_url, soup),
+                "open_post": open_post,
+                "next_href": next_href,
+                "articles": count,
+            }
+        except Exception as exc:
+            log_msg(f"  ↩️ HTTP posts fetch failed, using browser: {str(exc)[:60]}")
+    if snapshot is None or (not snapshot["articles"] and driver is not None):
+        if driver is None:
+            return None
+        try:
+            driver.get(post_url)
+            try:
+                WebDriverWait(driver, 5).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "article.mbl"))
+                )
+                recent_post = _recent_post_from_driver(driver)
+            except TimeoutException:
+                recent_post = {"LPOST": "", "LDATE-TIME": ""}
+            record_page_weight(driver, "posts")
+            open_post, next_href, count = _open_post_from_driver(driver)
+            snapshot = {
+                "recent_post": recent_post,
+                "open_post": open_post,
+                "next_href": next_href,
+                "articles": count,
+            }
+        except Exception:
+            return None
+    _posts_page_snapshots[key] = snapshot
+    return snapshot
+
+def scrape_recent_post(driver, nickname: str) -> dict:
+    """Fetch the latest post link and timestamp for the nickname"""
+    if DEBUG:
+        log_msg(f"  🔍 Scraping recent post: {nickname}")
+    snapshot = _posts_page_snapshot(driver, nickname, "recent_post")
+    if not snapshot:
         return {"LPOST": "", "LDATE-TIME": ""}
+    return dict(snapshot["recent_post"])
 
 def find_first_open_post(driver, nickname: str) -> str | None:
     """Find first post with open comments"""
-    url = f"{BASE_URL}/profile/public/{nickname}/"
     try:
         max_pages = int(os.environ.get("DD_MAX_POST_PAGES", "4") or "4")
-        current_url = url
 
-        for page_idx in range(1, max_pages + 1):
+        log_msg(f"  📄 Opening posts page... (1/{max_pages})")
+        snapshot = _posts_page_snapshot(driver, nickname, "open_post")
+        if snapshot is None:
+            log_msg(f"  ⚠️ No open posts found")
+            return None
+        log_msg(f"  📊 Found {snapshot['articles']} posts")
+        post_link = snapshot["open_post"]
+        current_url = snapshot["next_href"]
+
+        for page_idx in range(2, max_pages + 1):
+            if post_link or not current_url:
+                break
             log_msg(f"  📄 Opening posts page... ({page_idx}/{max_pages})")
-            driver.get(current_url)
-            time.sleep(3)
-
-            posts = driver.find_elements(By.CSS_SELECTOR, "article.mbl")
-            log_msg(f"  📊 Found {len(posts)} posts")
-
-            for idx, post in enumerate(posts, 1):
+            if _use_http("open_post"):
                 try:
-                    # Prefer explicit text/image comment links if present
-                    href = ""
-                    for sel in [
-                        "a[href*='/comments/text/']",
-                        "a[href*='/comments/image/']",
-                    ]:
-                        try:
-                            a = post.find_element(By.CSS_SELECTOR, sel)
-                            href = a.get_attribute("href") or ""
-                            if href:
-                                break
-                        except Exception:
-                            continue
-
-                    if not href:
-                        reply_btn = post.find_element(By.XPATH, ".//a[button[@itemprop='discussionUrl']]")
-                        href = reply_btn.get_attribute("href") or ""
-
-                    if not href:
-                        continue
-
-                    if not href.startswith("http"):
-                        href = f"{BASE_URL}{href}"
-
-                    post_link = clean_url(href)
-                    if not _looks_like_url(post_link):
-                        continue
-
-                    log_msg(f"  ✓ Found open post #{idx}: {post_link}")
-                    return post_link
-                except Exception:
+                    page_url, soup = get_http_fetcher().get_soup(current_url)
+                    post_link, current_url, count = _open_post_from_soup(page_url, soup)
+                    log_msg(f"  📊 Found {count} posts")
                     continue
+                except Exception as exc:
+                    log_msg(f"  ↩️ HTTP posts fetch failed, using browser: {str(exc)[:60]}")
+            driver.get(current_url)
+            wait_for(
+                driver,
+                lambda d: d.find_elements(By.CSS_SELECTOR, "article.mbl") or d.execute_script("return document.readyState") == "complete",
+                5,
+                "open_post.page",
+            )
+            record_page_weight(driver, "posts")
+            post_link, current_url, count = _open_post_from_driver(driver)
+            log_msg(f"  📊 Found {count} posts")
 
-            # Try pagination
-            try:
-                next_link = driver.find_element(By.CSS_SELECTOR, "a[rel='next']")
-                next_href = next_link.get_attribute("href") or ""
-                if not next_href:
-                    break
-                current_url = next_href
-            except Exception:
-                break
-
+        if post_link:
+            log_msg(f"  ✓ Found open post: {post_link}")
+            return post_link
         log_msg(f"  ⚠️ No open posts found")
         return None
     except Exception as e:
         log_msg(f"  ❌ Error finding posts: {str(e)[:60]}")
         return None
 
+def _normalize_comment_text(text: str) -> str:
+    return re.sub(r"\s+", " ", (text or "").replace("\xa0", " ")).strip()
+
+# Pair each <bdi> comment body with its nearest author link, so a match means
+# "a comment by us with this text", not "our name and the text somewhere on the page"
+VERIFY_COMMENT_JS = """
+const nick = arguments[0].toLowerCase();
+const wanted = arguments[1];
+const norm = (s) => (s || '').replace(/\\u00a0/g, ' ').replace(/\\s+/g, ' ').trim();
+for (const bdi of document.querySelectorAll('bdi')) {
+  if (!norm(bdi.textContent).includes(wanted)) continue;
+  let node = bdi.parentElement;
+  while (node && !node.querySelector("a[href*='/users/']")) node = node.parentElement;
+  const author = node ? node.querySelector("a[href*='/users/']") : null;
+  if (author && (author.getAttribute('href') || '').toLowerCase().includes('/users/' + nick + '/')) return true;
+}
+return false;
+"""
+
+def _comment_present_in_soup(soup, nick: str, text: str) -> bool:
+    nick = nick.lower()
+    for bdi in soup.find_all("bdi"):
+        if text not in _normalize_comment_text(bdi.get_text()):
+            continue
+        node = bdi.parent
+        while node is not None and node.select_one("a[href*='/users/']") is None:
+            node = node.parent
+        author = node.select_one("a[href*='/users/']") if node is not None else None
+        if author is not None and f"/users/{nick}/" in (author.get("href") or "").lower():
+            return True
+    return False
+
+def _comment_present(driver, post_url: str, text: str, reload: bool) -> bool:
+    if reload and _use_http("verify"):
+        try:
+            _, soup = get_http_fetcher().get_soup(post_url)
+            return _comment_present_in_soup(soup, LOGIN_EMAIL, text)
+        except Exception as exc:
+            if DEBUG:
+                log_msg(f"  ↩️ HTTP verify fetch failed, using browser: {str(exc)[:60]}")
+    if reload:
+        driver.get(post_url)
+        wait_for(driver, page_ready, 5, "verify.reload")
+    return bool(driver.execute_script(VERIFY_COMMENT_JS, LOGIN_EMAIL, text))
+
+def verify_comment_posted(driver, post_url: str, message: str, timeout: float = VERIFY_TIMEOUT) -> bool:
+    """Poll for a comment by our account containing ``message``, with backoff up to ``timeout``.
+
+    The page the form submitted to is checked first; later attempts reload
+    the post (over HTTP when available) and only inspect the comment bodies.
+    """
+    text = _normalize_comment_text(message)
+    if not text:
+        return False
+    deadline = time.monotonic() + timeout
+    delay = 0.5
+    attempt = 0
+    started = time.monotonic()
+    while True:
+        attempt += 1
+        try:
+            found = _comment_present(driver, post_url, text, reload=attempt > 1)
+        except Exception as exc:
+            found = False
+            if DEBUG:
+                log_msg(f"  ⚠️ Verify attempt {attempt} failed: {str(exc)[:60]}")
+        if DEBUG:
+            log_msg(f"  🔍 Verify attempt {attempt}: {_bool_icon(found)}")
+        if found or time.monotonic() + delay > deadline:
+            break
+        time.sleep(delay)
+        delay = min(delay * 2, 4)
+    with _wait_budget_lock:
+        entry = WAIT_BUDGET.setdefault("send.verify", {"calls": 0, "spent": 0.0, "ceiling": 0.0, "timeouts": 0})
+        entry["calls"] += 1
+        entry["spent"] += time.monotonic() - started
+        entry["ceiling"] += timeout
+        entry["timeouts"] += int(not found)
+    return found
+
 # DO NOT MODIFY - Core message sending and verification logic
 # Changing this will break the entire messaging system and cause posting failures
 def send_and_verify_message(driver, post_url: str, message: str) -> dict:
@@ -653,11 +2226,18 @@ def send_and_verify_message(driver, post_url: str, message: str) -> dict:
     try:
         log_msg(f"  📝 Opening Post...")
         driver.get(post_url)
-        time.sleep(3)
+        wait_for(
+            driver,
+            lambda d: d.find_elements(By.CSS_SELECTOR, "form[action*='direct-response/send']")
+            or d.execute_script("return document.readyState") == "complete",
+            8,
+            "send.open",
+        )
+        record_page_weight(driver, "post")
         
         # Check if we're on the right page
-        if "damadam.pk" not in driver.current_url.lower():
-            log_msg(f"  ⚠️ Redirected away from damadam.pk")
+        if SITE_HOST not in driver.current_url.lower():
+            log_msg(f"  ⚠️ Redirected away from {SITE_HOST}")
             return {"status": "Redirected", "link": driver.current_url, "msg": ""}
         
         # Check for "FOLLOW TO REPLY"
@@ -679,7 +2259,6 @@ def send_and_verify_message(driver, post_url: str, message: str) -> dict:
                     if btn.is_displayed() and btn.is_enabled():
                         log_msg(f"  🖱️ Clicking reply button {i+1}")
                         driver.execute_script("arguments[0].click();", btn)
-                        time.sleep(1)
                 except:
                     continue
                     
@@ -705,7 +2284,17 @@ def send_and_verify_message(driver, post_url: str, message: str) -> dict:
         except:
             pass
         
-        time.sleep(2)  # Wait for any dynamic forms to load
+        # Wait for a visible reply form (dynamic forms appear after clicking reply)
+        wait_for(
+            driver,
+            lambda d: any(
+                f.is_displayed()
+                for f in d.find_elements(By.CSS_SELECTOR, "form[action*='direct-response/send']")
+            ),
+            3,
+            "send.form",
+            poll=0.2,
+        )
         
         # Find the main reply form
         try:
@@ -790,22 +2379,26 @@ def send_and_verify_message(driver, post_url: str, message: str) -> dict:
             
             # Clear and type message
             textarea.clear()
-            time.sleep(0.5)
             
-            # Limit message to 350 chars
-            if len(message) > 350:
-                message = message[:350]
+            # Limit message to damadam's reply length
+            if len(message) > MESSAGE_LIMIT:
+                message = message[:MESSAGE_LIMIT]
             
             textarea.send_keys(message)
             log_msg(f"  ✍️ Typed message: '{message}' ({len(message)} chars)")
-            time.sleep(1)
+            wait_for(
+                driver,
+                lambda d: len(textarea.get_attribute("value") or "") >= len(message),
+                3,
+                "send.typed",
+            )
             
             # Find send button
             send_btn = form.find_element(By.CSS_SELECTOR, "button[type='submit']")
             
             # Scroll to button
             driver.execute_script("arguments[0].scrollIntoView(true);", send_btn)
-            time.sleep(0.5)
+            wait_for(driver, EC.element_to_be_clickable(send_btn), 2, "send.button")
             
             # Click send
             log_msg(f"  🚀 Clicking send button...")
@@ -815,39 +2408,22 @@ def send_and_verify_message(driver, post_url: str, message: str) -> dict:
                 # Fallback to JavaScript click
                 driver.execute_script("arguments[0].click();", send_btn)
             
-            log_msg(f"  ⏳ Waiting 3 seconds for post to process...")
-            time.sleep(3)
-            
-            # Refresh page to see new message
-            log_msg("  🔄 Refreshing Page To Verify...")
-            driver.get(post_url)
-            time.sleep(2)
-            
-            # Check if message appears
-            fresh_page = driver.page_source
-            
-            # Multiple verification methods
-            verifications = {
-                "username_href": f'href="/users/{LOGIN_EMAIL}/"' in fresh_page,
-                "username_bold": f'<b>{LOGIN_EMAIL}</b>' in fresh_page,
-                "message_in_bdi": f'<bdi>{message}</bdi>' in fresh_page,
-                "recent_time": any(x in fresh_page.lower() for x in ['sec ago', 'secs ago', 'seconds ago']),
-                "simple_username": LOGIN_EMAIL in fresh_page,
-                "simple_message": message in fresh_page
-            }
-            
-            if DEBUG:
-                log_msg("  🔍 Verification Checks:")
-                for check_name, result in verifications.items():
-                    log_msg(f"     {check_name}: {_bool_icon(result)}")
+            log_msg(f"  ⏳ Waiting for post to process...")
+            wait_for(
+                driver,
+                lambda d: EC.staleness_of(send_btn)(d) or not (textarea.get_attribute("value") or ""),
+                10,
+                "send.submit",
+                poll=0.25,
+            )
             
-            # If any verification passes
-            if any(verifications.values()):
+            verified = verify_comment_posted(driver, post_url, message)
+            if verified:
                 log_msg("  ✅ Message Verified!")
-                return {"status": "✅ Posted", "link": clean_url(post_url), "msg": message}
+                return {"status": "✅ Posted", "link": clean_url(post_url), "msg": message, "verified": True}
             else:
                 log_msg(f"  ⚠️ Message sent but not verified")
-                return {"status": "⚠️ Pending verification", "link": post_url, "msg": message}
+                return {"status": "⚠️ Pending verification", "link": post_url, "msg": message, "verified": False}
                 
         except NoSuchElementException as e:
             log_msg(f"  ❌ Form element not found: {str(e)[:60]}")
@@ -857,134 +2433,302 @@ def send_and_verify_message(driver, post_url: str, message: str) -> dict:
         log_msg(f"  ❌ Error: {str(e)[:100]}")
         return {"status": f"Error: {str(e)[:30]}", "link": post_url, "msg": ""}
 
-# ============================================================================
-# PROFILE SCRAPING
-# ============================================================================
+# ============================================================================
+# PROFILE SCRAPING
+# ============================================================================
+
+INTRO_SELECTORS = ["span.cl.sp.lsp.nos", "span.cl", ".ow span.nos"]
+PROFILE_FIELDS = {'City:': 'CITY', 'Gender:': 'GENDER', 'Married:': 'MARRIED', 'Age:': 'AGE', 'Joined:': 'JOINED'}
+FOLLOWER_SELECTORS = ["span.cl.sp.clb", ".cl.sp.clb"]
+POST_COUNT_SELECTORS = ["a[href*='/profile/public/'] button div:first-child", "a[href*='/profile/public/'] button div"]
+AVATAR_SELECTORS = ["img[src*='avatar-imgs']", "img[src*='avatar']", "div[style*='whitesmoke'] img[src*='cloudfront.net']"]
+
+def _new_profile_data(nickname: str, url: str) -> dict:
+    return {
+        "IMAGE": "",
+        "NICK NAME": nickname,
+        "TAGS": "",
+        "LAST POST": "",
+        "LAST POST TIME": "",
+        "FRIEND": "",
+        "CITY": "",
+        "GENDER": "",
+        "MARRIED": "",
+        "AGE": "",
+        "JOINED": "",
+        "FOLLOWERS": "",
+        "STATUS": "Unknown",
+        "POSTS": "0",
+        "PROFILE LINK": url.rstrip('/'),
+        "INTRO": "",
+        "SOURCE": "Target",
+        "DATETIME SCRAP": get_pkt_time().strftime("%d-%b-%y %I:%M %p")
+    }
+
+def _status_from_markers(markers: dict) -> str:
+    """Suspended/Unverified from page markers, "" when the page needs a closer look"""
+    if markers.get('account suspended'):
+        return "Suspended"
+    if markers.get('background:tomato') or markers.get('style="background:tomato"'):
+        return "Unverified"
+    return ""
+
+def _status_from_source(page_source: str) -> str:
+    return _status_from_markers(_page_markers(page_source))
+
+def _apply_profile_field(data: dict, key: str, value: str):
+    """Normalize one labelled profile field (icons, dates, clean text)"""
+    value = (value or "").strip()
+    if not value:
+        return
+    if key == 'JOINED':
+        data[key] = convert_relative_date_to_absolute(value)
+    elif key == 'GENDER':
+        low = value.lower()
+        data[key] = "🚺" if low == 'female' else "🚹" if low == 'male' else value
+    elif key == 'MARRIED':
+        low = value.lower()
+        if low in {'yes', 'married'}:
+            data[key] = "💖"
+        elif low in {'no', 'single', 'unmarried'}:
+            data[key] = "💔"
+        else:
+            data[key] = value
+    else:
+        data[key] = clean_text(value)
+
+def _apply_recent_post(data: dict, post_data: dict):
+    if post_data.get('LPOST'):
+        data['LAST POST'] = post_data['LPOST']
+    if post_data.get('LDATE-TIME'):
+        data['LAST POST TIME'] = post_data['LDATE-TIME']
+
+def _scrape_profile_http(nickname: str, fetcher: HttpFetcher | None = None) -> dict:
+    """Profile scrape over the HTTP session; raises HttpFetchError to fall back"""
+    url = f"{BASE_URL}/users/{nickname}/"
+    page_url, soup = (fetcher or get_http_fetcher()).get_soup(url)
+    if soup.select_one("h1.cxl.clb.lsp") is None:
+        raise HttpFetchError("profile header not found")
+    return _fill_profile_from_soup(_new_profile_data(nickname, url), page_url, soup)
+
+def _fill_profile_from_soup(data: dict, page_url: str, soup) -> dict:
+    page_source = str(soup)
+    data['FRIEND'] = _friend_status_from_source(page_source)
+
+    status = _status_from_source(page_source)
+    if status == "Suspended":
+        data['STATUS'] = status
+        return data
+    if not status:
+        status = "Unverified" if soup.select_one("div[style*='tomato']") is not None else "Verified"
+    data['STATUS'] = status
+
+    for sel in INTRO_SELECTORS:
+        text = _soup_text(soup.select_one(sel))
+        if text:
+            data['INTRO'] = clean_text(text)
+            break
+
+    for label, key in PROFILE_FIELDS.items():
+        for b in soup.find_all("b"):
+            if label in b.get_text():
+                _apply_profile_field(data, key, _soup_text(b.find_next_sibling("span")))
+                break
+
+    for sel in FOLLOWER_SELECTORS:
+        match = re.search(r'(\d+)', _soup_text(soup.select_one(sel)))
+        if match:
+            data['FOLLOWERS'] = match.group(1)
+            break
+
+    for sel in POST_COUNT_SELECTORS:
+        match = re.search(r'(\d+)', _soup_text(soup.select_one(sel)))
+        if match:
+            data['POSTS'] = match.group(1)
+            break
+
+    for sel in AVATAR_SELECTORS:
+        img = soup.select_one(sel)
+        src = urljoin(page_url, img.get("src") or "") if img is not None else ""
+        if src and ('avatar' in src or 'cloudfront.net' in src):
+            data['IMAGE'] = src.replace('/thumbnail/', '/')
+            break
+    return data
+
+def _extract_profile_webdriver(driver, data: dict) -> dict:
+    """Fill ``data`` from the loaded profile page with one WebDriver call per lookup"""
+    page_source = driver.page_source
+    
+    data['FRIEND'] = _friend_status_from_source(page_source)
+    
+    # Check status
+    status = _status_from_source(page_source)
+    if status == "Suspended":
+        data['STATUS'] = status
+        return data
+    elif status:
+        data['STATUS'] = status
+    else:
+        try:
+            driver.find_element(By.CSS_SELECTOR, "div[style*='tomato']")
+            data['STATUS'] = "Unverified"
+        except:
+            data['STATUS'] = "Verified"
+    
+    # Get intro
+    for sel in INTRO_SELECTORS:
+        try:
+            intro = driver.find_element(By.CSS_SELECTOR, sel)
+            if intro.text.strip():
+                data['INTRO'] = clean_text(intro.text)
+                break
+        except:
+            pass
+    
+    # Get profile fields
+    for label, key in PROFILE_FIELDS.items():
+        try:
+            elem = driver.find_element(By.XPATH, f"//b[contains(text(), '{label}')]/following-sibling::span[1]")
+            _apply_profile_field(data, key, elem.text)
+        except:
+            continue
+    
+    # Get followers
+    for sel in FOLLOWER_SELECTORS:
+        try:
+            followers = driver.find_element(By.CSS_SELECTOR, sel)
+            match = re.search(r'(\d+)', followers.text)
+            if match:
+                data['FOLLOWERS'] = match.group(1)
+                break
+        except:
+            pass
+    
+    # Get post count
+    for sel in POST_COUNT_SELECTORS:
+        try:
+            posts = driver.find_element(By.CSS_SELECTOR, sel)
+            match = re.search(r'(\d+)', posts.text)
+            if match:
+                data['POSTS'] = match.group(1)
+                break
+        except:
+            pass
+    
+    # Get avatar image
+    for sel in AVATAR_SELECTORS:
+        try:
+            img = driver.find_element(By.CSS_SELECTOR, sel)
+            src = img.get_attribute('src')
+            if src and ('avatar' in src or 'cloudfront.net' in src):
+                data['IMAGE'] = src.replace('/thumbnail/', '/')
+                break
+        except:
+            pass
+    return data
+
+PROFILE_EXTRACT_JS = """
+const cfg = arguments[0];
+const q = (sel) => { try { return document.querySelector(sel); } catch (e) { return null; } };
+const text = (el) => el ? (el.innerText || el.textContent || '').trim() : '';
+const low = document.documentElement.outerHTML.toLowerCase();
+const out = {markers: {}, tomato_div: !!q("div[style*='tomato']"), intro: [], fields: {},
+             followers: [], posts: [], images: []};
+for (const m of cfg.markers) out.markers[m] = low.includes(m);
+for (const sel of cfg.intro) out.intro.push(text(q(sel)));
+const bolds = Array.from(document.querySelectorAll('b'));
+for (const label of cfg.labels) {
+  const b = bolds.find((el) => Array.from(el.childNodes).some(
+    (n) => n.nodeType === 3 && n.textContent.includes(label)));
+  let sib = b ? b.nextElementSibling : null;
+  while (sib && sib.tagName !== 'SPAN') sib = sib.nextElementSibling;
+  if (sib) out.fields[label] = text(sib);
+}
+for (const sel of cfg.followers) out.followers.push(text(q(sel)));
+for (const sel of cfg.posts) out.posts.push(text(q(sel)));
+for (const sel of cfg.images) { const img = q(sel); out.images.push(img ? (img.src || '') : ''); }
+return out;
+"""
+
+def _extract_profile_script(driver, data: dict) -> dict:
+    """Fill ``data`` from the loaded profile page with a single execute_script round trip"""
+    raw = driver.execute_script(PROFILE_EXTRACT_JS, {
+        "markers": list(PAGE_MARKERS),
+        "intro": INTRO_SELECTORS,
+        "labels": list(PROFILE_FIELDS),
+        "followers": FOLLOWER_SELECTORS,
+        "posts": POST_COUNT_SELECTORS,
+        "images": AVATAR_SELECTORS,
+    })
+    markers = raw.get("markers") or {}
+    data['FRIEND'] = _friend_status_from_markers(markers)
+
+    status = _status_from_markers(markers)
+    if status == "Suspended":
+        data['STATUS'] = status
+        return data
+    data['STATUS'] = status or ("Unverified" if raw.get("tomato_div") else "Verified")
+
+    for intro in raw.get("intro") or []:
+        if intro:
+            data['INTRO'] = clean_text(intro)
+            break
+
+    fields = raw.get("fields") or {}
+    for label, key in PROFILE_FIELDS.items():
+        _apply_profile_field(data, key, fields.get(label, ""))
+
+    for key, texts in (('FOLLOWERS', raw.get("followers")), ('POSTS', raw.get("posts"))):
+        for t in texts or []:
+            match = re.search(r'(\d+)', t or "")
+            if match:
+                data[key] = match.group(1)
+                break
+
+    for src in raw.get("images") or []:
+        if src and ('avatar' in src or 'cloudfront.net' in src):
+            data['IMAGE'] = src.replace('/thumbnail/', '/')
+            break
+    return data
 
 # DO NOT MODIFY - Profile data extraction logic
 # Changing this will break template processing and data mapping, causing message failures
 def scrape_profile(driver, nickname: str) -> dict | None:
     """Scrape full profile details from user page"""
     url = f"{BASE_URL}/users/{nickname}/"
+    if _use_http("profile"):
+        try:
+            if DEBUG:
+                log_msg(f"  🔍 Fetching profile over HTTP: {nickname}")
+            data = _scrape_profile_http(nickname)
+            if data['STATUS'] != "Suspended":
+                _apply_recent_post(data, scrape_recent_post(driver, nickname))
+            log_msg(f"  ✅ Profile: {data['GENDER']}, {data['CITY']}, Posts: {data['POSTS']}")
+            return data
+        except Exception as exc:
+            log_msg(f"  ↩️ HTTP profile fetch failed, using browser: {str(exc)[:60]}")
     try:
         if DEBUG:
             log_msg(f"  🔍 Scraping profile: {nickname}")
         driver.get(url)
         WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, "h1.cxl.clb.lsp")))
+        record_page_weight(driver, "profile")
         
-        now = get_pkt_time()
-        data = {
-            "IMAGE": "",
-            "NICK NAME": nickname,
-            "TAGS": "",
-            "LAST POST": "",
-            "LAST POST TIME": "",
-            "FRIEND": "",
-            "CITY": "",
-            "GENDER": "",
-            "MARRIED": "",
-            "AGE": "",
-            "JOINED": "",
-            "FOLLOWERS": "",
-            "STATUS": "Unknown",
-            "POSTS": "0",
-            "PROFILE LINK": url.rstrip('/'),
-            "INTRO": "",
-            "SOURCE": "Target",
-            "DATETIME SCRAP": now.strftime("%d-%b-%y %I:%M %p")
-        }
-        
-        page_source = driver.page_source
-        
-        data['FRIEND'] = get_friend_status(driver)
-        
-        # Check status
-        if 'account suspended' in page_source.lower():
-            data['STATUS'] = "Suspended"
-            return data
-        elif 'background:tomato' in page_source.lower() or 'style="background:tomato"' in page_source.lower():
-            data['STATUS'] = "Unverified"
-        else:
-            try:
-                driver.find_element(By.CSS_SELECTOR, "div[style*='tomato']")
-                data['STATUS'] = "Unverified"
-            except:
-                data['STATUS'] = "Verified"
-        
-        # Get intro
-        for sel in ["span.cl.sp.lsp.nos", "span.cl", ".ow span.nos"]:
-            try:
-                intro = driver.find_element(By.CSS_SELECTOR, sel)
-                if intro.text.strip():
-                    data['INTRO'] = clean_text(intro.text)
-                    break
-            except:
-                pass
-        
-        # Get profile fields
-        fields = {'City:': 'CITY', 'Gender:': 'GENDER', 'Married:': 'MARRIED', 'Age:': 'AGE', 'Joined:': 'JOINED'}
-        for label, key in fields.items():
-            try:
-                elem = driver.find_element(By.XPATH, f"//b[contains(text(), '{label}')]/following-sibling::span[1]")
-                value = elem.text.strip()
-                if not value:
-                    continue
-                if key == 'JOINED':
-                    data[key] = convert_relative_date_to_absolute(value)
-                elif key == 'GENDER':
-                    low = value.lower()
-                    data[key] = "🚺" if low == 'female' else "🚹" if low == 'male' else value
-                elif key == 'MARRIED':
-                    low = value.lower()
-                    if low in {'yes', 'married'}:
-                        data[key] = "💖"
-                    elif low in {'no', 'single', 'unmarried'}:
-                        data[key] = "💔"
-                    else:
-                        data[key] = value
-                else:
-                    data[key] = clean_text(value)
-            except:
-                continue
-        
-        # Get followers
-        for sel in ["span.cl.sp.clb", ".cl.sp.clb"]:
-            try:
-                followers = driver.find_element(By.CSS_SELECTOR, sel)
-                match = re.search(r'(\d+)', followers.text)
-                if match:
-                    data['FOLLOWERS'] = match.group(1)
-                    break
-            except:
-                pass
-        
-        # Get post count
-        for sel in ["a[href*='/profile/public/'] button div:first-child", "a[href*='/profile/public/'] button div"]:
-            try:
-                posts = driver.find_element(By.CSS_SELECTOR, sel)
-                match = re.search(r'(\d+)', posts.text)
-                if match:
-                    data['POSTS'] = match.group(1)
-                    break
-            except:
-                pass
-        
-        # Get avatar image
-        for sel in ["img[src*='avatar-imgs']", "img[src*='avatar']", "div[style*='whitesmoke'] img[src*='cloudfront.net']"]:
+        data = _new_profile_data(nickname, url)
+        if PROFILE_EXTRACT_MODE == "script":
             try:
-                img = driver.find_element(By.CSS_SELECTOR, sel)
-                src = img.get_attribute('src')
-                if src and ('avatar' in src or 'cloudfront.net' in src):
-                    data['IMAGE'] = src.replace('/thumbnail/', '/')
-                    break
-            except:
-                pass
+                _extract_profile_script(driver, data)
+            except WebDriverException as exc:
+                if DEBUG:
+                    log_msg(f"  ⚠️ Script extraction failed, using element lookups: {str(exc)[:60]}")
+                data = _new_profile_data(nickname, url)
+                _extract_profile_webdriver(driver, data)
+        else:
+            _extract_profile_webdriver(driver, data)
+        if data['STATUS'] == "Suspended":
+            return data
         
-        post_data = scrape_recent_post(driver, nickname)
-        if post_data.get('LPOST'):
-            data['LAST POST'] = post_data['LPOST']
-        if post_data.get('LDATE-TIME'):
-            data['LAST POST TIME'] = post_data['LDATE-TIME']
+        _apply_recent_post(data, scrape_recent_post(driver, nickname))
         
         log_msg(f"  ✅ Profile: {data['GENDER']}, {data['CITY']}, Posts: {data['POSTS']}")
         return data
@@ -995,12 +2739,444 @@ def scrape_profile(driver, nickname: str) -> dict | None:
         log_msg(f"  ❌ Error scraping {nickname}: {str(e)[:60]}")
         return None
 
+# ============================================================================
+# PROFILE CACHE
+# ============================================================================
+
+# Identity fields never expire
+PROFILE_CACHE_STATIC_FIELDS = {"NICK NAME", "PROFILE LINK", "SOURCE", "DATETIME SCRAP"}
+
+def _parse_duration(value: str) -> float:
+    """Parse '30s', '15m', '6h', '30d' (or plain seconds) into seconds"""
+    v = (value or "").strip().lower()
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    if v and v[-1] in units:
+        return float(v[:-1]) * units[v[-1]]
+    return float(v or 0)
+
+def _parse_ttl_spec(spec: str) -> dict:
+    ttl = {}
+    for part in (spec or "").split(","):
+        if "=" not in part:
+            continue
+        field, duration = part.split("=", 1)
+        try:
+            ttl[field.strip().upper()] = _parse_duration(duration)
+        except ValueError:
+            log_msg(f"⚠️ Ignoring bad profile TTL: {part.strip()}")
+    return ttl
+
+class ProfileCache:
+    """SQLite cache of scrape_profile() results with a TTL per field.
+
+    Rows are keyed by ``_normalize_profile_key(nick)``; every field carries
+    the time it was scraped, so POSTS can expire after hours while CITY
+    stays usable for weeks.
+    """
+
+    def __init__(self, path: str, ttl: dict | None = None, default_ttl: float = 6 * 3600):
+        self.path = path
+        self.ttl = ttl or {}
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS profiles ("
+            " key TEXT PRIMARY KEY, nickname TEXT, data TEXT NOT NULL, field_ts TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _field_ttl(self, field: str) -> float:
+        if field in PROFILE_CACHE_STATIC_FIELDS:
+            return float("inf")
+        return self.ttl.get(field, self.default_ttl)
+
+    def get(self, nickname: str, required: list[str] | tuple = ()) -> dict | None:
+        """Return the cached profile if every required field is fresh.
+
+        Stale optional fields are blanked rather than served.
+        """
+        key = _normalize_profile_key(nickname)
+        if not key:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, field_ts FROM profiles WHERE key = ?", (key,)
+            ).fetchone()
+            if not row:
+                self.misses += 1
+                return None
+
+            data = json.loads(row[0])
+            field_ts = json.loads(row[1])
+            now = time.time()
+            fresh = {f for f, ts in field_ts.items() if now - ts < self._field_ttl(f)}
+            if any(f not in fresh for f in required):
+                self.misses += 1
+                self.expired += 1
+                return None
+
+            self.hits += 1
+        for field in list(data):
+            if field not in fresh and field not in PROFILE_CACHE_STATIC_FIELDS:
+                data[field] = ""
+        return data
+
+    def put(self, nickname: str, data: dict):
+        key = _normalize_profile_key(nickname)
+        if not key or not data:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO profiles (key, nickname, data, field_ts) VALUES (?, ?, ?, ?)",
+                (key, nickname, json.dumps(data), json.dumps({f: now for f in data})),
+            )
+            self._conn.commit()
+
+    def summary(self) -> str:
+        return f"{self.hits} hits / {self.misses} misses ({self.expired} expired)"
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def open_profile_cache() -> ProfileCache | None:
+    if not PROFILE_CACHE_FILE or PROFILE_CACHE_FILE == "0":
+        return None
+    try:
+        return ProfileCache(
+            PROFILE_CACHE_FILE,
+            ttl=_parse_ttl_spec(PROFILE_CACHE_TTL),
+            default_ttl=_parse_duration(PROFILE_CACHE_TTL_DEFAULT),
+        )
+    except Exception as exc:
+        log_msg(f"⚠️ Profile cache unavailable: {str(exc)[:80]}")
+        return None
+
+def profile_cache_required() -> list[str]:
+    """DD_PROFILE_CACHE_FIELDS plus the fields the send path always needs fresh"""
+    fields = [f.strip().upper() for f in PROFILE_CACHE_REQUIRED.split(",") if f.strip()]
+    return fields + [f for f in PROFILE_CACHE_ALWAYS_REQUIRED if f not in fields]
+
+# ============================================================================
+# PREFETCH
+# ============================================================================
+
+class TargetPrefetcher:
+    """One-ahead, read-only prefetch of the next nick-mode target.
+
+    Runs on its own HTTP session in a single worker thread, so it never
+    touches the posting browser; sending stays strictly sequential.
+    Only used when every stage it covers (``STAGES_USED``) is on the HTTP backend.
+    """
+
+    STAGES_USED = ("profile", "recent_post", "open_post")
+
+    @classmethod
+    def enabled(cls) -> bool:
+        return PREFETCH and all(_use_http(stage) for stage in cls.STAGES_USED)
+
+    def __init__(self, profile_cache: ProfileCache | None = None, cache_required: list[str] | None = None):
+        self.profile_cache = profile_cache
+        self.cache_required = cache_required or []
+        self.fetcher = HttpFetcher(pool_size=2)
+        shared = get_http_fetcher()
+        if shared is not None:
+            self.fetcher.session.cookies.update(shared.session.cookies)
+            self.fetcher.session.headers.update(shared.session.headers)
+        self.max_pages = int(os.environ.get("DD_MAX_POST_PAGES", "4") or "4")
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self._futures: dict = {}
+        self.hits = 0
+        self.misses = 0
+        self.late = 0
+
+    def start(self, target: dict | None):
+        if not target or (target.get("mode") or "") == "url" or target["row"] in self._futures:
+            return
+        self._futures[target["row"]] = self._executor.submit(self._prefetch, target["nick_or_url"])
+
+    def take(self, target: dict) -> dict:
+        """Result for ``target`` (waits up to PREFETCH_WAIT); {} means fetch inline"""
+        future = self._futures.pop(target["row"], None)
+        if future is None:
+            return {}
+        try:
+            result = future.result(timeout=PREFETCH_WAIT)
+        except FutureTimeoutError:
+            # Slow site: don't hold the browser thread, the stages fetch inline instead
+            future.cancel()
+            self.late += 1
+            if DEBUG:
+                log_msg(f"  ⚠️ Prefetch not ready after {PREFETCH_WAIT:g}s, fetching inline")
+            result = {}
+        except Exception as exc:
+            if DEBUG:
+                log_msg(f"  ⚠️ Prefetch failed: {str(exc)[:60]}")
+            result = {}
+        if result.get("profile"):
+            self.hits += 1
+        else:
+            self.misses += 1
+        return result
+
+    def _prefetch(self, nickname: str) -> dict:
+        profile = None
+        from_cache = False
+        if self.profile_cache:
+            profile = self.profile_cache.get(nickname, self.cache_required)
+            from_cache = bool(profile)
+        if not profile:
+            profile = _scrape_profile_http(nickname, self.fetcher)
+        if profile.get("STATUS") == "Suspended":
+            return {"profile": profile, "open_post": None}
+
+        # One pass over the posts pages gives both LAST POST and the open post
+        open_post = None
+        current_url = f"{BASE_URL}/profile/public/{nickname}/"
+        for page_idx in range(1, self.max_pages + 1):
+            page_url, soup = self.fetcher.get_soup(current_url)
+            if page_idx == 1 and not from_cache:
+                _apply_recent_post(profile, _recent_post_from_soup(page_url, soup))
+            post_link, next_href, _count = _open_post_from_soup(page_url, soup)
+            if post_link or not next_href:
+                open_post = post_link or None
+                break
+            current_url = next_href
+
+        if not from_cache and self.profile_cache:
+            self.profile_cache.put(nickname, profile)
+        return {"profile": profile, "open_post": open_post}
+
+    def summary(self) -> str:
+        return f"{self.hits} prefetched / {self.misses} not ready ({self.late} timed out)"
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+# ============================================================================
+# PROFILES REFRESH
+# ============================================================================
+
+class RateLimiter:
+    """Spaces calls from all threads at least 1/rate seconds apart (rate <= 0 disables)"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+        self.waited = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+            self.waited += slot - now
+        if slot > now:
+            time.sleep(slot - now)
+
+class ProfileRefreshPool:
+    """N read-only HTTP workers (one session each) behind a shared RateLimiter"""
+
+    def __init__(self, workers: int = PROFILE_WORKERS, rate: float = PROFILE_RATE):
+        self.workers = max(1, workers)
+        self.limiter = RateLimiter(rate)
+        self.seed = get_http_fetcher()
+        self._local = threading.local()
+        self._fetchers: list[HttpFetcher] = []
+        self._fetchers_lock = threading.Lock()
+
+    def prepare(self, probe_nick: str) -> bool:
+        """Check once that profile pages load with the seed session before any worker starts.
+
+        A redirect to the login page (no or stale COOKIE_FILE) triggers one Chrome login
+        whose cookies seed every worker and are saved to COOKIE_FILE; False if that fails.
+        """
+        self.limiter.wait()
+        try:
+            self.seed.get_soup(f"{BASE_URL}/users/{probe_nick}/")
+            return True
+        except HttpFetchError as exc:
+            if "not logged in" not in str(exc):
+                return True  # page-level failure: the workers report it per nick
+
+        log_msg(f"🔐 {COOKIE_FILE} has no logged-in session, logging in once through Chrome")
+        driver, error = start_browser_session()
+        try:
+            if error:
+                log_msg(f"❌ {error}: profile pages need a logged-in session, refresh aborted")
+                return False
+            save_cookies(driver)
+        finally:
+            if driver is not None:
+                driver.quit()
+                release_chrome_profile()
+        return True
+
+    def _fetcher(self) -> HttpFetcher:
+        fetcher = getattr(self._local, "fetcher", None)
+        if fetcher is None:
+            fetcher = HttpFetcher(pool_size=2)
+            fetcher.session.cookies.update(self.seed.session.cookies)
+            fetcher.session.headers.update(self.seed.session.headers)
+            self._local.fetcher = fetcher
+            with self._fetchers_lock:
+                self._fetchers.append(fetcher)
+        return fetcher
+
+    def refresh(self, nickname: str) -> dict:
+        """Profile + last post for one nick; raises HttpFetchError on failure"""
+        fetcher = self._fetcher()
+        self.limiter.wait()
+        with span("refresh_profile"):
+            data = _scrape_profile_http(nickname, fetcher)
+        data["SOURCE"] = "Refresh"
+        if data["STATUS"] != "Suspended" and data.get("POSTS", "0") not in {"", "0"}:
+            self.limiter.wait()
+            with span("refresh_recent_post"):
+                page_url, soup = fetcher.get_soup(f"{BASE_URL}/profile/public/{nickname}/")
+            _apply_recent_post(data, _recent_post_from_soup(page_url, soup))
+        return data
+
+    def run(self, nicknames: list[str]):
+        """Yield (nick, profile | None, error) as workers finish; stops early on shutdown"""
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="refresh")
+        try:
+            futures = {executor.submit(self.refresh, nick): nick for nick in nicknames}
+            for future in as_completed(futures):
+                nick = futures[future]
+                try:
+                    yield nick, future.result(), ""
+                except Exception as exc:
+                    yield nick, None, str(exc)[:80]
+                if should_exit:
+                    break
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> tuple[int, int]:
+        with self._fetchers_lock:
+            return sum(f.requests for f in self._fetchers), sum(f.bytes for f in self._fetchers)
+
+def refresh_nicknames(cli_nicks: list[str], nicks_file: str) -> list[str]:
+    """Nicks from --nick/--nicks-file/DD_REFRESH_NICKS, else every nick in the Profiles tab"""
+    nicks = []
+    for value in cli_nicks or []:
+        nicks.extend(value.split(","))
+    if nicks_file:
+        with open(nicks_file, encoding="utf-8") as f:
+            nicks.extend(f.read().splitlines())
+    if not nicks:
+        nicks = os.environ.get("DD_REFRESH_NICKS", "").split(",")
+    nicks = [n.strip() for n in nicks if n.strip() and not n.strip().startswith("#")]
+    if not nicks and PROFILES_SHEET_ID:
+        try:
+            rows = retry_gspread_call(_get_profiles_worksheet().get, "B2:B")
+            nicks = [(r[0] if r else "").strip() for r in rows]
+            nicks = [n for n in nicks if n and not _looks_like_url(n)]
+        except Exception as exc:
+            log_msg(f"⚠️ Profiles nick list unavailable: {str(exc)[:60]}")
+
+    seen: set = set()
+    unique = []
+    for nick in nicks:
+        key = nick.lower()
+        if key not in seen:
+            seen.add(key)
+            unique.append(nick)
+    return unique
+
+def run_profiles_refresh(cli_nicks: list[str] | None = None, nicks_file: str = ""):
+    """Refresh ProfilesData rows for a list of nicks without touching MsgList or the browser"""
+    console.print("\n" + "="*70)
+    console.print(f" [bold green]DamaDam Profiles Refresh V{VERSION}[/bold green]")
+    console.print("="*70)
+
+    if not FAKE_SHEETS and not os.path.exists(CREDENTIALS_FILE):
+        log_msg(f" {CREDENTIALS_FILE} not found!")
+        return
+    if requests is None or BeautifulSoup is None:
+        log_msg("❌ Profiles refresh needs requests and beautifulsoup4 (pip install -r requirements.txt)")
+        return
+    if not PROFILES_SHEET_ID:
+        log_msg("❌ DD_PROFILES_SHEET_ID is not set")
+        return
+
+    nicknames = refresh_nicknames(cli_nicks or [], nicks_file)
+    if not nicknames:
+        log_msg("⚠️ No nicks to refresh")
+        return
+
+    writer = ProfilesDataWriter(get_or_create_profiles_data_sheet())
+    profile_cache = open_profile_cache()
+    pool = ProfileRefreshPool()
+    if not pool.prepare(nicknames[0]):
+        if profile_cache:
+            profile_cache.close()
+        return
+    rate = f"{PROFILE_RATE:g} req/s" if PROFILE_RATE > 0 else "no rate limit"
+    log_msg(f"🔄 Refreshing {len(nicknames)} profiles with {pool.workers} workers ({rate})")
+
+    started = time.time()
+    done = failed = suspended = 0
+    try:
+        for nick, data, error in pool.run(nicknames):
+            if data is None:
+                failed += 1
+                log_msg(f"  ❌ {nick}: {error}")
+                continue
+            if profile_cache:
+                profile_cache.put(nick, data)
+            try:
+                writer.add(data)
+            except Exception as exc:
+                log_msg(f"  ⚠️ {PROFILES_DATA_TAB} flush failed: {str(exc)[:60]}")
+            done += 1
+            if data.get("STATUS") == "Suspended":
+                suspended += 1
+            log_msg(f"  ✅ [{done + failed}/{len(nicknames)}] {nick}: {data.get('CITY', '')}, Posts: {data.get('POSTS', '')}")
+    finally:
+        try:
+            writer.flush()
+        except Exception as exc:
+            log_msg(f"❌ {PROFILES_DATA_TAB} final flush failed: {str(exc)[:60]}")
+        if profile_cache:
+            profile_cache.close()
+
+    elapsed = max(time.time() - started, 0.001)
+    http_requests, http_bytes = pool.stats()
+    console.print("\n" + "="*70)
+    log_msg(
+        f"📊 Refreshed {done}/{len(nicknames)} profiles ({failed} failed, {suspended} suspended)"
+        f" in {elapsed:.1f}s ({done / elapsed:.2f}/s)"
+    )
+    log_msg(
+        f"   🌐 HTTP: {http_requests} requests, {http_bytes / 1024:.0f} KiB,"
+        f" {pool.limiter.waited:.1f}s queued by the rate limit"
+    )
+    log_msg(
+        f"   💾 {PROFILES_DATA_TAB}: {writer.updated} updated in place, {writer.appended} appended,"
+        f" {SHEETS.total()} Sheets API calls"
+    )
+    log_span_summary()
+    write_run_profile({
+        "mode": "profiles", "targets": len(nicknames), "success": done, "failed": failed,
+        **sheets_run_stats(), "stopped_early": should_exit,
+    })
+
 # ============================================================================
 # MAIN PROCESS
 # ============================================================================
 
-def write_profile_to_sheet(sheet, row_num, profile_data, tags_mapping=None):
-    """Write normalized profile data to ProfilesData sheet"""
+def _profile_row_values(profile_data, tags_mapping=None) -> list:
+    """Normalize one profile into the 20 ProfilesData column values"""
     tags_mapping = tags_mapping or {}
     cleaned = dict(profile_data)
 
@@ -1016,23 +3192,336 @@ def write_profile_to_sheet(sheet, row_num, profile_data, tags_mapping=None):
     if nickname_key and not cleaned.get("TAGS") and nickname_key in tags_mapping:
         cleaned["TAGS"] = tags_mapping[nickname_key]
 
-    columns = [
-        "IMAGE", "NICK NAME", "TAGS", "LAST POST", "LAST POST TIME", "FRIEND", "CITY",
-        "GENDER", "MARRIED", "AGE", "JOINED", "FOLLOWERS", "STATUS", "POSTS",
-        "PROFILE LINK", "INTRO", "SOURCE", "DATETIME SCRAP", "POST MSG", "POST LINK"
-    ]
-
     raw_passthrough = {"IMAGE", "LAST POST", "PROFILE LINK", "POST LINK"}
 
     row_values = []
-    for col_name in columns:
+    for col_name in PROFILES_DATA_COLUMNS:
         value = cleaned.get(col_name, "")
         if col_name in raw_passthrough:
             row_values.append(value or "")
         else:
             row_values.append(clean_text(value))
+    return row_values
+
+PROFILE_LINK_COL = PROFILES_DATA_COLUMNS.index("PROFILE LINK") + 1
+
+def _profile_link_key(link: str) -> str:
+    return (link or "").strip().rstrip("/").lower()
+
+class ProfilesDataWriter:
+    """Batched upsert into ProfilesData keyed on PROFILE LINK.
+
+    Existing rows are updated in place with one ``batch_update`` per flush and
+    new profiles are added with one ``append_rows``, so refreshing N profiles
+    costs one read plus two writes per ``batch_size`` profiles.
+    """
+
+    def __init__(self, sheet, tags_mapping=None, batch_size: int = PROFILES_BATCH_SIZE):
+        self.sheet = sheet
+        self.tags_mapping = tags_mapping or {}
+        self.batch_size = max(1, batch_size)
+        self.row_by_link: dict[str, int] = {}
+        self.pending_updates: dict[int, list] = {}
+        self.pending_appends: dict[str, list] = {}
+        self.updated = 0
+        self.appended = 0
+        self._load_index()
+
+    def _load_index(self):
+        col = _col_letter(PROFILE_LINK_COL)
+        links = retry_gspread_call(self.sheet.get, f"{col}2:{col}")
+        for offset, r in enumerate(links):
+            key = _profile_link_key(r[0] if r else "")
+            # Older runs inserted newest rows on top; keep the topmost copy
+            if key and key not in self.row_by_link:
+                self.row_by_link[key] = offset + 2
+
+    def add(self, profile_data):
+        values = _profile_row_values(profile_data, self.tags_mapping)
+        key = _profile_link_key(values[PROFILE_LINK_COL - 1])
+        row = self.row_by_link.get(key) if key else None
+        if row:
+            self.pending_updates[row] = values
+        else:
+            self.pending_appends[key or f"#{len(self.pending_appends)}"] = values
+        if len(self.pending_updates) + len(self.pending_appends) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write buffered rows; returns how many were written"""
+        updates, self.pending_updates = self.pending_updates, {}
+        appends, self.pending_appends = self.pending_appends, {}
+        last_col = _col_letter(len(PROFILES_DATA_COLUMNS))
+        if updates:
+            data = [{"range": f"A{row}:{last_col}{row}", "values": [values]} for row, values in sorted(updates.items())]
+            try:
+                with span("sheet_write.profiles_data"):
+                    retry_gspread_call(self.sheet.batch_update, data, value_input_option="USER_ENTERED")
+            except Exception:
+                self.pending_updates = {**updates, **self.pending_updates}
+                self.pending_appends = {**appends, **self.pending_appends}
+                raise
+            self.updated += len(updates)
+        if appends:
+            try:
+                with span("sheet_write.profiles_data"):
+                    resp = retry_gspread_call(
+                        self.sheet.append_rows, list(appends.values()),
+                        value_input_option="USER_ENTERED", table_range=f"A1:{last_col}1",
+                    )
+            except Exception:
+                self.pending_appends = {**appends, **self.pending_appends}
+                raise
+            self.appended += len(appends)
+            first_row = self._appended_first_row(resp)
+            if first_row:
+                for offset, key in enumerate(appends):
+                    if not key.startswith("#"):
+                        self.row_by_link[key] = first_row + offset
+        if DEBUG and (updates or appends):
+            log_msg(f"💾 {PROFILES_DATA_TAB} flush: {len(updates)} updated, {len(appends)} appended")
+        return len(updates) + len(appends)
+
+    @staticmethod
+    def _appended_first_row(resp) -> int:
+        """First row number from an append response (``updates.updatedRange``), 0 if unknown"""
+        try:
+            updated_range = resp["updates"]["updatedRange"]
+            match = re.search(r"![A-Z]+(\d+)", updated_range)
+            return int(match.group(1)) if match else 0
+        except Exception:
+            return 0
+
+def record_send_result(sheet_writer, row: int, result: dict) -> tuple[bool, str]:
+    """Write STATUS/NOTES/RESULT URL for a send; returns (success, Run History status or "")"""
+    if "Posted" in result['status']:
+        log_msg(f"  ✅ SUCCESS!")
+        clean_result_url = clean_url(result['link'])
+        log_msg(f"  🔗 Success URL: {clean_result_url}")
+        sheet_writer.set(row, 8, "Done")
+        sheet_writer.set(row, 9, f"Posted @ {get_pkt_time().strftime('%I:%M %p')}")
+        sheet_writer.set(row, 10, clean_result_url)  # RESULT URL
+        return True, "Done"
+    if "verification" in result['status'].lower():
+        log_msg(f"  ⚠️ Needs manual verification")
+        clean_result_url = clean_url(result['link'])
+        log_msg(f"  🔗 Check URL: {clean_result_url}")
+        sheet_writer.set(row, 8, "Done")
+        sheet_writer.set(row, 9, f"Check manually @ {get_pkt_time().strftime('%I:%M %p')}")
+        sheet_writer.set(row, 10, clean_result_url)  # RESULT URL
+        return True, ""
+    log_msg(f"  ❌ FAILED: {result['status']}")
+    sheet_writer.set(row, 8, "Failed")
+    sheet_writer.set(row, 9, result['status'])
+    if result['link']:
+        clean_result_url = clean_url(result['link'])
+        sheet_writer.set(row, 10, clean_result_url)  # RESULT URL
+    return False, result['status']
+
+def comment_already_posted(driver, post_url: str, message: str) -> bool:
+    """One reload of ``post_url`` looking for our comment (resume after an interrupted send)"""
+    try:
+        return _comment_present(driver, post_url, _normalize_comment_text(message), reload=True)
+    except Exception as exc:
+        if DEBUG:
+            log_msg(f"  ⚠️ Resume check failed: {str(exc)[:60]}")
+        return False
+
+def send_history_entry(mode: str, target: str, name: str, status: str, result: dict, message: str) -> dict:
+    return {
+        "run_ts": get_pkt_time().strftime("%Y-%m-%d %H:%M:%S"),
+        "mode": mode,
+        "target": target,
+        "name": name,
+        "status": status,
+        "result_url": clean_url(result.get('link') or ""),
+        "message": message,
+    }
+
+def run_history_row(run_id: str, r: dict, processed: int, success: int, failed: int) -> list[str]:
+    return [
+        run_id,
+        r.get("run_ts", ""),
+        r.get("mode", ""),
+        r.get("target", ""),
+        r.get("name", ""),
+        r.get("status", ""),
+        r.get("result_url", ""),
+        r.get("message", ""),
+        str(processed),
+        str(success),
+        str(failed),
+        str(SHEETS.total()),
+        f"{r['target_secs']:.2f}" if "target_secs" in r else "",
+        f"{r['send_secs']:.2f}" if r.get("send_secs") else "",
+        f"{r['target_p50']:.2f}" if "target_p50" in r else "",
+        f"{r['target_p95']:.2f}" if "target_p95" in r else "",
+    ]
+
+def max_profiles_limit() -> int:
+    """--max-profiles, else DD_MAX_PROFILES / DD_BATCH_SIZE (0 = no limit)"""
+    args = argparse.ArgumentParser(add_help=False)
+    args.add_argument("--max-profiles", type=int, default=None)
+    max_profiles = args.parse_known_args()[0].max_profiles
+    if max_profiles is None:
+        max_profiles = int(os.environ.get("DD_MAX_PROFILES", os.environ.get("DD_BATCH_SIZE", "0")) or "0")
+    return max_profiles
+
+def start_browser_session():
+    """Launch Chrome and log in; returns (driver, error), error "" on success"""
+    with span("browser_start"):
+        driver = setup_browser()
+    if not driver:
+        return None, "Browser setup failed"
+    try:
+        with span("login"):
+            logged_in = ensure_session(driver)
+        if logged_in:
+            sync_http_session(driver)
+    except Exception as exc:
+        # A dead renderer mid-login must not leave Chrome (and its profile lock) behind
+        log_msg(f"❌ Login error: {str(exc)[:80]}")
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        release_chrome_profile()
+        return None, "Login failed"
+    if not logged_in:
+        return driver, "Login failed"
+    return driver, ""
+
+def timed_profiles_lookup() -> dict:
+    with span("profile_lookup"):
+        return load_profiles_lookup()
+
+# ============================================================================
+# RUN PLAN
+# ============================================================================
+
+# Seconds per stage when there is no earlier run profile to learn from
+PLAN_DEFAULT_SECS = {"login": 10.0, "scrape_profile": 3.0, "find_open_post": 4.0, "send": 12.0}
+
+def _plan_stage_secs() -> tuple[dict, str]:
+    """p50 per stage from the last run profile (RUN_PROFILE_FILE), else PLAN_DEFAULT_SECS"""
+    secs = dict(PLAN_DEFAULT_SECS)
+    try:
+        with open(RUN_PROFILE_FILE, encoding="utf-8") as f:
+            stages = json.load(f).get("stages", {})
+    except Exception:
+        return secs, "defaults"
+    learned = [name for name in secs if stages.get(name, {}).get("count")]
+    for name in learned:
+        secs[name] = float(stages[name]["p50"])
+    return secs, f"{RUN_PROFILE_FILE} p50s" if learned else "defaults"
+
+def _plan_message(target: dict, profile: dict | None, profiles_lookup: dict) -> str:
+    """Render a target's MESSAGE from the values main() would use.
+
+    ``profile`` is the checkpointed or cached profile (None when a scrape is needed);
+    fields only that scrape can fill are shown as ``[field?]`` instead of guessed.
+    """
+    city, posts, followers = target["city"], target["posts"], target["followers"]
+    key = ((target["name"] if target["mode"] == "url" else target["nick_or_url"]) or "").strip().lower()
+    pdata = profiles_lookup.get(key) or profiles_lookup.get(_normalize_profile_key(key))
+    if pdata:
+        city = clean_text(pdata.get("CITY", "")) or city
+        posts = clean_text(pdata.get("POSTS", "")) or posts
+        followers = clean_text(pdata.get("FOLLOWERS", "")) or followers
+
+    if target["mode"] == "url":
+        name = target["name"] or "Unknown"
+        data = {"NAME": name, "NICK NAME": name, "CITY": city, "POSTS": posts,
+                "FOLLOWERS": followers, "STATUS": "URL Mode"}
+    elif profile is None:
+        data = {k: f"[{k.lower()}?]" for keys, _ in TEMPLATE_FIELDS.values() for k in keys}
+    else:
+        data = dict(profile)
+    if target["mode"] != "url":
+        for field, value in (("CITY", city), ("POSTS", posts), ("FOLLOWERS", followers)):
+            if value:
+                data[field] = value
+    return compile_template(target["message"]).render(data)
+
+def plan_run():
+    """Print pending targets and an estimated cost; no browser, no sheet writes"""
+    console.print("\n" + "="*70)
+    console.print(f" [bold green]DamaDam Message Bot V{VERSION} - Plan[/bold green]")
+    console.print("="*70)
+
+    if not FAKE_SHEETS and not os.path.exists(CREDENTIALS_FILE):
+        log_msg(f" {CREDENTIALS_FILE} not found!")
+        return
+    try:
+        msglist_sheet = _get_worksheet(SHEET_ID, "MsgList")
+    except WorksheetNotFound:
+        log_msg("⚠️ No MsgList tab yet (a normal run creates it)")
+        return
+    targets = scan_pending_targets(msglist_sheet, save_cursor=False)
+    max_profiles = max_profiles_limit()
+    if max_profiles > 0:
+        targets = targets[:max_profiles]
+    if not targets:
+        log_msg("⚠️ No pending targets found; a run would exit before starting Chrome")
+        return
 
-    insert_row_with_retry(sheet, row_values, row_num)
+    profiles_lookup = load_profiles_lookup()
+    profile_cache = open_profile_cache() if any(t["mode"] != "url" for t in targets) else None
+    cache_required = profile_cache_required()
+    checkpoint = RunCheckpoint()
+    stage_secs, source = _plan_stage_secs()
+    counts = {"scrape_profile": 0, "find_open_post": 0, "send": 0}
+    bad = 0
+
+    table = Table(title=f"Pending targets ({len(targets)})")
+    for col in ("row", "mode", "target", "name", "profile", "message"):
+        table.add_column(col)
+    for t in targets:
+        nick = t["nick_or_url"]
+        try:
+            compile_template(t["message"])
+        except TemplateError as exc:
+            bad += 1
+            table.add_row(str(t["row"]), t["mode"], nick, t["name"], "-", escape(f"❌ {exc}"))
+            continue
+        saved = checkpoint.get(t["row"], nick)
+        cached = None
+        if saved.get("result"):
+            profile = "already sent (restored)"
+        elif t["mode"] == "url":
+            profile = "-"
+            counts["send"] += 1
+        else:
+            if saved.get("profile"):
+                profile = "checkpoint"
+            elif profile_cache and (cached := profile_cache.get(nick, cache_required)):
+                profile = "cache"
+            else:
+                profile = "scrape"
+                counts["scrape_profile"] += 1
+            if not saved.get("post_url"):
+                counts["find_open_post"] += 1
+            counts["send"] += 1
+        if saved.get("result"):
+            message = saved["result"].get("msg") or ""
+        else:
+            message = _plan_message(t, saved.get("profile") or cached, profiles_lookup)
+        table.add_row(str(t["row"]), t["mode"], nick, t["name"], profile, escape(message[:60]))
+    console.print(table)
+    if profile_cache:
+        profile_cache.close()
+
+    est = sum(stage_secs[stage] * n for stage, n in counts.items())
+    if counts["send"]:
+        est += stage_secs["login"]
+    writes = 2 * math.ceil(len(targets) / max(1, MSGLIST_FLUSH_EVERY))
+    log_msg(f"📋 {len(targets) - bad} to send, {bad} with a bad template (failed without a browser visit)")
+    log_msg(
+        f"🔍 {counts['scrape_profile']} profile scrapes, {counts['find_open_post']} open-post searches,"
+        f" {counts['send']} sends"
+    )
+    log_msg(f"⏱️ Estimated ~{est / 60:.1f} min (login + stages at {source})")
+    log_msg(f"📊 Sheets API: {SHEETS.total()} reads for this plan, ~{writes} writes for the run")
 
 # DO NOT MODIFY - Main orchestration and MODE logic
 # Changing this will break the entire bot flow and targeting system
@@ -1043,83 +3532,106 @@ def main():
     console.print("="*70)
     
     # Check credentials
-    if not os.path.exists(CREDENTIALS_FILE):
+    if not FAKE_SHEETS and not os.path.exists(CREDENTIALS_FILE):
         log_msg(f" {CREDENTIALS_FILE} not found!")
         log_msg(f" Please create {CREDENTIALS_FILE} with your Google credentials")
         return
     
-    driver = setup_browser()
-    if not driver:
-        log_msg("❌ Browser setup failed")
-        return
-    
+    driver = None
+    sheet_writer = None
+    profile_cache = None
+    prefetcher = None
+    browser_future = None
+    run_stats = {"targets": 0, "processed": 0, "success": 0, "failed": 0}
+    started = time.perf_counter()
     try:
-        # LOGIN
-        console.print("[blue]🔐 Logging in...[/blue]")
-        if not login(driver):
-            log_msg("❌ Login failed")
-            return
-        
-        # CONNECT TO SHEETS
+        # CONNECT TO SHEETS (before Chrome: most scheduled runs have nothing to do)
         console.print("[blue]📊 Connecting to Google Sheets...[/blue]")
-        msglist_sheet = get_or_create_msglist_sheet()
+        with span("sheet_load"):
+            msglist_sheet = get_or_create_msglist_sheet()
+        run_journal = RunJournal()
+        if run_journal.replayed:
+            log_msg(f"♻️ Replaying {run_journal.replayed} Run History rows from an earlier run")
+        run_checkpoint = RunCheckpoint()
+        if len(run_checkpoint):
+            log_msg(f"♻️ Checkpoint: {len(run_checkpoint)} unfinished rows from an earlier run")
+        sheet_writer = SheetWriter(MsgListWriteBuffer(msglist_sheet, on_flush=run_checkpoint.rows_flushed), run_journal)
         log_msg("✅ MsgList connected\n")
         
         # GET PENDING TARGETS
-        global GSHEET_API_CALLS
-        GSHEET_API_CALLS += 1
-        msglist_rows = msglist_sheet.get_all_values()
-        pending_targets = []
-        
-        for i in range(1, len(msglist_rows)):
-            row = msglist_rows[i]
-            if len(row) > 7:  # Ensure we have enough columns
-                mode = row[0].strip().lower() if len(row) > 0 else ""
-                nick_or_url, name = _pick_target_and_name(mode, row)
-                city = row[3].strip() if len(row) > 3 else ""
-                posts = row[4].strip() if len(row) > 4 else ""
-                followers = row[5].strip() if len(row) > 5 else ""
-                message = row[6].strip() if len(row) > 6 else ""
-                status = row[7].strip().lower() if len(row) > 7 else ""
-                
-                if nick_or_url and status == "pending":
-                    pending_targets.append({
-                        'row': i + 1,
-                        'mode': mode,
-                        'name': name,
-                        'nick_or_url': nick_or_url,
-                        'city': city,
-                        'posts': posts,
-                        'followers': followers,
-                        'message': message
-                    })
+        with span("sheet_load"):
+            pending_targets = scan_pending_targets(msglist_sheet)
+        run_stats["targets"] = len(pending_targets)
         
         if not pending_targets:
             log_msg("⚠️ No pending targets found")
             return
 
-        args = argparse.ArgumentParser(add_help=False)
-        args.add_argument("--max-profiles", type=int, default=None)
-        parsed = args.parse_known_args()[0]
-        max_profiles = parsed.max_profiles
-        if max_profiles is None:
-            max_profiles = int(os.environ.get("DD_MAX_PROFILES", os.environ.get("DD_BATCH_SIZE", "0")) or "0")
+        max_profiles = max_profiles_limit()
         if max_profiles > 0:
             pending_targets = pending_targets[:max_profiles]
 
-        profiles_lookup: dict = {}
-        if any((t.get("mode") or "") != "url" for t in pending_targets):
-            profiles_lookup = load_profiles_lookup()
-        
         console.print(f"[magenta]📋 Found {len(pending_targets)} pending targets[/magenta]\n")
         console.print("="*70)
         
+        run_rows: list[dict] = []
+        run_id = get_pkt_time().strftime("%Y-%m-%d %H:%M:%S")
+
+        # Bad MESSAGE templates fail their row here, before any browser work is spent on them
+        bad_templates = 0
+        valid_targets = []
+        for target in pending_targets:
+            try:
+                compile_template(target['message'])
+            except TemplateError as exc:
+                bad_templates += 1
+                log_msg(f"❌ Row {target['row']} ({target['nick_or_url']}): bad template, {exc}")
+                sheet_writer.set(target['row'], 8, "Failed")
+                sheet_writer.set(target['row'], 9, f"Bad template: {exc}"[:100])
+                entry = send_history_entry(
+                    target['mode'], target['nick_or_url'], target['name'], "Bad template", {}, target['message']
+                )
+                run_rows.append(entry)
+                sheet_writer.record_run_history(run_history_row(run_id, entry, 0, 0, 0))
+                continue
+            valid_targets.append(target)
+        journaled_rows = len(run_rows)
+        pending_targets = valid_targets
+        if not pending_targets:
+            log_msg("⚠️ No pending targets with a usable template")
+            return
+
+        # BROWSER & LOGIN (only now that there is work to do), overlapped with the Profiles lookup
+        console.print("[blue]🔐 Starting browser and logging in...[/blue]")
+        startup_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="startup")
+        browser_future = startup_pool.submit(start_browser_session)
+        lookup_future = None
+        if any((t.get("mode") or "") != "url" for t in pending_targets):
+            lookup_future = startup_pool.submit(timed_profiles_lookup)
+            profile_cache = open_profile_cache()
+        startup_pool.shutdown(wait=False)
+        cache_required = profile_cache_required()
+        profiles_lookup: dict = lookup_future.result() if lookup_future else {}
+        driver, browser_error = browser_future.result()
+        run_stats["startup_secs"] = round(time.perf_counter() - started, 3)
+        if browser_error:
+            log_msg(f"❌ {browser_error}")
+            return
+
+        if TargetPrefetcher.enabled():
+            prefetcher = TargetPrefetcher(profile_cache, cache_required)
+
         # PROCESS EACH TARGET
         success_count = 0
         failed_count = 0
-        run_rows: list[dict] = []
         
         for idx, target in enumerate(pending_targets, 1):
+            if should_exit:
+                log_msg(f"🛑 Stop requested; {len(pending_targets) - idx + 1} targets left pending")
+                break
+            if idx == 1:
+                run_stats["time_to_first_target"] = round(time.perf_counter() - started, 3)
+                record_span("time_to_first_target", run_stats["time_to_first_target"])
             mode = target['mode']
             name = target['name']
             nick_or_url = target['nick_or_url']
@@ -1131,11 +3643,34 @@ def main():
             
             console.print("\n" + "-"*70)
             log_msg(f"[{idx}/{len(pending_targets)}] 👤 Processing: {name}")
+            clear_page_snapshots()
+            prefetched = {}
+            if prefetcher:
+                prefetched = prefetcher.take(target) if idx > 1 else {}
+                prefetcher.start(pending_targets[idx] if idx < len(pending_targets) else None)
             console.print("-"*70)
             
+            stopped = False
+            target_started = time.perf_counter()
+            send_secs = 0.0
             try:
                 post_url = None
                 profile_data = {}
+                checkpoint = run_checkpoint.get(msglist_row, nick_or_url)
+
+                if checkpoint.get("result"):
+                    # Sent by an earlier run that died before the sheet caught up: restore, never resend
+                    log_msg(f"  ♻️ Already sent in an earlier run ({checkpoint['result']['status']}), restoring result")
+                    ok, history_status = record_send_result(sheet_writer, msglist_row, checkpoint["result"])
+                    if history_status:
+                        run_rows.append(send_history_entry(
+                            mode, nick_or_url, name, history_status, checkpoint["result"], checkpoint.get("message", "")
+                        ))
+                    if ok:
+                        success_count += 1
+                    else:
+                        failed_count += 1
+                    continue
                 
                 # STEP 1: Handle based on MODE
                 if mode == "url":
@@ -1156,18 +3691,15 @@ def main():
                         updated_fields: list[str] = []
                         if pdata_city and clean_text(city) != pdata_city:
                             city = pdata_city
-                            with sheet_lock:
-                                update_cell_with_retry(msglist_sheet, msglist_row, 4, city)
+                            sheet_writer.set(msglist_row, 4, city)
                             updated_fields.append("city")
                         if pdata_posts and clean_text(posts) != pdata_posts:
                             posts = pdata_posts
-                            with sheet_lock:
-                                update_cell_with_retry(msglist_sheet, msglist_row, 5, posts)
+                            sheet_writer.set(msglist_row, 5, posts)
                             updated_fields.append("posts")
                         if pdata_followers and clean_text(followers) != pdata_followers:
                             followers = pdata_followers
-                            with sheet_lock:
-                                update_cell_with_retry(msglist_sheet, msglist_row, 6, followers)
+                            sheet_writer.set(msglist_row, 6, followers)
                             updated_fields.append("followers")
 
                         if updated_fields:
@@ -1198,18 +3730,15 @@ def main():
 
                         if pdata_city and clean_text(city) != pdata_city:
                             city = pdata_city
-                            with sheet_lock:
-                                update_cell_with_retry(msglist_sheet, msglist_row, 4, city)
+                            sheet_writer.set(msglist_row, 4, city)
                             updated_fields.append("city")
                         if pdata_posts and clean_text(posts) != pdata_posts:
                             posts = pdata_posts
-                            with sheet_lock:
-                                update_cell_with_retry(msglist_sheet, msglist_row, 5, posts)
+                            sheet_writer.set(msglist_row, 5, posts)
                             updated_fields.append("posts")
                         if pdata_followers and clean_text(followers) != pdata_followers:
                             followers = pdata_followers
-                            with sheet_lock:
-                                update_cell_with_retry(msglist_sheet, msglist_row, 6, followers)
+                            sheet_writer.set(msglist_row, 6, followers)
                             updated_fields.append("followers")
 
                         if updated_fields:
@@ -1219,17 +3748,35 @@ def main():
                         elif DEBUG:
                             log_msg("  📌 Profiles match found (no changes)")
 
-                    # Nick mode - scrape profile first
-                    if not DEBUG:
-                        log_msg(f"  🔍 Scraping profile: {nick_or_url}")
-                    profile_data = scrape_profile(driver, nick_or_url)
+                    # Nick mode - scrape profile first (unless checkpointed, prefetched or the local cache is fresh)
+                    profile_data = checkpoint.get("profile") or prefetched.get("profile")
+                    if checkpoint.get("profile"):
+                        log_msg(f"  ♻️ Profile from checkpoint: {profile_data.get('CITY', '')}, Posts: {profile_data.get('POSTS', '')}")
+                    elif profile_data:
+                        log_msg(f"  ⚡ Profile prefetched: {profile_data.get('CITY', '')}, Posts: {profile_data.get('POSTS', '')}")
+                    elif profile_cache:
+                        profile_data = profile_cache.get(nick_or_url, cache_required)
+                        if profile_data:
+                            log_msg(f"  🗃️ Profile from cache: {profile_data.get('CITY', '')}, Posts: {profile_data.get('POSTS', '')}")
+                    if not profile_data:
+                        if not DEBUG:
+                            log_msg(f"  🔍 Scraping profile: {nick_or_url}")
+                        with span("scrape_profile"):
+                            profile_data = scrape_profile(driver, nick_or_url)
+                        if profile_data and profile_cache:
+                            profile_cache.put(nick_or_url, profile_data)
                     if not profile_data:
                         log_msg(f"  ❌ Failed to scrape profile")
-                        with sheet_lock:
-                            update_cell_with_retry(msglist_sheet, msglist_row, 8, "Failed")
-                            update_cell_with_retry(msglist_sheet, msglist_row, 9, "Profile scrape failed")
+                        sheet_writer.set(msglist_row, 8, "Failed")
+                        sheet_writer.set(msglist_row, 9, "Profile scrape failed")
                         failed_count += 1
                         continue
+                    if not checkpoint.get("profile"):
+                        run_checkpoint.mark(msglist_row, nick_or_url, "profile", profile=profile_data)
+                    if should_exit:
+                        stopped = True
+                        log_msg("  🛑 Stop requested after profile; resuming here next run")
+                        break
 
                     # Ensure template placeholders use the best-known values (Profiles sheet may be more complete
                     # than scraped values, and scraped values may fill missing Profiles data)
@@ -1245,106 +3792,98 @@ def main():
                     scraped_city = clean_text(profile_data.get("CITY", ""))
                     scraped_posts = clean_text(profile_data.get("POSTS", ""))
                     scraped_followers = clean_text(profile_data.get("FOLLOWERS", ""))
-                    with sheet_lock:
-                        if not city and scraped_city:
-                            update_cell_with_retry(msglist_sheet, msglist_row, 4, scraped_city)
-                            city = scraped_city
-                        if not posts and scraped_posts:
-                            update_cell_with_retry(msglist_sheet, msglist_row, 5, scraped_posts)
-                            posts = scraped_posts
-                        if not followers and scraped_followers:
-                            update_cell_with_retry(msglist_sheet, msglist_row, 6, scraped_followers)
-                            followers = scraped_followers
+                    if not city and scraped_city:
+                        sheet_writer.set(msglist_row, 4, scraped_city)
+                        city = scraped_city
+                    if not posts and scraped_posts:
+                        sheet_writer.set(msglist_row, 5, scraped_posts)
+                        posts = scraped_posts
+                    if not followers and scraped_followers:
+                        sheet_writer.set(msglist_row, 6, scraped_followers)
+                        followers = scraped_followers
                     
                     # Check if suspended
                     if profile_data.get('STATUS') == 'Suspended':
                         log_msg(f"  ⚠️ Account suspended")
-                        with sheet_lock:
-                            update_cell_with_retry(msglist_sheet, msglist_row, 8, "Skipped")
-                            update_cell_with_retry(msglist_sheet, msglist_row, 9, "Account suspended")
+                        sheet_writer.set(msglist_row, 8, "Skipped")
+                        sheet_writer.set(msglist_row, 9, "Account suspended")
                         failed_count += 1
                         continue
 
                     # Check post count
-                    post_count = int(profile_data.get('POSTS', '0'))
+                    try:
+                        post_count = int(str(profile_data.get('POSTS') or 0).replace(",", ""))
+                    except ValueError:
+                        post_count = None  # unknown: let the open-post search decide
                     if post_count == 0:
                         log_msg(f"  ⚠️ No posts available")
-                        with sheet_lock:
-                            update_cell_with_retry(msglist_sheet, msglist_row, 8, "Skipped")
-                            update_cell_with_retry(msglist_sheet, msglist_row, 9, "No posts")
+                        sheet_writer.set(msglist_row, 8, "Skipped")
+                        sheet_writer.set(msglist_row, 9, "No posts")
                         failed_count += 1
                         continue
                     
                     # STEP 2: Find Open Post
-                    post_url = find_first_open_post(driver, nick_or_url)
+                    post_url = checkpoint.get("post_url") or prefetched.get("open_post")
+                    if checkpoint.get("post_url"):
+                        log_msg(f"  ♻️ Open post from checkpoint: {post_url}")
+                    elif post_url:
+                        log_msg(f"  ⚡ Open post prefetched: {post_url}")
+                    else:
+                        with span("find_open_post"):
+                            post_url = find_first_open_post(driver, nick_or_url)
                     if not post_url:
                         log_msg(f"  ❌ No open posts found")
-                        with sheet_lock:
-                            update_cell_with_retry(msglist_sheet, msglist_row, 8, "Failed")
-                            update_cell_with_retry(msglist_sheet, msglist_row, 9, "No open posts")
+                        sheet_writer.set(msglist_row, 8, "Failed")
+                        sheet_writer.set(msglist_row, 9, "No open posts")
                         failed_count += 1
                         continue
                 
+                if not checkpoint.get("post_url"):
+                    run_checkpoint.mark(msglist_row, nick_or_url, "post", post_url=post_url)
+                if should_exit:
+                    stopped = True
+                    log_msg("  🛑 Stop requested before sending; resuming here next run")
+                    break
+
                 # STEP 3: Process template message
                 processed_message = process_template_message(message, profile_data)
                 log_msg(f"  💬 Processed message: '{processed_message}'")
                 
-                # STEP 4: Send Message & Verify
-                result = send_and_verify_message(driver, post_url, processed_message)
+                # STEP 4: Send Message & Verify (an interrupted send is checked on the post first)
+                result = None
+                if checkpoint.get("sending"):
+                    sent_message = checkpoint.get("message") or processed_message
+                    sent_url = checkpoint.get("post_url") or post_url
+                    if comment_already_posted(driver, sent_url, sent_message):
+                        log_msg("  ♻️ Earlier interrupted send did go through; not sending again")
+                        processed_message = sent_message
+                        result = {"status": "Posted", "link": sent_url, "verified": True}
+                if result is None:
+                    run_checkpoint.mark(
+                        msglist_row, nick_or_url, "sending", sending=True, post_url=post_url, message=processed_message
+                    )
+                    with span("send") as send_span:
+                        result = send_and_verify_message(driver, post_url, processed_message)
+                    send_secs = send_span["secs"]
+                run_checkpoint.mark(msglist_row, nick_or_url, "sent", sending=False, result=result, message=processed_message)
                 
                 # STEP 5: Update MsgList based on result
-                with sheet_lock:
-                    if "Posted" in result['status']:
-                        log_msg(f"  ✅ SUCCESS!")
-                        clean_result_url = clean_url(result['link'])
-                        log_msg(f"  🔗 Success URL: {clean_result_url}")
-                        update_cell_with_retry(msglist_sheet, msglist_row, 8, "Done")
-                        update_cell_with_retry(msglist_sheet, msglist_row, 9, f"Posted @ {get_pkt_time().strftime('%I:%M %p')}")
-                        update_cell_with_retry(msglist_sheet, msglist_row, 10, clean_result_url)  # RESULT URL
-                        run_rows.append({
-                            "run_ts": get_pkt_time().strftime("%Y-%m-%d %H:%M:%S"),
-                            "mode": mode,
-                            "target": nick_or_url,
-                            "name": name,
-                            "status": "Done",
-                            "result_url": clean_result_url,
-                            "message": processed_message,
-                        })
-                        success_count += 1
-                    elif "verification" in result['status'].lower():
-                        log_msg(f"  ⚠️ Needs manual verification")
-                        clean_result_url = clean_url(result['link'])
-                        log_msg(f"  🔗 Check URL: {clean_result_url}")
-                        update_cell_with_retry(msglist_sheet, msglist_row, 8, "Done")
-                        update_cell_with_retry(msglist_sheet, msglist_row, 9, f"Check manually @ {get_pkt_time().strftime('%I:%M %p')}")
-                        update_cell_with_retry(msglist_sheet, msglist_row, 10, clean_result_url)  # RESULT URL
-                        success_count += 1
-                    else:
-                        log_msg(f"  ❌ FAILED: {result['status']}")
-                        update_cell_with_retry(msglist_sheet, msglist_row, 8, "Failed")
-                        update_cell_with_retry(msglist_sheet, msglist_row, 9, result['status'])
-                        if result['link']:
-                            clean_result_url = clean_url(result['link'])
-                            update_cell_with_retry(msglist_sheet, msglist_row, 10, clean_result_url)  # RESULT URL
-                        run_rows.append({
-                            "run_ts": get_pkt_time().strftime("%Y-%m-%d %H:%M:%S"),
-                            "mode": mode,
-                            "target": nick_or_url,
-                            "name": name,
-                            "status": result['status'],
-                            "result_url": clean_url(result.get('link') or ""),
-                            "message": processed_message,
-                        })
-                        failed_count += 1
+                ok, history_status = record_send_result(sheet_writer, msglist_row, result)
+                if history_status:
+                    run_rows.append(send_history_entry(mode, nick_or_url, name, history_status, result, processed_message))
+                if ok:
+                    success_count += 1
+                else:
+                    failed_count += 1
                 
-                time.sleep(2)
+                if TARGET_DELAY > 0:
+                    time.sleep(TARGET_DELAY)
                 
             except Exception as e:
                 error_msg = f"Error: {str(e)[:40]}"
                 log_msg(f"  ❌ {error_msg}")
-                with sheet_lock:
-                    update_cell_with_retry(msglist_sheet, msglist_row, 8, "Failed")
-                    update_cell_with_retry(msglist_sheet, msglist_row, 9, error_msg)
+                sheet_writer.set(msglist_row, 8, "Failed")
+                sheet_writer.set(msglist_row, 9, error_msg)
                 run_rows.append({
                     "run_ts": get_pkt_time().strftime("%Y-%m-%d %H:%M:%S"),
                     "mode": mode,
@@ -1355,69 +3894,73 @@ def main():
                     "message": "",
                 })
                 failed_count += 1
+            finally:
+                if not stopped and run_checkpoint.get(msglist_row, nick_or_url):
+                    run_checkpoint.mark(msglist_row, nick_or_url, "done")
+                target_secs = time.perf_counter() - target_started
+                record_span("target", target_secs)
+                target_times = SPANS["target"]
+                run_stats.update(processed=idx, success=success_count, failed=failed_count)
+                # Journal this target's history row before moving on (counts as of this target)
+                for r in run_rows[journaled_rows:]:
+                    r.update(
+                        target_secs=target_secs,
+                        send_secs=send_secs,
+                        target_p50=_percentile(target_times, 50),
+                        target_p95=_percentile(target_times, 95),
+                    )
+                    sheet_writer.record_run_history(
+                        run_history_row(run_id, r, len(pending_targets), success_count, failed_count)
+                    )
+                journaled_rows = len(run_rows)
+                sheet_writer.target_done()
         
         # SUMMARY
         console.print("\n" + "="*70)
         log_msg("📊 RUN COMPLETE!")
         log_msg(f"   ✅ Success: {success_count}/{len(pending_targets)}")
         log_msg(f"   ❌ Failed: {failed_count}/{len(pending_targets)}")
+        if bad_templates:
+            log_msg(f"   🧩 Bad templates: {bad_templates} rows failed without a browser visit")
+        if should_exit:
+            log_msg(f"   🛑 Stopped early; unfinished rows resume from {CHECKPOINT_FILE or 'scratch'} next run")
+        if profile_cache:
+            log_msg(f"   🗃️ Profile cache: {profile_cache.summary()}")
+        if prefetcher:
+            log_msg(f"   ⚡ Prefetch: {prefetcher.summary()}")
+        if session_summary():
+            log_msg(f"   🔐 Session: {session_summary()}")
+        log_msg(f"   📊 Sheets API: {SHEETS.summary()}")
+        if "time_to_first_target" in run_stats:
+            log_msg(
+                f"   🚀 First target after {run_stats['time_to_first_target']:.1f}s"
+                f" (startup {run_stats['startup_secs']:.1f}s, Chrome + login overlapped with Sheets)"
+            )
+        log_span_summary()
+        log_wait_budget()
+        log_page_weight()
+        if _http_fetcher is not None and _http_fetcher.requests:
+            log_msg(f"   🌐 HTTP fast path: {_http_fetcher.requests} pages, {_http_fetcher.bytes // 1024} KB")
         console.print("="*70 + "\n")
         
-        run_id = get_pkt_time().strftime("%Y-%m-%d %H:%M:%S")
-        try:
-            run_history_sheet = get_or_create_run_history_sheet()
-            values: list[list[str]] = []
-            for r in run_rows:
-                values.append([
-                    run_id,
-                    r.get("run_ts", ""),
-                    r.get("mode", ""),
-                    r.get("target", ""),
-                    r.get("name", ""),
-                    r.get("status", ""),
-                    r.get("result_url", ""),
-                    r.get("message", ""),
-                    str(len(pending_targets)),
-                    str(success_count),
-                    str(failed_count),
-                    str(GSHEET_API_CALLS),
-                ])
-
-            if not values:
-                values.append([
-                    run_id,
-                    run_id,
-                    "",
-                    "",
-                    "",
-                    "SUMMARY",
-                    "",
-                    "",
-                    str(len(pending_targets)),
-                    str(success_count),
-                    str(failed_count),
-                    str(GSHEET_API_CALLS),
-                ])
-
-            retry_gspread_call(
-                run_history_sheet.append_rows,
-                values,
-                value_input_option="USER_ENTERED",
-            )
-        except Exception as exc:
-            if DEBUG:
-                log_msg(f"⚠️ Run History sheet append failed: {str(exc)[:80]}")
+        if not run_rows:
+            sheet_writer.record_run_history(run_history_row(
+                run_id, {"run_ts": run_id, "status": "SUMMARY"}, len(pending_targets), success_count, failed_count
+            ))
 
         if AUTO_PUSH:
             try:
+                # Only files already under version control are published; run state
+                # (cookies, Chrome profile, cursor, cache, journal, checkpoint, profile)
+                # stays local even if .gitignore misses it
                 status = subprocess.run(
-                    ["git", "status", "--porcelain"],
+                    ["git", "status", "--porcelain", "--untracked-files=no"],
                     capture_output=True,
                     text=True,
                     check=False,
                 ).stdout.strip()
                 if status:
-                    subprocess.run(["git", "add", "."], capture_output=True, text=True)
+                    subprocess.run(["git", "add", "--update"], capture_output=True, text=True)
                     subprocess.run(
                         ["git", "commit", "-m", "Update From Bot Run"],
                         capture_output=True,
@@ -1429,8 +3972,27 @@ def main():
                     log_msg(f"⚠️ Git Auto-Push Failed: {str(exc)[:80]}")
         
     finally:
-        driver.quit()
-        log_msg("🔒 Browser closed")
+        if driver is None and browser_future is not None:
+            # Startup failed while Chrome was still coming up: wait for it so it can be closed
+            try:
+                driver = browser_future.result()[0]
+            except Exception:
+                pass
+        if sheet_writer is not None:
+            sheet_writer.close()
+            log_msg(
+                f"💾 Sheets writer: {sheet_writer.busy_secs:.1f}s of sheet I/O,"
+                f" {sheet_writer.hidden_secs():.1f}s hidden behind browser work"
+            )
+        if prefetcher:
+            prefetcher.close()
+        if profile_cache:
+            profile_cache.close()
+        write_run_profile({"mode": "messages", **run_stats, **sheets_run_stats(), "stopped_early": should_exit})
+        if driver is not None:
+            driver.quit()
+            release_chrome_profile()
+            log_msg("🔒 Browser closed")
 
 # Global flag to control the main loop
 should_exit = False
@@ -1446,8 +4008,20 @@ if __name__ == "__main__":
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
     
+    cli = argparse.ArgumentParser(add_help=False)
+    cli.add_argument("--mode", choices=["messages", "profiles"], default=RUN_MODE)
+    cli.add_argument("--nick", action="append", default=[])
+    cli.add_argument("--nicks-file", default="")
+    cli.add_argument("--plan", action="store_true")
+    cli_args = cli.parse_known_args()[0]
+
     try:
-        main()
+        if cli_args.plan:
+            plan_run()
+        elif cli_args.mode == "profiles":
+            run_profiles_refresh(cli_args.nick, cli_args.nicks_file)
+        else:
+            main()
     except KeyboardInterrupt:
         signal_handler(None, None)
     except Exception as e: